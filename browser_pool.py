@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Browser Pool
+Process-wide pool of warm Chromium instances that hands out a fresh BrowserContext per analysis
+"""
+
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+
+try:
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Launch arguments shared by every pooled browser
+BROWSER_LAUNCH_ARGS = ['--no-sandbox', '--disable-setuid-sandbox']
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment with a safe default"""
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+class _PooledBrowser:
+    """Bookkeeping for a single launched browser"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.uses = 0
+        self.active_contexts = 0
+        self.crashed = False
+        browser.on("disconnected", lambda _: self._mark_crashed())
+
+    def _mark_crashed(self):
+        self.crashed = True
+
+    @property
+    def healthy(self) -> bool:
+        return not self.crashed and self.browser.is_connected()
+
+class BrowserPool:
+    """Warm Chromium pool - browsers are launched once and recycled after N uses or on crash"""
+
+    def __init__(self, size: Optional[int] = None, headless: bool = True,
+                 max_uses: Optional[int] = None, contexts_per_browser: Optional[int] = None):
+        self.size = size or _env_int("BROWSER_POOL_SIZE", 2)
+        self.headless = headless
+        self.max_uses = max_uses or _env_int("BROWSER_POOL_MAX_USES", 50)
+        self.contexts_per_browser = contexts_per_browser or _env_int("BROWSER_POOL_CONTEXTS_PER_BROWSER", 4)
+
+        self._playwright = None
+        self._loop = None
+        self._start_lock = None
+        self._start_loop = None
+        self._lock = None
+        self._slots = None
+        self._browsers: List[_PooledBrowser] = []
+        self._retiring: List[_PooledBrowser] = []
+        self.stats = {
+            "launches": 0,
+            "recycled": 0,
+            "crashes": 0,
+            "contexts_served": 0
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of contexts that can be open at once"""
+        return self.size * self.contexts_per_browser
+
+    async def _ensure_started(self):
+        """Start Playwright in the running event loop (restart if the loop changed)"""
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("Playwright not installed. Run: pip install playwright && playwright install")
+
+        loop = asyncio.get_running_loop()
+        if self._playwright is not None and self._loop is loop:
+            return
+
+        # Created before the first await, so concurrent first callers wait for a single startup
+        if self._start_lock is None or self._start_loop is not loop:
+            self._start_lock = asyncio.Lock()
+            self._start_loop = loop
+
+        async with self._start_lock:
+            if self._playwright is not None and self._loop is loop:
+                return
+
+            # Playwright objects are bound to the loop that created them, so a new loop
+            # (e.g. a fresh asyncio.run in the CLI) shuts the old instances down and starts from an empty pool
+            if self._playwright is not None:
+                await self._stop_previous_loop()
+
+            self._lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.capacity)
+            self._playwright = await async_playwright().start()
+            self._loop = loop
+            logger.info(f"🌐 Browser pool started (size={self.size}, headless={self.headless}, max_uses={self.max_uses})")
+
+    async def _stop_previous_loop(self):
+        """Close the browsers and Playwright started on a previous event loop, on that loop"""
+        old_loop, playwright = self._loop, self._playwright
+        shutdown = self._shutdown(playwright, self._browsers + self._retiring)
+        self._browsers = []
+        self._retiring = []
+        self._playwright = None
+        self._loop = None
+
+        try:
+            if old_loop is None or old_loop.is_closed():
+                # Closing the loop closed the driver's pipes, which already stopped it and its browsers
+                shutdown.close()
+            elif old_loop.is_running():
+                await asyncio.wait_for(asyncio.wrap_future(asyncio.run_coroutine_threadsafe(shutdown, old_loop)), 30)
+            else:
+                await asyncio.wait_for(asyncio.to_thread(old_loop.run_until_complete, shutdown), 30)
+            logger.info("🛑 Browser pool stopped on its previous event loop")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to stop browser pool from previous event loop: {e}")
+
+    @staticmethod
+    async def _shutdown(playwright, pooled_browsers: List[_PooledBrowser]):
+        """Close the given browsers, then stop Playwright"""
+        for pooled in pooled_browsers:
+            try:
+                await pooled.browser.close()
+            except Exception:
+                pass
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception:
+                pass
+
+    async def _launch(self) -> _PooledBrowser:
+        browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=BROWSER_LAUNCH_ARGS
+        )
+        self.stats["launches"] += 1
+        logger.info(f"🚀 Launched pooled Chromium ({len(self._browsers) + 1}/{self.size})")
+        return _PooledBrowser(browser)
+
+    async def _retire(self, pooled: _PooledBrowser, reason: str):
+        """Stop handing out a browser and close it once its last context is released"""
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+            if reason == "crash":
+                self.stats["crashes"] += 1
+            else:
+                self.stats["recycled"] += 1
+            logger.info(f"♻️ Retiring pooled browser after {pooled.uses} uses ({reason})")
+
+        if pooled.active_contexts > 0:
+            if pooled not in self._retiring:
+                self._retiring.append(pooled)
+            return
+
+        if pooled in self._retiring:
+            self._retiring.remove(pooled)
+        try:
+            await pooled.browser.close()
+        except Exception:
+            pass
+
+    async def _checkout(self) -> _PooledBrowser:
+        async with self._lock:
+            for pooled in list(self._browsers):
+                if not pooled.healthy:
+                    await self._retire(pooled, "crash")
+
+            candidates = [b for b in self._browsers if b.active_contexts < self.contexts_per_browser]
+            if candidates and (len(self._browsers) >= self.size or min(b.active_contexts for b in candidates) == 0):
+                pooled = min(candidates, key=lambda b: b.active_contexts)
+            else:
+                pooled = await self._launch()
+                self._browsers.append(pooled)
+
+            pooled.uses += 1
+            pooled.active_contexts += 1
+            self.stats["contexts_served"] += 1
+            return pooled
+
+    async def _checkin(self, pooled: _PooledBrowser):
+        async with self._lock:
+            pooled.active_contexts -= 1
+            if not pooled.healthy:
+                await self._retire(pooled, "crash")
+            elif pooled.uses >= self.max_uses or pooled in self._retiring:
+                await self._retire(pooled, "max_uses")
+
+    @asynccontextmanager
+    async def context(self, **context_options):
+        """Yield an isolated BrowserContext from a warm browser; the context is closed on exit"""
+        await self._ensure_started()
+
+        async with self._slots:
+            pooled = await self._checkout()
+            browser_context = None
+            try:
+                browser_context = await pooled.browser.new_context(**context_options)
+                yield browser_context
+            finally:
+                if browser_context is not None:
+                    try:
+                        await browser_context.close()
+                    except Exception as e:
+                        logger.warning(f"⚠️ Failed to close pooled context: {e}")
+                await self._checkin(pooled)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Pool status for health endpoints"""
+        return {
+            "size": self.size,
+            "headless": self.headless,
+            "max_uses": self.max_uses,
+            "contexts_per_browser": self.contexts_per_browser,
+            "browsers": len(self._browsers),
+            "retiring": len(self._retiring),
+            "active_contexts": sum(b.active_contexts for b in self._browsers + self._retiring),
+            **self.stats
+        }
+
+    async def close(self):
+        """Close every pooled browser and stop Playwright"""
+        pooled_browsers = self._browsers + self._retiring
+        self._browsers = []
+        self._retiring = []
+        await self._shutdown(self._playwright, pooled_browsers)
+
+        if self._playwright is not None:
+            self._playwright = None
+            self._loop = None
+            logger.info("🛑 Browser pool stopped")
+
+# Global pools, one per headless mode
+_browser_pools: Dict[bool, BrowserPool] = {}
+
+def get_browser_pool(headless: Optional[bool] = None) -> BrowserPool:
+    """Get or create the process-wide browser pool (headless unless BROWSER_POOL_HEADLESS=false)"""
+    if headless is None:
+        headless = os.getenv("BROWSER_POOL_HEADLESS", "true").lower() != "false"
+    if headless not in _browser_pools:
+        _browser_pools[headless] = BrowserPool(headless=headless)
+    return _browser_pools[headless]
+
+async def shutdown_browser_pools():
+    """Close all process-wide browser pools"""
+    for pool in list(_browser_pools.values()):
+        await pool.close()
+    _browser_pools.clear()
@@ -9,12 +9,27 @@ D. Input Handling - Input lag, delayed responses, poor interaction feedback
 E. Feedback - Missing hover states, unclear status, poor visual feedback
 """
 
+import os
 import asyncio
 import json
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from dataclasses import dataclass, asdict
 from playwright.async_api import Page, Browser, TimeoutError as PlaywrightTimeoutError
+from page_conditions import wait_for_page_ready, wait_for_condition
+from page_snapshot import capture_page_snapshot
+from frame_sampler import ensure_frame_sampler
+from hover_probe import scan_hover_feedback
+from input_timing import ensure_input_timing, tag_probe_element, read_input_latency
+from detector_registry import (
+    DetectorRegistry, DetectorSpec, DETECTOR_REGISTRY, ANALYSIS_BUDGET_MS, register_detector, run_detector, cached_run
+)
+from fingerprint_cache import FingerprintCache, FINGERPRINT_CACHE_ENABLED, capture_fingerprint, get_fingerprint_cache
+from snapshot_replay import RECORD_SNAPSHOTS, save_recording
+from metric_series import metric_series, evaluate_thresholds
+
+# Run each interactive probe in its own cloned context, concurrently with the snapshot
+ISOLATE_INTERACTIVE_PROBES = os.getenv("CRAFT_BUG_ISOLATE_PROBES", "false").lower() == "true"
 
 @dataclass
 class CraftBugFinding:
@@ -41,17 +56,32 @@ class CraftBugReport:
 class CraftBugDetector:
     """Detects intentional craft bugs in web applications"""
     
-    def __init__(self):
+    def __init__(self, registry: Optional[DetectorRegistry] = None, analysis_budget_ms: Optional[int] = None,
+                 fingerprint_cache: Optional[FingerprintCache] = None, record: Optional[bool] = None):
         self.detection_thresholds = {
             'loading_delay': 500,       # 0.5+ seconds = bug (very sensitive)
             'input_lag': 30,            # 30+ ms = bug (very sensitive)
             'animation_judder': 16,     # 16+ ms frame time = bug
+            'animation_judder_ratio': 0.1,  # ...on 10%+ of the frames sampled while animating
+            'animation_judder_min_frames': 10,  # animation frames needed before judging judder
             'layout_thrash': 1,         # 1+ reflow = bug (very sensitive)
             'missing_feedback': 100,    # 100+ ms without feedback = bug (very sensitive)
         }
+        # Detectors come from the registry; each declares its category, cost class and time budget
+        self.registry = registry or DETECTOR_REGISTRY
+        self.analysis_budget_ms = analysis_budget_ms or ANALYSIS_BUDGET_MS
+        # Detector outputs are reused while the page fingerprint is unchanged, across analyses too (FINGERPRINT_CACHE=true)
+        if fingerprint_cache is None and FINGERPRINT_CACHE_ENABLED:
+            fingerprint_cache = get_fingerprint_cache()
+        self.fingerprint_cache = fingerprint_cache
+        # Save each analysis's snapshot so detector changes can be replayed without a browser
+        self.record = RECORD_SNAPSHOTS if record is None else record
     
-    async def analyze_craft_bugs(self, page: Page, url: str) -> CraftBugReport:
-        """Main analysis method - detects all craft bug categories"""
+    async def analyze_craft_bugs(self, page: Page, url: str,
+                                 isolate_interactive: Optional[bool] = None,
+                                 categories: Optional[List[str]] = None,
+                                 events: Optional[Iterable[Dict[str, Any]]] = None) -> CraftBugReport:
+        """Main analysis method - runs the registered detectors for the requested categories"""
         start_time = time.time()
         findings = []
         
@@ -63,42 +93,113 @@ class CraftBugDetector:
             # Only navigate if we're not already on the target page
             try:
                 await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-                # Wait longer for JavaScript to execute
-                await asyncio.sleep(5)
-                
-                # Wait for craft bug metrics to be available
-                await page.wait_for_function("""
-                    () => window.craftBugMetrics || window.excelCraftBugMetrics || window.pptCraftBugMetrics || document.readyState === 'complete'
-                """, timeout=10000)
-                
             except PlaywrightTimeoutError:
                 print(f"⚠️ Timeout loading {url}, continuing with analysis...")
-                await asyncio.sleep(2)
+            
+            # Wait for load, the craft bug metrics object and settled animations instead of a fixed sleep
+            page_ready = await wait_for_page_ready(page, timeout_ms=10000)
         else:
             print(f"📍 Already on target URL, preserving existing page state and metrics")
-            # Just wait a moment to ensure metrics are available
-            await asyncio.sleep(1)
+            # Metrics are normally present already; only wait if they are not
+            page_ready = await wait_for_condition(page, "metrics", timeout_ms=1000)
+        print(f"⏱️ Page ready after {page_ready['waited_ms']:.0f}ms")
+        
+        # No-op when the context already installed the sampler; otherwise probes are sampled from here on
+        await ensure_frame_sampler(page)
+        
+        if isolate_interactive is None:
+            isolate_interactive = ISOLATE_INTERACTIVE_PROBES
+        selected = self.registry.select(categories)
+        results: Dict[str, List[CraftBugFinding]] = {}
+        detector_runs: Dict[str, Dict[str, Any]] = {}
+        # The analysis budget covers the detectors only, not navigation or waiting for the page
+        budget_start = time.perf_counter()
+        def remaining_ms() -> float:
+            return self.analysis_budget_ms - (time.perf_counter() - budget_start) * 1000
         
-        # Category A: Loading/Performance Detection
-        category_a_bugs = await self._detect_loading_performance_bugs(page)
-        findings.extend(category_a_bugs)
+        # Taken before the probes run; only read-only detectors are cached by it
+        fingerprint = None
+        fingerprint_evaluates = 0
+        if self.fingerprint_cache is not None and any(spec.fingerprint for spec in selected):
+            fingerprint = await capture_fingerprint(page)
+            fingerprint_evaluates = 1
+        cache_keys: Dict[str, Optional[str]] = {}
         
-        # Category B: Motion/Animation Detection  
-        category_b_bugs = await self._detect_motion_animation_bugs(page)
-        findings.extend(category_b_bugs)
+        # Interactive probes always run: their findings come from the interactions themselves
+        interactive = [spec for spec in selected if spec.mode == 'interactive']
         
-        # Category D: Input Handling Detection
-        category_d_bugs = await self._detect_input_handling_bugs(page)
-        findings.extend(category_d_bugs)
+        if isolate_interactive and interactive:
+            # Probes run in cloned contexts, so neither they nor the snapshot see each other's side effects
+            outcomes = await asyncio.gather(
+                capture_page_snapshot(page),
+                *(self._run_isolated(page, spec, remaining_ms()) for spec in interactive)
+            )
+            snapshot = outcomes[0]
+            fallbacks = []
+            for spec, (probe_findings, run) in zip(interactive, outcomes[1:]):
+                if probe_findings is None:
+                    fallbacks.append(spec)
+                    continue
+                results[spec.name], detector_runs[spec.name] = probe_findings, run
+            # Probes that could not be cloned run on the main page once the snapshot is taken
+            for spec in fallbacks:
+                results[spec.name], detector_runs[spec.name] = await run_detector(spec, self, page, remaining_ms())
+        else:
+            # Interactive probes drive the page, so they run before the snapshot captures what they triggered
+            for spec in interactive:
+                results[spec.name], detector_runs[spec.name] = await run_detector(spec, self, page, remaining_ms())
+            # One evaluate shared by every category: fewer round trips and a consistent view of the page
+            snapshot = await capture_page_snapshot(page)
+        
+        # Read-only detectors are pure functions of the snapshot
+        for spec in selected:
+            if spec.mode == 'read_only' and not self._from_cache(spec, fingerprint, snapshot, cache_keys, results, detector_runs):
+                results[spec.name], detector_runs[spec.name] = await run_detector(spec, self, snapshot, remaining_ms())
         
-        # Category E: Feedback Detection
-        category_e_bugs = await self._detect_feedback_bugs(page)
-        findings.extend(category_e_bugs)
+        # Only complete runs are cached; skipped, cancelled or failed detectors re-run next time
+        for name, key in cache_keys.items():
+            if key is not None and detector_runs[name]['status'] in ('ok', 'over_budget'):
+                self.fingerprint_cache.put(key, results[name])
+        
+        # Registry order, whatever order the detectors finished in
+        for spec in selected:
+            findings.extend(results.get(spec.name, []))
         
         # Generate summary metrics
         analysis_duration = time.time() - start_time
         bugs_by_category = self._categorize_findings(findings)
-        metrics_summary = await self._collect_metrics_summary(page)
+        metrics_summary = self._collect_metrics_summary(snapshot)
+        metrics_summary['page_ready'] = page_ready
+        metrics_summary['detectors'] = detector_runs
+        metrics_summary['budget'] = {
+            'categories': sorted({spec.category for spec in selected}),
+            'analysis_budget_ms': self.analysis_budget_ms,
+            'used_ms': round((time.perf_counter() - budget_start) * 1000, 2),
+            'evaluate_count': sum(run['evaluate_count'] for run in detector_runs.values()),
+            # Round trips taken outside the detectors, on the main page
+            'capture_evaluates': {'snapshot': 1, 'fingerprint': fingerprint_evaluates},
+            'skipped': [name for name, run in detector_runs.items() if run['status'] == 'skipped'],
+            'timed_out': [name for name, run in detector_runs.items() if run['status'] == 'timed_out']
+        }
+        if fingerprint is not None:
+            hits = sum(1 for run in detector_runs.values() if run['status'] == 'cached')
+            lookups = sum(1 for key in cache_keys.values() if key is not None) + hits
+            metrics_summary['fingerprint'] = {
+                **fingerprint,
+                'hits': hits,
+                'misses': lookups - hits,
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+                'cache': self.fingerprint_cache.get_summary()
+            }
+        
+        if self.record:
+            recording = save_recording(
+                url, snapshot,
+                {spec.name: results.get(spec.name, []) for spec in selected if spec.mode == 'interactive'},
+                page_ready=page_ready, fingerprint=fingerprint, thresholds=self.detection_thresholds,
+                events=events
+            )
+            metrics_summary['recording'] = str(recording) if recording else None
         
         report = CraftBugReport(
             url=url,
@@ -113,23 +214,89 @@ class CraftBugDetector:
         print(f"✅ Analysis complete: {len(findings)} craft bugs detected")
         return report
     
-    async def _detect_loading_performance_bugs(self, page: Page) -> List[CraftBugFinding]:
+    def replay_recording(self, recording: Dict[str, Any], categories: Optional[List[str]] = None) -> CraftBugReport:
+        """Re-run the read-only detectors on a recorded snapshot; probe findings are replayed as recorded"""
+        start_time = time.time()
+        snapshot = recording['snapshot']
+        selected = self.registry.select(categories)
+        probe_findings = recording.get('probe_findings') or {}
+        findings = []
+        for spec in selected:
+            if spec.mode == 'read_only':
+                findings.extend(spec.fn(self, snapshot))
+            else:
+                findings.extend(CraftBugFinding(**finding) for finding in probe_findings.get(spec.name, []))
+        
+        metrics_summary = self._collect_metrics_summary(snapshot)
+        metrics_summary['page_ready'] = recording.get('page_ready')
+        metrics_summary['replayed_from'] = {
+            'recorded_at': recording.get('recorded_at'),
+            'thresholds': recording.get('thresholds')
+        }
+        return CraftBugReport(
+            url=recording.get('url', ''),
+            analysis_duration=time.time() - start_time,
+            total_bugs_found=len(findings),
+            bugs_by_category=self._categorize_findings(findings),
+            findings=findings,
+            metrics_summary=metrics_summary,
+            timestamp=time.time()
+        )
+    
+    def _from_cache(self, spec: DetectorSpec, fingerprint: Optional[Dict[str, Any]], snapshot: Optional[Dict[str, Any]],
+                    cache_keys: Dict[str, Optional[str]], results: Dict[str, List[CraftBugFinding]],
+                    detector_runs: Dict[str, Dict[str, Any]]) -> bool:
+        """Fill in a detector's findings from the fingerprint cache; False when it has to run"""
+        if fingerprint is None:
+            return False
+        key = self.fingerprint_cache.key(spec, fingerprint, snapshot)
+        cached = self.fingerprint_cache.get(spec.name, key)
+        if cached is None:
+            cache_keys[spec.name] = key
+            return False
+        results[spec.name], detector_runs[spec.name] = cached, cached_run(spec, cached)
+        return True
+    
+    async def _run_isolated(self, page: Page, spec: DetectorSpec, remaining_ms: float) -> tuple:
+        """Run an interactive probe in a cloned context; returns (findings, accounting) or (None, None)"""
+        context = None
+        try:
+            browser = page.context.browser
+            if browser is None:
+                raise RuntimeError("page has no shared browser to clone into")
+            context = await browser.new_context(
+                storage_state=await page.context.storage_state(),
+                viewport=page.viewport_size
+            )
+            clone = await context.new_page()
+            await clone.goto(page.url, wait_until='domcontentloaded', timeout=30000)
+            await wait_for_page_ready(clone, timeout_ms=10000)
+            # Cloning is not charged to the probe's budget
+            return await run_detector(spec, self, clone, remaining_ms, isolated=True)
+        except Exception as e:
+            print(f"⚠️ Could not isolate {spec.name} ({e}), running it on the main page")
+            return None, None
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+    
+    @register_detector('loading_performance', 'A', 'read_only', cost='cheap')
+    def _detect_loading_performance_bugs(self, snapshot: Dict[str, Any]) -> List[CraftBugFinding]:
         """Category A: Detect loading and performance issues"""
         findings = []
         
         # Check for intentional loading delays
         try:
             # Look for craft bug metrics in page
-            metrics = await page.evaluate("""
-                () => {
-                    const metrics = window.craftBugMetrics || window.excelCraftBugMetrics || window.pptCraftBugMetrics || {};
-                    return {
-                        startDelay: metrics.startDelay || 0,
-                        loadingTime: metrics.loadingTime || 0,
-                        performanceMarks: performance.getEntriesByType('mark').length
-                    };
-                }
-            """)
+            raw = snapshot.get('metrics', {})
+            metrics = {
+                'startDelay': raw.get('startDelay') or 0,
+                'loadingTime': raw.get('loadingTime') or 0,
+                'performanceMarks': snapshot.get('performance', {}).get('marks', 0)
+            }
             
             # Detect start delays (Category A bugs)
             if metrics.get('startDelay', 0) >= self.detection_thresholds['loading_delay']:
@@ -144,15 +311,7 @@ class CraftBugDetector:
                 ))
             
             # Check for slow resource loading
-            navigation_timing = await page.evaluate("""
-                () => {
-                    const timing = performance.timing;
-                    return {
-                        domContentLoaded: timing.domContentLoadedEventEnd - timing.navigationStart,
-                        pageLoad: timing.loadEventEnd - timing.navigationStart
-                    };
-                }
-            """)
+            navigation_timing = snapshot.get('navigation', {'domContentLoaded': 0, 'pageLoad': 0})
             
             if navigation_timing['domContentLoaded'] > 3000:
                 findings.append(CraftBugFinding(
@@ -170,145 +329,70 @@ class CraftBugDetector:
         
         return findings
     
-    async def _detect_motion_animation_bugs(self, page: Page) -> List[CraftBugFinding]:
+    @register_detector('motion_animation', 'B', 'read_only', cost='cheap')
+    def _detect_motion_animation_bugs(self, snapshot: Dict[str, Any]) -> List[CraftBugFinding]:
         """Category B: Detect motion and animation issues"""
         findings = []
         
         try:
             # Check for jarring animations and layout thrash
-            animation_metrics = await page.evaluate("""
-                () => {
-                    const metrics = window.craftBugMetrics || window.excelCraftBugMetrics || window.pptCraftBugMetrics || {};
-                    console.log('Raw metrics:', metrics);
-                    
-                    const result = {
-                        layoutThrashCount: (metrics.layoutShifts ? metrics.layoutShifts.length : 0),
-                        animationConflicts: (metrics.animationConflicts ? metrics.animationConflicts.length : 0),
-                        judderEvents: 0, // Legacy field
-                        frameTimes: [],
-                        // Enhanced metrics from the mock
-                        layoutShifts: metrics.layoutShifts || [],
-                        animationConflictList: metrics.animationConflicts || [],
-                        // Raw counts for debugging
-                        rawLayoutShiftsCount: metrics.layoutShifts ? metrics.layoutShifts.length : 0,
-                        rawAnimationConflictsCount: metrics.animationConflicts ? metrics.animationConflicts.length : 0
-                    };
-                    
-                    console.log('Processed metrics:', result);
-                    return result;
-                }
-            """)
+            series = metric_series(snapshot)
+            exceeded = self._series_exceeded(series)
+            layout_shifts = series['layoutShifts']
+            animation_conflicts = series['animationConflicts']
             
-            # Debug: Check the types of values returned
-            print(f"Debug animation_metrics: {animation_metrics}")
+            print(f"Debug motion series: layoutShifts={layout_shifts['count']}, animationConflicts={animation_conflicts['count']}")
             
             # Detect layout thrash (Category B)
-            layout_count = animation_metrics.get('layoutThrashCount', 0)
-            print(f"Debug layout_count: {layout_count}, threshold: {self.detection_thresholds['layout_thrash']}")
-            if isinstance(layout_count, (list, tuple)):
-                layout_count = len(layout_count) if layout_count else 0
-            if layout_count >= self.detection_thresholds['layout_thrash']:
+            if exceeded['layoutShifts']:
                 print(f"✅ CREATING layout thrash finding!")
                 findings.append(CraftBugFinding(
                     category='B',
                     bug_type='layout_thrash',
                     severity='high',
-                    description=f"Layout thrash detected: {layout_count} events",
+                    description=f"Layout thrash detected: {layout_shifts['count']} events",
                     location='layout_system',
-                    metrics=animation_metrics,
+                    metrics={'layoutShifts': layout_shifts, 'animationConflicts': animation_conflicts},
                     timestamp=time.time()
                 ))
             else:
-                print(f"❌ Layout thrash NOT detected: {layout_count} < {self.detection_thresholds['layout_thrash']}")
+                print(f"❌ Layout thrash NOT detected: {layout_shifts['count']} < {self.detection_thresholds['layout_thrash']}")
             
             # Check for animation conflicts
-            conflicts = animation_metrics.get('animationConflicts', 0)
-            print(f"Debug conflicts: {conflicts}")
-            if isinstance(conflicts, (list, tuple)):
-                conflicts = len(conflicts) if conflicts else 0
-            if conflicts > 0:
+            if exceeded['animationConflicts']:
                 print(f"✅ CREATING animation conflicts finding!")
                 findings.append(CraftBugFinding(
                     category='B',
                     bug_type='animation_conflicts',
                     severity='medium',
-                    description=f"Conflicting animations: {conflicts} conflicts",
+                    description=f"Conflicting animations: {animation_conflicts['count']} conflicts",
                     location='animation_system',
-                    metrics=animation_metrics,
+                    metrics={'animationConflicts': animation_conflicts},
                     timestamp=time.time()
                 ))
             else:
-                print(f"❌ Animation conflicts NOT detected: {conflicts} <= 0")
-            
-            # Check for any animation conflicts in the list
-            animation_conflict_list = animation_metrics.get('animationConflictList', [])
-            if isinstance(animation_conflict_list, list) and len(animation_conflict_list) > 0:
-                print(f"✅ CREATING animation conflicts from list: {len(animation_conflict_list)} conflicts!")
-                findings.append(CraftBugFinding(
-                    category='B',
-                    bug_type='animation_conflicts',
-                    severity='medium',
-                    description=f"Animation conflicts detected: {len(animation_conflict_list)} conflicts",
-                    location='animation_system',
-                    metrics={'conflict_list': animation_conflict_list},
-                    timestamp=time.time()
-                ))
+                print(f"❌ Animation conflicts NOT detected: {animation_conflicts['count']} <= 0")
             
-            # Detect slide judder (PowerPoint specific)
-            judder = animation_metrics.get('judderEvents', 0)
-            if isinstance(judder, (list, tuple)):
-                judder = len(judder) if judder else 0
-            if judder > 0:
+            # Check frames sampled while animations ran for judder: a frame is slow once it misses a whole
+            # frame budget (animation_judder ms), i.e. takes more than two budgets. One hitch is not judder,
+            # so slow frames must be a sustained share of the window, or the window's p95 must be slow
+            frame_stats = snapshot.get('frames') or {}
+            window = frame_stats.get('animation') or {}
+            window_frames = window.get('samples', 0)
+            slow_frames = window.get('long_frames', 0)
+            slow_ms = 2 * self.detection_thresholds['animation_judder']
+            slow_ratio = slow_frames / window_frames if window_frames else 0.0
+            if window_frames >= self.detection_thresholds['animation_judder_min_frames'] and (
+                    slow_ratio >= self.detection_thresholds['animation_judder_ratio'] or window.get('p95_ms', 0) > slow_ms):
                 findings.append(CraftBugFinding(
                     category='B',
-                    bug_type='slide_judder',
+                    bug_type='animation_judder',
                     severity='medium',
-                    description=f"Slide transition judder: {judder} events",
-                    location='slide_transitions',
-                    metrics=animation_metrics,
-                    timestamp=time.time()
-                ))
-            
-            # Check frame times for animation judder
-            frame_times = animation_metrics.get('frameTimes', [])
-            if isinstance(frame_times, list) and frame_times:
-                slow_frames = [ft for ft in frame_times if ft > self.detection_thresholds['animation_judder']]
-                if slow_frames:
-                    findings.append(CraftBugFinding(
-                        category='B',
-                        bug_type='animation_judder',
-                        severity='medium',
-                        description=f"Animation judder detected: {len(slow_frames)} slow frames (>{self.detection_thresholds['animation_judder']}ms)",
-                        location='animation_frames',
-                        metrics={'slow_frames_count': len(slow_frames), 'max_frame_time': max(slow_frames)},
-                        timestamp=time.time()
-                    ))
-            
-            # Check for loading delays (Category A)
-            loading_delay = animation_metrics.get('loadingDelay', 0)
-            if loading_delay >= self.detection_thresholds['loading_delay']:
-                print(f"✅ CREATING loading delay finding: {loading_delay}ms!")
-                findings.append(CraftBugFinding(
-                    category='A',
-                    bug_type='loading_delay',
-                    severity='high',
-                    description=f"Loading delay detected: {loading_delay}ms",
-                    location='page_load',
-                    metrics={'loading_delay': loading_delay},
-                    timestamp=time.time()
-                ))
-            
-            # Check for feedback failures (Category E)
-            feedback_failures = animation_metrics.get('feedbackFailures', [])
-            if isinstance(feedback_failures, list) and len(feedback_failures) > 0:
-                print(f"✅ CREATING feedback failure finding: {len(feedback_failures)} failures!")
-                findings.append(CraftBugFinding(
-                    category='E',
-                    bug_type='feedback_failure',
-                    severity='medium',
-                    description=f"Feedback failures detected: {len(feedback_failures)} issues",
-                    location='user_interaction',
-                    metrics={'feedback_failures': feedback_failures},
+                    description=f"Animation judder detected: {slow_frames} of {window_frames} animation frames slow (>{slow_ms}ms), "
+                                f"p95 {window.get('p95_ms', 0)}ms, {frame_stats.get('dropped_frames', 0)} dropped",
+                    location='animation_frames',
+                    metrics={'slow_frames_count': slow_frames, 'slow_frame_ratio': round(slow_ratio, 3),
+                             'max_frame_time': frame_stats.get('max_ms', 0), 'frame_stats': frame_stats},
                     timestamp=time.time()
                 ))
                 
@@ -319,11 +403,15 @@ class CraftBugDetector:
         
         return findings
     
-    async def _detect_input_handling_bugs(self, page: Page) -> List[CraftBugFinding]:
-        """Category D: Detect input handling issues"""
+    @register_detector('input_lag_probe', 'D', 'interactive', cost='expensive')
+    async def _probe_input_lag(self, page: Page) -> List[CraftBugFinding]:
+        """Category D probe: type into the first inputs and measure input-to-next-paint latency"""
         findings = []
         
         try:
+            # Event Timing measures the app itself; the wall clock (which includes IPC) is only a fallback
+            event_timing = await ensure_input_timing(page)
+            
             # Test input elements for lag
             input_elements = await page.query_selector_all('input, textarea, [contenteditable="true"]')
             
@@ -334,126 +422,137 @@ class CraftBugDetector:
                     is_enabled = await element.is_enabled()
                     
                     if is_visible and is_enabled:
+                        location = f'input_element_{i}'
+                        if event_timing:
+                            await tag_probe_element(element, location)
+                        
                         # Measure input response time
                         start_time = time.time() * 1000
                         await element.click(timeout=5000)
                         await element.type('test', delay=0)
                         response_time = (time.time() * 1000) - start_time
                         
+                        latency = await read_input_latency(page, location) if event_timing else None
+                        if latency is not None:
+                            # Slowest input-to-next-paint; events under the Event Timing threshold never appear
+                            response_time = latency['max_ms']
+                            metrics = {'response_time_ms': response_time, 'measurement': 'event_timing',
+                                       'input_to_paint': latency}
+                        else:
+                            metrics = {'response_time_ms': response_time, 'measurement': 'wall_clock'}
+                        
                         if response_time > self.detection_thresholds['input_lag']:
                             findings.append(CraftBugFinding(
                                 category='D',
                                 bug_type='input_lag',
                                 severity='high',
                                 description=f"Input lag detected: {response_time:.0f}ms response time",
-                                location=f'input_element_{i}',
-                                metrics={'response_time_ms': response_time},
+                                location=location,
+                                metrics=metrics,
                                 timestamp=time.time()
                             ))
                 except Exception as e:
                     # Skip problematic elements but continue testing
                     continue
-            
+        
+        except Exception as e:
+            print(f"Error in input probing: {e}")
+        
+        return findings
+    
+    @register_detector('input_metrics', 'D', 'read_only', cost='cheap', fingerprint='state')
+    def _detect_input_handling_bugs(self, snapshot: Dict[str, Any]) -> List[CraftBugFinding]:
+        """Category D: Detect input handling issues"""
+        findings = []
+        
+        try:
             # Check for craft bug metrics related to input
-            input_metrics = await page.evaluate("""
-                () => {
-                    const metrics = window.craftBugMetrics || window.excelCraftBugMetrics || window.pptCraftBugMetrics || {};
-                    const result = {
-                        inputLagEvents: (metrics.inputDelays ? metrics.inputDelays.length : 0),
-                        delayedResponses: (metrics.buttonResponseTimes ? metrics.buttonResponseTimes.length : 0),
-                        textBoxLagEvents: 0,
-                        // Enhanced metrics from the mock
-                        inputDelays: metrics.inputDelays || [],
-                        buttonResponseTimes: metrics.buttonResponseTimes || [],
-                        // Raw counts for debugging
-                        rawInputDelaysCount: metrics.inputDelays ? metrics.inputDelays.length : 0,
-                        rawButtonResponseCount: metrics.buttonResponseTimes ? metrics.buttonResponseTimes.length : 0
-                    };
-                    console.log('Input metrics:', result);
-                    return result;
-                }
-            """)
+            series = metric_series(snapshot)
+            exceeded = self._series_exceeded(series)
+            input_delays = series['inputDelays']
+            input_metrics = {
+                'inputDelays': input_delays,
+                'buttonResponseTimes': series['buttonResponseTimes']
+            }
             
-            print(f"Debug input_metrics: {input_metrics}")
+            print(f"Debug input series: inputDelays={input_delays['count']} (p95 {input_delays['p95']}ms), "
+                  f"buttonResponseTimes={series['buttonResponseTimes']['count']}")
             
-            input_lag_events = input_metrics.get('inputLagEvents', 0)
-            print(f"Debug input_lag_events: {input_lag_events}")
-            if input_lag_events > 0:
+            if exceeded['inputDelays']:
                 print(f"✅ CREATING input lag finding!")
                 findings.append(CraftBugFinding(
                     category='D',
                     bug_type='intentional_input_lag',
                     severity='high',
-                    description=f"Intentional input lag: {input_lag_events} events",
+                    description=f"Intentional input lag: {input_delays['count']} events",
                     location='input_system',
                     metrics=input_metrics,
                     timestamp=time.time()
                 ))
             else:
-                print(f"❌ Input lag NOT detected: {input_lag_events} <= 0")
+                print(f"❌ Input lag NOT detected: {input_delays['count']} <= 0")
                 
         except Exception as e:
             print(f"Error in input detection: {e}")
         
         return findings
     
-    async def _detect_feedback_bugs(self, page: Page) -> List[CraftBugFinding]:
-        """Category E: Detect feedback issues"""
+    @register_detector('hover_probe', 'E', 'interactive', cost='expensive')
+    async def _probe_hover_feedback(self, page: Page) -> List[CraftBugFinding]:
+        """Category E probe: check every interactive element for :hover feedback"""
         findings = []
         
         try:
-            # Test hover states and feedback
-            interactive_elements = await page.query_selector_all('button, a, .clickable, [role="button"]')
-            
-            for i, element in enumerate(interactive_elements[:5]):  # Test first 5 elements
-                # Check for hover feedback
-                await element.hover()
-                await asyncio.sleep(0.1)
-                
-                # Check if element has hover styles
-                has_hover = await element.evaluate("""
-                    (el) => {
-                        const styles = window.getComputedStyle(el, ':hover');
-                        const normalStyles = window.getComputedStyle(el);
-                        return styles.cursor !== normalStyles.cursor || 
-                               styles.backgroundColor !== normalStyles.backgroundColor ||
-                               styles.color !== normalStyles.color;
-                    }
-                """)
-                
-                if not has_hover:
-                    findings.append(CraftBugFinding(
-                        category='E',
-                        bug_type='missing_hover_feedback',
-                        severity='medium',
-                        description=f"Missing hover feedback on interactive element",
-                        location=f'element_{i}',
-                        metrics={'element_type': await element.evaluate('el => el.tagName')},
-                        timestamp=time.time()
-                    ))
+            # Stylesheet scan for the whole page; real hovers only for elements the scan cannot decide
+            coverage = await scan_hover_feedback(page)
+            missing = coverage['missing']
+            print(f"🖱️ Hover scan: {coverage['scanned']} elements, {coverage['styled']} with feedback, "
+                  f"{len(missing)} without ({coverage['confirmed_by_hover']} confirmed by hover) in {coverage['total_ms']:.0f}ms")
             
+            if missing:
+                findings.append(CraftBugFinding(
+                    category='E',
+                    bug_type='missing_hover_feedback',
+                    severity='medium',
+                    description=f"Missing hover feedback on {len(missing)} of {coverage['scanned']} interactive elements",
+                    location='interactive_elements',
+                    metrics={**{k: v for k, v in coverage.items() if k != 'missing'},
+                             'missing_count': len(missing), 'elements': missing[:20]},
+                    timestamp=time.time()
+                ))
+        
+        except Exception as e:
+            print(f"Error in hover probing: {e}")
+        
+        return findings
+    
+    @register_detector('feedback_metrics', 'E', 'read_only', cost='cheap', fingerprint='state')
+    def _detect_feedback_bugs(self, snapshot: Dict[str, Any]) -> List[CraftBugFinding]:
+        """Category E: Detect feedback issues"""
+        findings = []
+        
+        try:
             # Check for silent failures
-            failure_metrics = await page.evaluate("""
-                () => {
-                    const metrics = window.craftBugMetrics || window.excelCraftBugMetrics || window.pptCraftBugMetrics || {};
-                    return {
-                        silentFailures: metrics.silentFailures || 0,
-                        missingFeedback: metrics.missingFeedback || 0,
-                        feedbackFailures: metrics.feedbackFailures || []
-                    };
-                }
-            """)
+            metrics = snapshot.get('metrics', {})
+            series = metric_series(snapshot)
+            exceeded = self._series_exceeded(series)
+            failures = series['feedbackFailures']
+            failure_metrics = {
+                'silentFailures': metrics.get('silentFailures') or 0,
+                'missingFeedback': metrics.get('missingFeedback') or 0,
+                'feedbackFailures': failures
+            }
             
             # Check for feedback failures from enhanced mocks
-            if failure_metrics.get('feedbackFailures', []):
-                failures = failure_metrics['feedbackFailures']
+            if exceeded['feedbackFailures']:
                 findings.append(CraftBugFinding(
                     category='E',
                     bug_type='feedback_failures',
                     severity='medium',
-                    description=f"Feedback failures detected: {len(failures)} instances",
+                    description=f"Feedback failures detected: {failures['count']} instances",
                     location='feedback_system',
-                    metrics={'failure_count': len(failures), 'failures': failures[:3]},  # Show first 3
+                    metrics={'failure_count': failures['count'], 'feedbackFailures': failures,
+                             'failures': (metrics.get('feedbackFailures') or [])[:3]},  # Show first 3
                     timestamp=time.time()
                 ))
             
@@ -473,27 +572,32 @@ class CraftBugDetector:
         
         return findings
     
-    async def _collect_metrics_summary(self, page: Page) -> Dict[str, Any]:
+    def _series_exceeded(self, series: Dict[str, Dict[str, Any]]) -> Dict[str, bool]:
+        """Threshold checks for every metric series in one vectorized comparison"""
+        return evaluate_thresholds(series, {
+            'layoutShifts': ('count', self.detection_thresholds['layout_thrash']),
+            'animationConflicts': ('count', 1),
+            'inputDelays': ('count', 1),
+            'feedbackFailures': ('count', 1),
+        })
+    
+    def _collect_metrics_summary(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
         """Collect overall metrics summary"""
-        try:
-            return await page.evaluate("""
-                () => {
-                    const allMetrics = {
-                        ...(window.craftBugMetrics || {}),
-                        ...(window.excelCraftBugMetrics || {}),
-                        ...(window.pptCraftBugMetrics || {})
-                    };
-                    
-                    return {
-                        pageTitle: document.title,
-                        metricsAvailable: Object.keys(allMetrics).length > 0,
-                        performanceEntries: performance.getEntries().length,
-                        craftBugMetrics: allMetrics
-                    };
-                }
-            """)
-        except:
+        if snapshot.get('error'):
             return {'error': 'Could not collect metrics'}
+        all_metrics = snapshot.get('all_metrics', {})
+        return {
+            'pageTitle': snapshot.get('document', {}).get('title', ''),
+            'metricsAvailable': len(all_metrics) > 0,
+            'performanceEntries': snapshot.get('performance', {}).get('entries', 0),
+            'craftBugMetrics': all_metrics,
+            'metricSeries': metric_series(snapshot),
+            'navigationTiming': snapshot.get('navigation', {}),
+            'paintTiming': snapshot.get('paint', {}),
+            'elements': snapshot.get('elements', {}),
+            'inputLatency': snapshot.get('input_timing') or {},
+            'snapshotMs': snapshot.get('capture_ms')
+        }
     
     def _categorize_findings(self, findings: List[CraftBugFinding]) -> Dict[str, int]:
         """Count findings by category"""
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Craft Event Collector
+Init script plus an exposed binding that streams craft bug events (layout shifts, long tasks,
+animation conflicts, input delays, ...) from the page as they happen, tagged with the current step.
+Reports carry counts per kind and per step; the raw events only go into the optional snapshot recording
+"""
+
+import os
+import time
+import logging
+from collections import deque, Counter
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BINDING_NAME = "__craftBugEvent"
+
+# Ring buffer size; the oldest events are dropped once it is full
+CRAFT_EVENT_BUFFER_SIZE = int(os.getenv("CRAFT_EVENT_BUFFER_SIZE", "2000"))
+
+# Metrics arrays on window.*CraftBugMetrics mapped to event kinds (unlisted arrays keep their own name)
+METRIC_EVENT_KINDS = {
+    "layoutShifts": "layout_shift",
+    "animationConflicts": "animation_conflict",
+    "inputDelays": "input_delay",
+    "feedbackFailures": "feedback_failure",
+    "buttonResponseTimes": "button_response",
+    "cellSelectionTimes": "cell_selection",
+    "scrollLagEvents": "scroll_lag",
+    "formulaBarDelays": "formula_bar_delay",
+    "slideTransitionTimes": "slide_transition",
+    "textBoxDelays": "text_box_delay",
+    "animationStutters": "animation_stutter",
+}
+
+# Wraps the metrics objects' arrays as the page assigns them, and observes native layout shifts/long tasks
+INIT_SCRIPT = """
+(() => {
+    const binding = '%(binding)s';
+    const plain = (value) => { try { return JSON.parse(JSON.stringify(value)); } catch (e) { return String(value); } };
+    const send = (kind, source, detail) => {
+        try { window[binding]({kind, source, detail: plain(detail), t: performance.now()}); } catch (e) {}
+    };
+    const wrapArray = (source, key, arr) => {
+        if (!Array.isArray(arr) || arr.__craftStreamed) return;
+        const push = arr.push;
+        Object.defineProperty(arr, '__craftStreamed', {value: true});
+        arr.push = function(...items) {
+            items.forEach(item => send(key, source, item));
+            return push.apply(this, items);
+        };
+    };
+    ['craftBugMetrics', 'excelCraftBugMetrics', 'pptCraftBugMetrics'].forEach(name => {
+        let current;
+        Object.defineProperty(window, name, {
+            configurable: true,
+            get() { return current; },
+            set(value) {
+                current = value;
+                if (value && typeof value === 'object') {
+                    Object.keys(value).forEach(key => wrapArray(name, key, value[key]));
+                }
+            }
+        });
+    });
+    const observe = (type, handler) => {
+        try { new PerformanceObserver(list => list.getEntries().forEach(handler)).observe({type, buffered: true}); }
+        catch (e) {}
+    };
+    observe('layout-shift', e => send('native_layout_shift', 'performance', {value: e.value, hadRecentInput: e.hadRecentInput}));
+    observe('longtask', e => send('long_task', 'performance', {duration: e.duration, name: e.name}));
+})();
+""" % {"binding": BINDING_NAME}
+
+class CraftEventCollector:
+    """Bounded ring of page-pushed craft bug events, each tagged with the step that was running"""
+
+    def __init__(self, max_events: int = CRAFT_EVENT_BUFFER_SIZE):
+        self.events = deque(maxlen=max_events)
+        # None outside scenario steps (page setup, fork replay, end-of-run analysis)
+        self.current_step: Optional[int] = None
+        self.total = 0
+        # Counted for every event, including those the ring has since dropped
+        self.kind_counts: Counter = Counter()
+        self.step_counts: Dict[Optional[int], Counter] = {}
+        self.started = time.perf_counter()
+
+    @property
+    def dropped(self) -> int:
+        return self.total - len(self.events)
+
+    async def attach(self, target):
+        """Expose the binding and install the init script on a context (or page) before navigation"""
+        await target.expose_binding(BINDING_NAME, self._on_event)
+        await target.add_init_script(INIT_SCRIPT)
+
+    def set_step(self, step_number: Optional[int]):
+        self.current_step = step_number
+
+    def _on_event(self, source, payload):
+        payload = payload if isinstance(payload, dict) else {"detail": payload}
+        kind = payload.get("kind", "unknown")
+        kind = METRIC_EVENT_KINDS.get(kind, kind)
+        self.total += 1
+        self.kind_counts[kind] += 1
+        self.step_counts.setdefault(self.current_step, Counter())[kind] += 1
+        self.events.append({
+            "step": self.current_step,
+            "kind": kind,
+            "source": payload.get("source"),
+            "page_time_ms": payload.get("t"),
+            "received_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "detail": payload.get("detail"),
+        })
+
+    def has_step(self, step_number: int) -> bool:
+        return step_number in self.step_counts
+
+    def counts_for_step(self, step_number: int) -> Dict[str, int]:
+        """Event counts by kind for one step"""
+        return dict(self.step_counts.get(step_number, {}))
+
+    def events_for_step(self, step_number: int) -> List[Dict[str, Any]]:
+        return [e for e in self.events if e["step"] == step_number]
+
+    def attribute(self, step_results: List[Dict[str, Any]]):
+        """Set craft_events counts on the step results this collector saw run"""
+        for step_result in step_results:
+            step_number = step_result.get("step")
+            if step_number is not None and (self.has_step(step_number) or "craft_events" not in step_result):
+                step_result["craft_events"] = self.counts_for_step(step_number)
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Craft event counts for the analysis report (raw events stay out of it)"""
+        return {
+            "total_events": self.total,
+            "buffered_events": len(self.events),
+            "dropped_events": self.dropped,
+            "by_kind": dict(self.kind_counts),
+            "by_step": {"outside_steps" if step is None else str(step): dict(counts)
+                        for step, counts in self.step_counts.items()},
+        }
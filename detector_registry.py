@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Detector Registry
+Craft bug detectors declare their category, cost class and time budget; the orchestrator picks
+them by category, enforces the budgets and accounts each detector's wall time and evaluates
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Callable, Optional, Iterable, Tuple
+from fingerprint_cache import FINGERPRINT_SCOPES
+
+logger = logging.getLogger(__name__)
+
+# Default time budget per cost class; CRAFT_BUG_BUDGET_<NAME>_MS overrides a single detector
+COST_BUDGETS_MS = {
+    "cheap": 100,        # pure function of the shared snapshot
+    "moderate": 2000,    # a few evaluates
+    "expensive": 8000,   # drives the page (clicks, typing, hovers)
+}
+
+# Wall time all selected detectors may use together, starting once the page is ready
+ANALYSIS_BUDGET_MS = int(os.getenv("CRAFT_BUG_ANALYSIS_BUDGET_MS", "20000"))
+
+DETECTOR_MODES = ("read_only", "interactive")
+
+@dataclass
+class DetectorSpec:
+    """One registered craft bug detector"""
+    name: str
+    category: str  # A, B, D, E
+    mode: str  # 'read_only' takes the snapshot, 'interactive' takes a page
+    cost: str  # key of COST_BUDGETS_MS
+    budget_ms: int
+    fn: Callable  # fn(detector, snapshot) or async fn(detector, page) -> List[CraftBugFinding]
+    fingerprint: Optional[str] = None  # page fingerprint scope its output depends on (read_only only); None always re-runs
+
+class DetectorRegistry:
+    """Ordered collection of detectors, selectable by category"""
+
+    def __init__(self):
+        self._specs: Dict[str, DetectorSpec] = {}
+
+    def register(self, name: str, category: str, mode: str, cost: str = "cheap",
+                 budget_ms: Optional[int] = None, fingerprint: Optional[str] = None) -> Callable:
+        """Decorator registering fn under name; the function itself is returned unchanged"""
+        if mode not in DETECTOR_MODES:
+            raise ValueError(f"mode must be one of {', '.join(DETECTOR_MODES)}")
+        if cost not in COST_BUDGETS_MS:
+            raise ValueError(f"cost must be one of {', '.join(COST_BUDGETS_MS)}")
+        if fingerprint is not None and fingerprint not in FINGERPRINT_SCOPES:
+            raise ValueError(f"fingerprint must be one of {', '.join(FINGERPRINT_SCOPES)}")
+        if fingerprint is not None and mode != "read_only":
+            # A cache hit would skip the probe's interactions, which later steps and detectors rely on
+            raise ValueError(f"Detector '{name}' is {mode}; only read_only detectors can be cached by fingerprint")
+        if budget_ms is None:
+            budget_ms = int(os.getenv(f"CRAFT_BUG_BUDGET_{name.upper()}_MS", COST_BUDGETS_MS[cost]))
+
+        def decorator(fn: Callable) -> Callable:
+            self._specs[name] = DetectorSpec(name, category, mode, cost, budget_ms, fn, fingerprint)
+            return fn
+        return decorator
+
+    def unregister(self, name: str):
+        self._specs.pop(name, None)
+
+    def categories(self) -> List[str]:
+        return sorted({spec.category for spec in self._specs.values()})
+
+    def select(self, categories: Optional[Iterable[str]] = None) -> List[DetectorSpec]:
+        """Detectors for the given categories (all when None), by category then registration order"""
+        specs = list(self._specs.values())
+        if categories is not None:
+            wanted = {c.upper() for c in categories}
+            specs = [spec for spec in specs if spec.category in wanted]
+        return sorted(specs, key=lambda spec: spec.category)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+DETECTOR_REGISTRY = DetectorRegistry()
+
+def register_detector(name: str, category: str, mode: str, cost: str = "cheap",
+                      budget_ms: Optional[int] = None, fingerprint: Optional[str] = None) -> Callable:
+    """Register a detector with the global registry"""
+    return DETECTOR_REGISTRY.register(name, category, mode, cost, budget_ms, fingerprint)
+
+def _unwrap(value):
+    """Real Playwright objects for counting proxies nested in evaluate arguments"""
+    if isinstance(value, (CountingPage, CountingHandle)):
+        return value._target
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
+
+class _CountingProxy:
+    """Counts evaluate round trips on the wrapped object and on the handles it returns"""
+
+    def __init__(self, target, counter: "CountingPage"):
+        self._target = target
+        self._counter = counter
+
+    def _wrap(self, result):
+        if isinstance(result, list):
+            return [CountingHandle(handle, self._counter) for handle in result]
+        return CountingHandle(result, self._counter) if result is not None else None
+
+    async def evaluate(self, *args, **kwargs):
+        self._counter.evaluates += 1
+        return await self._target.evaluate(*_unwrap(args), **_unwrap(kwargs))
+
+    async def evaluate_handle(self, *args, **kwargs):
+        self._counter.evaluates += 1
+        return self._wrap(await self._target.evaluate_handle(*_unwrap(args), **_unwrap(kwargs)))
+
+    async def query_selector(self, *args, **kwargs):
+        return self._wrap(await self._target.query_selector(*args, **kwargs))
+
+    async def query_selector_all(self, *args, **kwargs):
+        return self._wrap(await self._target.query_selector_all(*args, **kwargs))
+
+    async def wait_for_selector(self, *args, **kwargs):
+        return self._wrap(await self._target.wait_for_selector(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+class CountingHandle(_CountingProxy):
+    """Element or JS handle whose evaluates count towards the page that returned it"""
+
+class CountingPage(_CountingProxy):
+    """Page proxy counting evaluate round trips, element handle evaluates included; everything else passes through"""
+
+    def __init__(self, page):
+        super().__init__(page, self)
+        self.evaluates = 0
+
+def _run_record(spec: DetectorSpec, isolated: bool = False, status: str = 'ok') -> Dict[str, Any]:
+    return {
+        'category': spec.category,
+        'mode': spec.mode,
+        'cost': spec.cost,
+        'budget_ms': spec.budget_ms,
+        'isolated': isolated,
+        'status': status,
+        'duration_ms': 0.0,
+        'evaluate_count': 0,
+        'findings': 0
+    }
+
+def cached_run(spec: DetectorSpec, findings: List[Any]) -> Dict[str, Any]:
+    """Accounting for a detector answered from the fingerprint cache"""
+    run = _run_record(spec, status='cached')
+    run['findings'] = len(findings)
+    return run
+
+async def run_detector(spec: DetectorSpec, detector, target, remaining_ms: float,
+                       isolated: bool = False) -> Tuple[List[Any], Dict[str, Any]]:
+    """Run one detector within its budget; returns (findings, accounting) and never raises"""
+    run = _run_record(spec, isolated)
+    # A detector that cannot finish in what is left of the analysis budget is not started
+    if remaining_ms < spec.budget_ms:
+        run['status'] = 'skipped'
+        logger.info(f"⏭️ Skipping {spec.name}: needs {spec.budget_ms}ms, {max(0, remaining_ms):.0f}ms of analysis budget left")
+        return [], run
+
+    findings = []
+    started = time.perf_counter()
+    try:
+        if spec.mode == 'interactive':
+            page = CountingPage(target)
+            try:
+                findings = await asyncio.wait_for(spec.fn(detector, page), timeout=spec.budget_ms / 1000)
+            finally:
+                run['evaluate_count'] = page.evaluates
+        else:
+            # Synchronous detectors cannot be preempted; overruns are reported instead
+            findings = spec.fn(detector, target)
+    except asyncio.TimeoutError:
+        run['status'] = 'timed_out'
+        logger.warning(f"⏰ {spec.name} exceeded its {spec.budget_ms}ms budget and was cancelled")
+    except Exception as e:
+        run['status'] = 'error'
+        run['error'] = str(e)
+        logger.warning(f"⚠️ Detector {spec.name} failed: {e}")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if run['status'] == 'ok' and elapsed_ms > spec.budget_ms:
+        run['status'] = 'over_budget'
+    run['duration_ms'] = round(elapsed_ms, 2)
+    run['findings'] = len(findings)
+    return findings, run
@@ -9,7 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 import json
 import uuid
 from datetime import datetime
@@ -102,10 +102,22 @@ from enhanced_report_handler import (
     list_saved_reports, 
     get_report_statistics,
     search_saved_reports,
-    cleanup_old_reports
+    cleanup_old_reports,
+    reconcile_report_statistics,
+    get_report_handler,
+    resolve_report_path
 )
+from report_id_index import AmbiguousReportIdError
+from report_storage import read_report_json, iter_report_bytes, detect_compression, write_json_atomic
 # Import craft bug detector
 from craft_bug_detector import CraftBugDetector
+from detector_registry import DETECTOR_REGISTRY
+# Warm browser pool shared with the scenario executor
+from browser_pool import get_browser_pool, shutdown_browser_pools
+# Multi-process runner for large scenario suites
+from sharded_runner import ShardedScenarioRunner
+from request_interception import resolve_interception_profile
+from enhanced_report_generator import CAPTURE_MODES
 
 # Import utilities
 try:
@@ -246,6 +258,15 @@ except (ImportError, AttributeError) as e:
     print(f"Warning: Could not import orchestrator routes: {e}")
     orchestrator_router = None
 
+# Report statistics are kept as running aggregates; a periodic full recount corrects any drift
+STATS_RECONCILE_INTERVAL_S = int(os.getenv("REPORT_STATS_RECONCILE_INTERVAL_S", "3600"))
+
+async def reconcile_statistics_periodically():
+    """Background job: recount report statistics every STATS_RECONCILE_INTERVAL_S seconds"""
+    while True:
+        await asyncio.sleep(STATS_RECONCILE_INTERVAL_S)
+        await asyncio.to_thread(reconcile_report_statistics)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
@@ -268,10 +289,20 @@ async def lifespan(app: FastAPI):
     os.makedirs("temp", exist_ok=True)
     logger.info("📁 Required directories validated")
     
+    # Open the report index and build the in-memory report ID index once
+    get_report_handler()
+    
+    reconcile_task = None
+    if STATS_RECONCILE_INTERVAL_S > 0:
+        reconcile_task = asyncio.create_task(reconcile_statistics_periodically())
+    
     yield
     
     # Shutdown
     logger.info("🛑 Enhanced UX Analyzer shutting down...")
+    if reconcile_task:
+        reconcile_task.cancel()
+    await shutdown_browser_pools()
 
 app = FastAPI(
     title="Enhanced UX Analyzer API", 
@@ -359,6 +390,9 @@ class AnalysisRequest(BaseModel):
         "health_alerts": True,
         "functional": False
     }
+    interception: Optional[Union[str, Dict[str, Any]]] = None  # Profile name or overrides; defaults to the scenario's
+    capture_mode: Optional[str] = None  # "video", "trace" or "none"; defaults to CAPTURE_MODE
+    cold: Optional[bool] = None  # True forces a clean profile (load measurements); defaults to WARM_PROFILES
     output_format: str = "html"
 
 class AnalysisResponse(BaseModel):
@@ -386,6 +420,26 @@ class CraftBugAnalysisRequest(BaseModel):
     headless: bool = True
     categories: List[str] = ["A", "B", "D", "E"]  # Default: all categories
 
+class BatchAnalysisRequest(BaseModel):
+    url: Optional[str] = None  # Defaults to each scenario's mock URL
+    scenario_path: Optional[str] = None  # Run every enabled scenario in this file...
+    scenario_ids: Optional[List[str]] = None  # ...or only these IDs
+    max_concurrency: Optional[int] = None  # Defaults to browser pool capacity
+    workers: Optional[int] = None  # >1 shards across worker processes (max_concurrency is then per worker)
+    result_timeout: Optional[float] = None  # Sharded only: seconds without a scenario result before giving up
+    interception: Optional[Union[str, Dict[str, Any]]] = None  # Profile name or overrides; defaults to each scenario's
+    capture_mode: Optional[str] = None  # "video", "trace" or "none"; defaults to CAPTURE_MODE
+    cold: Optional[bool] = None  # True forces a clean profile (load measurements); defaults to WARM_PROFILES
+    modules: Dict[str, bool] = {
+        "performance": True,
+        "accessibility": True,
+        "keyboard": True,
+        "ux_heuristics": True,
+        "best_practices": True,
+        "health_alerts": True,
+        "functional": False
+    }
+
 # Background task processing
 async def process_realistic_analysis(analysis_id: str, request_data: Dict[str, Any]):
     """Process realistic scenario analysis in background"""
@@ -459,21 +513,20 @@ async def process_realistic_analysis(analysis_id: str, request_data: Dict[str, A
 
 async def process_craft_bug_analysis(analysis_id: str, request_data: Dict[str, Any]):
     """Process craft bug analysis with browser automation"""
-    from playwright.async_api import async_playwright
-    
     try:
         logger.info(f"🐛 Starting craft bug analysis: {analysis_id}")
         
         detector = CraftBugDetector()
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=request_data.get("headless", True))
-            page = await browser.new_page()
+        # Borrow an isolated context from the warm browser pool instead of launching Chromium
+        pool = get_browser_pool(headless=request_data.get("headless", True))
+        async with pool.context() as context:
+            page = await context.new_page()
             
             # Perform craft bug analysis
-            craft_bug_report = await detector.analyze_craft_bugs(page, request_data["url"])
-            
-            await browser.close()
+            craft_bug_report = await detector.analyze_craft_bugs(
+                page, request_data["url"], categories=request_data.get("categories")
+            )
         
         # Convert craft bug report to standard analysis format
         result = {
@@ -569,6 +622,91 @@ async def process_craft_bug_analysis(analysis_id: str, request_data: Dict[str, A
             "file_path": file_path
         }
 
+async def process_batch_analysis(analysis_id: str, request_data: Dict[str, Any]):
+    """Process a batch of scenarios concurrently and store per-scenario plus aggregated reports"""
+    try:
+        logger.info(f"📦 Starting batch analysis: {analysis_id}")
+        
+        workers = request_data.get("workers") or 1
+        if workers > 1:
+            # Shard across processes; the blocking runner stays off the event loop
+            runner = ShardedScenarioRunner(
+                workers=workers,
+                concurrency_per_worker=request_data.get("max_concurrency") or 2,
+                result_timeout=request_data.get("result_timeout"),
+                interception=request_data.get("interception"),
+                capture_mode=request_data.get("capture_mode"),
+                cold=request_data.get("cold")
+            )
+            result = await asyncio.get_running_loop().run_in_executor(
+                None,
+                runner.run,
+                request_data.get("url"),
+                request_data.get("modules", {}),
+                request_data.get("scenario_path"),
+                request_data.get("scenario_ids")
+            )
+        else:
+            result = await scenario_executor.execute_scenario_batch(
+                url=request_data.get("url"),
+                modules=request_data.get("modules", {}),
+                scenario_path=request_data.get("scenario_path"),
+                scenario_ids=request_data.get("scenario_ids"),
+                max_concurrency=request_data.get("max_concurrency"),
+                interception=request_data.get("interception"),
+                capture_mode=request_data.get("capture_mode"),
+                cold=request_data.get("cold")
+            )
+        
+        # Save each scenario report on its own so it can be opened individually
+        for scenario_report in result.pop("scenario_reports", []):
+            scenario_report = normalize_report_schema(scenario_report)
+            scenario_report["batch_id"] = analysis_id
+            save_analysis_to_disk(scenario_report["analysis_id"], scenario_report)
+        
+        result["analysis_id"] = analysis_id
+        result = normalize_report_schema(result)
+        
+        file_path = save_analysis_to_disk(analysis_id, result)
+        result["file_path"] = file_path
+        
+        ANALYSIS_CACHE[analysis_id] = {
+            "status": "completed",
+            "result": result,
+            "completed_at": datetime.now(),
+            "file_path": file_path
+        }
+        
+        metadata = result.get("metadata", {})
+        logger.info(f"✅ Batch analysis completed: {analysis_id}, {metadata.get('scenarios_passed', 0)}/{metadata.get('total_scenarios', 0)} scenarios passed in {metadata.get('wall_time_ms', 0)}ms")
+        
+    except Exception as e:
+        logger.exception(f"❌ Batch analysis failed: {analysis_id}: {e}")
+        
+        error_result = {
+            "analysis_id": analysis_id,
+            "status": "failed",
+            "error": str(e),
+            "timestamp": datetime.now().isoformat(),
+            "type": "batch_scenario",
+            "url": request_data.get("url", ""),
+            "scenario_path": request_data.get("scenario_path", ""),
+            "overall_score": 0,
+            "total_issues": 1,
+            "module_results": {},
+            "scenario_results": []
+        }
+        
+        file_path = save_analysis_to_disk(analysis_id, error_result)
+        error_result["file_path"] = file_path
+        
+        ANALYSIS_CACHE[analysis_id] = {
+            "status": "failed",
+            "result": error_result,
+            "error": str(e),
+            "completed_at": datetime.now(),
+            "file_path": file_path
+        }
 
 def generate_mock_scenario_report(analysis_id: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
     """Generate a mock scenario analysis report"""
@@ -739,7 +877,8 @@ async def health_check():
             "craft_bug_detection": True,
             "persistent_storage": True,
             "browser_automation": True
-        }
+        },
+        "browser_pool": get_browser_pool().get_status()
     }
 
 # Enhanced Analysis Endpoints
@@ -877,6 +1016,12 @@ async def analyze_craft_bugs(
     
     if not request.url:
         raise HTTPException(status_code=400, detail="URL is required")
+    unknown = sorted({c.upper() for c in request.categories} - set(DETECTOR_REGISTRY.categories()))
+    if unknown or not request.categories:
+        raise HTTPException(
+            status_code=400,
+            detail=f"categories must be a non-empty subset of {', '.join(DETECTOR_REGISTRY.categories())}"
+        )
     
     analysis_id = str(uuid.uuid4())[:8]
     
@@ -897,6 +1042,46 @@ async def analyze_craft_bugs(
         execution_mode="craft_bug_detection"
     )
 
+@app.post("/api/analyze/batch", response_model=AnalysisResponse)
+async def analyze_batch(
+    request: BatchAnalysisRequest,
+    background_tasks: BackgroundTasks
+):
+    """Run a list of scenarios (or a whole scenario file) concurrently across isolated browser contexts"""
+    
+    if not request.scenario_path and not request.scenario_ids:
+        raise HTTPException(status_code=400, detail="scenario_path or scenario_ids is required")
+    
+    if request.scenario_path and not os.path.exists(request.scenario_path):
+        raise HTTPException(status_code=404, detail=f"Scenario file not found: {request.scenario_path}")
+    
+    if request.interception:
+        try:
+            resolve_interception_profile(request.interception)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    if request.capture_mode and request.capture_mode not in CAPTURE_MODES:
+        raise HTTPException(status_code=400, detail=f"capture_mode must be one of {', '.join(CAPTURE_MODES)}")
+    
+    analysis_id = str(uuid.uuid4())[:8]
+    
+    ANALYSIS_CACHE[analysis_id] = {
+        "status": "processing",
+        "started_at": datetime.now(),
+        "request_data": request.dict()
+    }
+    
+    background_tasks.add_task(process_batch_analysis, analysis_id, request.dict())
+    
+    target = request.scenario_path or f"{len(request.scenario_ids)} scenarios"
+    return AnalysisResponse(
+        analysis_id=analysis_id,
+        status="processing",
+        message=f"Batch analysis started for {target}",
+        execution_mode="batch"
+    )
+
 # Word Craft Bug Scenario endpoint for dashboard testing
 @app.post("/api/analyze/word-craft-bugs", response_model=AnalysisResponse)
 async def analyze_word_craft_bugs(request: AnalysisRequest):
@@ -1031,6 +1216,9 @@ async def analyze_url(request: AnalysisRequest):
     if not request.url:
         raise HTTPException(status_code=400, detail="URL is required")
     
+    if request.capture_mode and request.capture_mode not in CAPTURE_MODES:
+        raise HTTPException(status_code=400, detail=f"capture_mode must be one of {', '.join(CAPTURE_MODES)}")
+    
     analysis_id = str(uuid.uuid4())[:8]
     
     try:
@@ -1041,7 +1229,10 @@ async def analyze_url(request: AnalysisRequest):
             report_data = await scenario_executor.execute_scenario_by_id(
                 url=request.url,
                 scenario_id=request.scenario_id,
-                modules=request.modules or {}
+                modules=request.modules or {},
+                interception=request.interception,
+                capture_mode=request.capture_mode,
+                cold=request.cold
             )
         else:
             # Fallback to basic URL analysis without specific scenario
@@ -1049,7 +1240,10 @@ async def analyze_url(request: AnalysisRequest):
             report_data = await scenario_executor.execute_scenario_by_id(
                 url=request.url,
                 scenario_id="1.1",  # Use default Word scenario
-                modules=request.modules or {}
+                modules=request.modules or {},
+                interception=request.interception,
+                capture_mode=request.capture_mode,
+                cold=request.cold
             )
         
         # Guard against None/invalid executor results
@@ -1295,29 +1489,13 @@ async def analyze_mock_scenario(request: AnalysisRequest):
 def _resolve_report_path(analysis_id: str) -> Path:
     """
     Resolve report path with support for both short and long IDs.
-    Supports prefix matching for short IDs like 9808b21e.
+    Short IDs like 9808b21e are prefix-matched against the sorted report ID index;
+    an ambiguous prefix is a 409 listing the candidates.
     """
-    # Try exact match first
-    reports_dir = Path("reports/analysis")
-    if not reports_dir.exists():
-        return None
-    
-    # Exact filename match
-    exact_path = reports_dir / f"analysis_{analysis_id}.json"
-    if exact_path.exists():
-        return exact_path
-    
-    # Try with timestamp patterns
-    for json_file in reports_dir.glob(f"analysis_{analysis_id}_*.json"):
-        return json_file
-    
-    # Prefix match (short id support)
-    for json_file in reports_dir.glob("analysis_*.json"):
-        stem_parts = json_file.stem.split("_")
-        if len(stem_parts) >= 2 and stem_parts[1].startswith(analysis_id):
-            return json_file
-    
-    return None
+    try:
+        return resolve_report_path(analysis_id)
+    except AmbiguousReportIdError as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "candidates": e.candidates})
 
 @app.get("/api/reports/{report_id}")
 async def get_report(report_id: str):
@@ -1363,8 +1541,8 @@ async def get_report(report_id: str):
     report_path = _resolve_report_path(report_id)
     if report_path and report_path.exists():
         try:
-            with open(report_path, 'r') as f:
-                report = json.load(f)
+            # Compressed reports are decompressed transparently
+            report = read_report_json(report_path)
             
             # Apply schema normalization
             report = normalize_report_schema(report)
@@ -1650,8 +1828,16 @@ async def analyze_screenshot(
         message=f"Screenshot analysis completed"
     )
 
+def _accepts_encoding(request: Request, encoding: str) -> bool:
+    """Whether the client's Accept-Encoding allows a content coding"""
+    for token in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = token.partition(";")
+        if name.strip().lower() in (encoding, "*") and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            return True
+    return False
+
 @app.get("/api/reports/{report_id}/download")
-async def download_report(report_id: str, format: str = "json"):
+async def download_report(report_id: str, request: Request, format: str = "json"):
     """Download report in specified format"""
     
     # Get report from any source
@@ -1663,29 +1849,47 @@ async def download_report(report_id: str, format: str = "json"):
     elif report_id in MOCK_REPORTS:
         report = MOCK_REPORTS[report_id]
     else:
-        report = load_analysis_from_disk(report_id)
-        # Try to find the actual file for direct download
-        import glob
-        pattern = f"reports/analysis/analysis_{report_id}_*.json"
-        matches = glob.glob(pattern)
-        if matches:
-            file_path = matches[0]
-    
-    if not report:
+        # Find the actual file for direct download
+        report_path = _resolve_report_path(report_id)
+        if report_path and report_path.exists():
+            file_path = str(report_path)
+        # A JSON download of a stored file is sent as-is, without parsing it
+        if format != "json" or not file_path:
+            report = load_analysis_from_disk(report_id)
+            if not report and file_path:
+                report = read_report_json(file_path)
+    
+    if not report and not file_path:
         raise HTTPException(status_code=404, detail="Report not found")
     
     # Ensure consistent analysis_id in downloaded report
-    report["analysis_id"] = report_id
-    report["requested_id"] = report_id
+    if report:
+        report["analysis_id"] = report_id
+        report["requested_id"] = report_id
     
     if format == "json":
         # If we have a file path, return it directly
         if file_path and os.path.exists(file_path):
-            from fastapi.responses import FileResponse
-            return FileResponse(
-                file_path, 
+            compression = detect_compression(file_path)
+            if compression is None:
+                return FileResponse(
+                    file_path, 
+                    media_type="application/json",
+                    filename=f"analysis_{report_id}.json"
+                )
+            if _accepts_encoding(request, compression):
+                # Compressed bytes pass straight through; the client decodes them
+                return FileResponse(
+                    file_path,
+                    media_type="application/json",
+                    filename=f"analysis_{report_id}.json",
+                    headers={"Content-Encoding": compression, "Vary": "Accept-Encoding"}
+                )
+            return StreamingResponse(
+                iter_report_bytes(file_path),
                 media_type="application/json",
-                filename=f"analysis_{report_id}.json"
+                headers={"Content-Disposition": f"attachment; filename=analysis_{report_id}.json",
+                         "Vary": "Accept-Encoding"}
             )
         else:
             # Return JSON response
@@ -1924,6 +2128,36 @@ async def download_report(report_id: str, format: str = "json"):
     else:
         return JSONResponse(content=report)
 
+@app.get("/api/reports/{report_id}/trace")
+async def download_report_trace(report_id: str):
+    """Download the Playwright trace captured for a report (open with `playwright show-trace`)"""
+    
+    if report_id in ANALYSIS_CACHE and ANALYSIS_CACHE[report_id]["status"] == "completed":
+        report = ANALYSIS_CACHE[report_id]["result"]
+    elif report_id in MOCK_REPORTS:
+        report = MOCK_REPORTS[report_id]
+    else:
+        # Short IDs resolve like the other report endpoints
+        report_path = _resolve_report_path(report_id)
+        if report_path and report_path.exists():
+            try:
+                report = read_report_json(report_path)
+            except Exception as e:
+                logger.error(f"Error loading report {report_id}: {e}")
+                raise HTTPException(status_code=500, detail=f"Error loading report: {str(e)}")
+        else:
+            report = load_analysis_from_disk(report_id)
+    
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    
+    trace = report.get("trace") or {}
+    trace_path = trace.get("file_path")
+    if not trace_path or not os.path.exists(trace_path):
+        raise HTTPException(status_code=404, detail="No trace captured for this report")
+    
+    return FileResponse(trace_path, media_type="application/zip", filename=f"trace_{report_id}.zip")
+
 # Dashboard API Endpoints
 @app.get("/api/dashboard/analytics")
 async def get_dashboard_analytics(days: int = 7):
@@ -2305,18 +2539,15 @@ async def fix_now(
     """Apply immediate fixes for UX issues"""
     try:
         # First try to load from real report files
-        import glob
-        file_pattern = f"reports/analysis/analysis_{report_id}_*.json"
-        matching_files = glob.glob(file_pattern)
+        report_path = _resolve_report_path(report_id)
         
         report_data = None
         file_path = None
         
-        if matching_files:
+        if report_path:
             # Load from real report file
-            file_path = matching_files[0]
-            with open(file_path, "r") as f:
-                report_data = json.load(f)
+            file_path = str(report_path)
+            report_data = read_report_json(file_path)
         else:
             # Fallback to mock reports
             report_data = MOCK_REPORTS.get(report_id)
@@ -2351,8 +2582,8 @@ async def fix_now(
                 
                 # Save updated report back to file
                 if file_path:
-                    with open(file_path, "w") as f:
-                        json.dump(report_data, f, indent=2)
+                    # Keep the file's storage format (plain or compressed)
+                    write_json_atomic(file_path, report_data, compression=detect_compression(file_path))
                 else:
                     MOCK_REPORTS[report_id] = report_data
                     save_analysis_to_disk(report_id, report_data)
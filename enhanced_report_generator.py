@@ -14,16 +14,24 @@ from typing import Dict, List, Any, Optional
 from playwright.sync_api import sync_playwright
 import logging
 
+from report_storage import FILE_SIZE, write_json_atomic, storage_compression, storage_path
+
 logger = logging.getLogger(__name__)
 
+# How a realistic run is captured: "video" (legacy webm), "trace" (Playwright trace zip) or "none"
+CAPTURE_MODES = ("video", "trace", "none")
+DEFAULT_CAPTURE_MODE = os.getenv("CAPTURE_MODE", "video")
+
 class EnhancedReportGenerator:
     def __init__(self, output_dir: str = "reports/enhanced"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.screenshots_dir = self.output_dir / "screenshots"
         self.videos_dir = self.output_dir / "videos"
+        self.traces_dir = self.output_dir / "traces"
         self.screenshots_dir.mkdir(exist_ok=True)
         self.videos_dir.mkdir(exist_ok=True)
+        self.traces_dir.mkdir(exist_ok=True)
         
     async def capture_screenshot_async(self, page, analysis_id: str, step_name: str, issue_type: str = "general"):
         """Capture screenshot of current page state (async version)"""
@@ -119,6 +127,41 @@ class EnhancedReportGenerator:
             logger.error(f"Failed to stop video recording: {e}")
         return None
     
+    async def start_trace(self, context, analysis_id: str) -> bool:
+        """Start Playwright tracing with action screenshots and DOM snapshots"""
+        try:
+            await context.tracing.start(
+                name=analysis_id,
+                title=f"UX analysis {analysis_id}",
+                screenshots=True,
+                snapshots=True,
+                sources=False
+            )
+            logger.info(f"🧵 Trace capture started: {analysis_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to start trace capture: {e}")
+            return False
+    
+    async def stop_trace(self, context, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """Stop tracing and write the trace zip; returns its location (no base64 payload)"""
+        try:
+            filename = f"{analysis_id}_trace.zip"
+            filepath = self.traces_dir / filename
+            await context.tracing.stop(path=str(filepath))
+            
+            size_bytes = filepath.stat().st_size if filepath.exists() else 0
+            logger.info(f"🧵 Trace saved: {filename} ({size_bytes} bytes)")
+            return {
+                "file_path": str(filepath),
+                "filename": filename,
+                "size_bytes": size_bytes,
+                "viewer": "npx playwright show-trace " + str(filepath)
+            }
+        except Exception as e:
+            logger.error(f"Failed to stop trace capture: {e}")
+        return None
+    
     async def capture_issue_screenshot_async(self, page, analysis_id: str, issue: Dict[str, Any]):
         """Capture screenshot for a specific issue (async version)"""
         issue_type = issue.get("type", "unknown")
@@ -325,6 +368,7 @@ class EnhancedReportGenerator:
             "enhanced_features": {
                 "screenshots_captured": len(screenshots) if screenshots else 0,
                 "video_recording": video_data is not None,
+                "trace_capture": analysis_data.get("trace") is not None,
                 "craft_bugs_detected": self._count_craft_bugs(analysis_data),
                 "issue_visualization": True,
                 "contextual_media": contextual_media is not None,
@@ -335,6 +379,7 @@ class EnhancedReportGenerator:
             "media_attachments": {
                 "screenshots": screenshots or [],
                 "video": video_data,
+                "trace": analysis_data.get("trace"),
                 "contextual_media": contextual_media or {}
             },
             
@@ -579,12 +624,17 @@ class EnhancedReportGenerator:
                     # Look for timestamp in various possible locations
                     if "timestamp" in metric_value:
                         timestamp = metric_value["timestamp"]
-                    elif "layoutShifts" in metric_value and metric_value["layoutShifts"]:
+                    elif isinstance(metric_value.get("layoutShifts"), list) and metric_value["layoutShifts"]:
                         timestamp = metric_value["layoutShifts"][0].get("timestamp")
-                    elif "animationConflictList" in metric_value and metric_value["animationConflictList"]:
+                    elif isinstance(metric_value.get("animationConflictList"), list) and metric_value["animationConflictList"]:
                         timestamp = metric_value["animationConflictList"][0].get("timestamp")
-                    elif "inputDelays" in metric_value and metric_value["inputDelays"]:
+                    elif isinstance(metric_value.get("inputDelays"), list) and metric_value["inputDelays"]:
                         timestamp = metric_value["inputDelays"][0].get("timestamp")
+                    else:
+                        # Craft bug findings carry metric series summaries instead of raw event lists
+                        firsts = [v["first_ms"] for v in metric_value.values()
+                                  if isinstance(v, dict) and v.get("first_ms") is not None]
+                        timestamp = min(firsts) if firsts else None
                 
                 timeline.append({
                     "timestamp": timestamp,
@@ -602,16 +652,17 @@ class EnhancedReportGenerator:
     
     def save_enhanced_report(self, enhanced_report: Dict[str, Any]) -> str:
         """Save enhanced report to file"""
-        filepath = enhanced_report["storage_metadata"]["file_path"]
-        
-        # Calculate file size
-        report_json = json.dumps(enhanced_report, indent=2)
-        file_size = len(report_json.encode('utf-8'))
-        enhanced_report["storage_metadata"]["file_size_bytes"] = file_size
+        storage_metadata = enhanced_report["storage_metadata"]
+        compression = storage_compression()
+        filepath = str(storage_path(storage_metadata["file_path"], compression))
+        storage_metadata["file_path"] = filepath
+        storage_metadata["filename"] = Path(filepath).name
+        storage_metadata["compression"] = compression
+        storage_metadata["file_size_bytes"] = FILE_SIZE
         
-        # Save to file
-        with open(filepath, 'w') as f:
-            json.dump(enhanced_report, f, indent=2)
+        # Single pass: temp file, fsync, rename into place
+        file_size = write_json_atomic(filepath, enhanced_report, compression=compression)
+        storage_metadata["file_size_bytes"] = file_size
         
         logger.info(f"💾 Enhanced report saved: {filepath} ({file_size} bytes)")
         return filepath
@@ -10,9 +10,17 @@ import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, List, Optional
+import time
 import uuid
 import shutil
 
+from report_index import ReportIndex
+from report_storage import (
+    FILE_SIZE, write_json_atomic, storage_compression, storage_path,
+    read_report_json, open_report, detect_compression, compress_file, REPORT_FILE_SUFFIXES
+)
+from report_id_index import ReportIdIndex, REPORT_FILE_RE
+
 logger = logging.getLogger(__name__)
 
 class EnhancedReportHandler:
@@ -26,85 +34,20 @@ class EnhancedReportHandler:
         (self.reports_dir / "analysis").mkdir(exist_ok=True)
         (self.reports_dir / "screenshots").mkdir(exist_ok=True)
         (self.reports_dir / "scenarios").mkdir(exist_ok=True)
-        (self.reports_dir / "backups").mkdir(exist_ok=True)
         
-        # Index file for quick lookups and analytics
-        self.index_file = self.reports_dir / "analysis_index.json"
-        self.load_index()
-    
-    def load_index(self):
-        """Load or create report index"""
-        try:
-            if self.index_file.exists():
-                with open(self.index_file, 'r') as f:
-                    self.index = json.load(f)
-                    
-                # Ensure required structure
-                if "reports" not in self.index:
-                    self.index["reports"] = {}
-                if "statistics" not in self.index:
-                    self.index["statistics"] = {}
-                    
-            else:
-                self.index = {
-                    "version": "2.0",
-                    "created": datetime.now().isoformat(),
-                    "reports": {},
-                    "statistics": {
-                        "total_reports": 0,
-                        "total_craft_bugs": 0,
-                        "avg_score": 0,
-                        "last_cleanup": None
-                    },
-                    "last_updated": None
-                }
-                self.save_index()
-                
-        except Exception as e:
-            logger.warning(f"Could not load index, creating new: {e}")
-            self.index = {
-                "version": "2.0",
-                "created": datetime.now().isoformat(),
-                "reports": {},
-                "statistics": {
-                    "total_reports": 0,
-                    "total_craft_bugs": 0,
-                    "avg_score": 0,
-                    "last_cleanup": None
-                },
-                "last_updated": None
-            }
-    
-    def save_index(self):
-        """Save report index to disk with backup"""
-        try:
-            # Create backup of existing index
-            if self.index_file.exists():
-                backup_path = self.reports_dir / "backups" / f"index_backup_{int(datetime.now().timestamp())}.json"
-                shutil.copy2(self.index_file, backup_path)
-                
-                # Keep only last 5 backups
-                backups = sorted((self.reports_dir / "backups").glob("index_backup_*.json"))
-                if len(backups) > 5:
-                    for old_backup in backups[:-5]:
-                        old_backup.unlink()
-            
-            # Update metadata
-            self.index["last_updated"] = datetime.now().isoformat()
-            
-            # Save index
-            with open(self.index_file, 'w') as f:
-                json.dump(self.index, f, indent=2, default=str)
-                
-        except Exception as e:
-            logger.error(f"Failed to save index: {e}")
+        # SQLite index for quick lookups and analytics (imports analysis_index.json once)
+        self.index = ReportIndex(str(self.reports_dir))
+        
+        # Sorted in-memory ID index for exact and short-ID report lookups
+        self.report_ids = ReportIdIndex(self.reports_dir / "analysis")
     
     def save_report(self, analysis_id: str, report_data: Dict[str, Any]) -> str:
         """Save report to disk and update index with comprehensive metadata"""
         try:
             # Generate filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"analysis_{analysis_id}_{timestamp}.json"
+            compression = storage_compression()
+            filename = storage_path(f"analysis_{analysis_id}_{timestamp}.json", compression).name
             file_path = self.reports_dir / "analysis" / filename
             
             # Enhance report data with storage metadata
@@ -116,21 +59,14 @@ class EnhancedReportHandler:
                     "file_path": str(file_path),
                     "filename": filename,
                     "version": "2.0",
-                    "file_size_bytes": 0  # Will be updated after saving
+                    "compression": compression,
+                    "file_size_bytes": FILE_SIZE  # Patched in by the writer
                 }
             }
             
-            # Save to disk
-            with open(file_path, 'w') as f:
-                json.dump(enhanced_report, f, indent=2, default=str)
-            
-            # Update file size
-            file_size = file_path.stat().st_size
-            enhanced_report["storage_metadata"]["file_size_bytes"] = file_size
-            
-            # Re-save with correct file size
-            with open(file_path, 'w') as f:
-                json.dump(enhanced_report, f, indent=2, default=str)
+            # Save to disk in one pass: temp file, fsync, rename into place
+            file_size = write_json_atomic(file_path, enhanced_report, compression=compression)
+            self.report_ids.add(file_path)
             
             # Update index with comprehensive metadata
             craft_bugs_count = 0
@@ -153,6 +89,7 @@ class EnhancedReportHandler:
                 "filename": filename,
                 "created_at": datetime.now().isoformat(),
                 "file_size": file_size,
+                "compression": compression,
                 
                 # Analysis metadata
                 "analysis_type": report_data.get("type", "unknown"),
@@ -174,6 +111,7 @@ class EnhancedReportHandler:
                 "total_duration_ms": report_data.get("total_duration_ms", 0),
                 "successful_steps": 0,
                 "total_steps": 0,
+                "step_timing": report_data.get("step_timing") or None,
                 
                 # Enhanced metadata
                 "has_screenshots": bool(self._count_screenshots(report_data)),
@@ -191,14 +129,8 @@ class EnhancedReportHandler:
                 metadata["successful_steps"] = len([s for s in report_data["scenario_results"] if s.get("status") in ["success", "passed"]])
                 metadata["step_success_rate"] = metadata["successful_steps"] / metadata["total_steps"] if metadata["total_steps"] > 0 else 0
             
-            # Add to index
-            self.index["reports"][analysis_id] = metadata
-            
-            # Update global statistics
-            self._update_statistics()
-            
-            # Save updated index
-            self.save_index()
+            # Add to index (single-row transactional upsert)
+            self.index.upsert(analysis_id, metadata)
             
             logger.info(f"✅ Report saved: {filename} ({file_size} bytes, {craft_bugs_count} craft bugs)")
             return str(file_path)
@@ -224,72 +156,47 @@ class EnhancedReportHandler:
         
         return count
     
-    def _update_statistics(self):
-        """Update global statistics in index"""
+    def _statistics(self) -> Dict[str, Any]:
+        """Global statistics, aggregated by the index"""
         try:
-            reports = self.index["reports"]
-            total_reports = len(reports)
-            
-            if total_reports == 0:
-                self.index["statistics"] = {
-                    "total_reports": 0,
-                    "total_craft_bugs": 0,
-                    "avg_score": 0,
-                    "last_cleanup": self.index["statistics"].get("last_cleanup")
-                }
-                return
-            
-            # Calculate statistics
-            total_craft_bugs = sum(r.get("craft_bugs_count", 0) for r in reports.values())
-            total_pattern_issues = sum(r.get("pattern_issues_count", 0) for r in reports.values())
-            scores = [r.get("overall_score", 0) for r in reports.values()]
-            avg_score = sum(scores) / len(scores) if scores else 0
-            
-            # Analysis type distribution
-            type_counts = {}
-            for report in reports.values():
-                analysis_type = report.get("analysis_type", "unknown")
-                type_counts[analysis_type] = type_counts.get(analysis_type, 0) + 1
-            
-            # Recent activity (last 7 days)
             recent_cutoff = (datetime.now() - timedelta(days=7)).isoformat()
-            recent_reports = [r for r in reports.values() if r.get("created_at", "") > recent_cutoff]
-            
-            self.index["statistics"] = {
-                "total_reports": total_reports,
-                "total_craft_bugs": total_craft_bugs,
-                "total_pattern_issues": total_pattern_issues,
-                "total_issues": total_craft_bugs + total_pattern_issues,
-                "avg_score": round(avg_score, 1),
-                "min_score": min(scores) if scores else 0,
-                "max_score": max(scores) if scores else 0,
-                "analysis_type_distribution": type_counts,
-                "recent_reports_count": len(recent_reports),
-                "last_cleanup": self.index["statistics"].get("last_cleanup"),
-                "total_file_size_mb": round(sum(r.get("file_size", 0) for r in reports.values()) / (1024 * 1024), 2)
-            }
-            
+            return self.index.statistics(recent_cutoff)
         except Exception as e:
-            logger.error(f"Failed to update statistics: {e}")
+            logger.error(f"Failed to compute statistics: {e}")
+            return {}
+    
+    def reconcile_statistics(self) -> Dict[str, Any]:
+        """Full recount of the running statistics (they are otherwise updated per save/delete)"""
+        try:
+            result = self.index.reconcile()
+            # The full directory walk happens here, on the reconcile schedule, not per statistics request
+            result["storage"] = self._scan_storage()
+            self.index.set_meta("storage_scan", json.dumps(result["storage"]))
+            logger.info(f"🧮 Report statistics reconciled in {result['duration_ms']} ms ({len(result['drift'])} counters drifted)")
+            return result
+        except Exception as e:
+            logger.error(f"❌ Statistics reconciliation failed: {e}")
+            return {"error": str(e)}
     
     def load_report(self, analysis_id: str) -> Optional[Dict[str, Any]]:
         """Load report from disk"""
         try:
-            if analysis_id not in self.index["reports"]:
+            metadata = self.index.get(analysis_id)
+            if metadata is None:
                 logger.warning(f"Report {analysis_id} not found in index")
                 return None
             
-            file_path = Path(self.index["reports"][analysis_id]["file_path"])
+            file_path = Path(metadata["file_path"])
             
             if not file_path.exists():
                 logger.warning(f"Report file not found: {file_path}")
                 # Remove from index if file is missing
-                del self.index["reports"][analysis_id]
-                self.save_index()
+                self.index.delete([analysis_id])
+                self.report_ids.discard(analysis_id)
                 return None
             
-            with open(file_path, 'r') as f:
-                report_data = json.load(f)
+            # Compressed reports are decompressed transparently
+            report_data = read_report_json(file_path)
             
             logger.info(f"📊 Report loaded: {analysis_id}")
             return report_data
@@ -298,43 +205,15 @@ class EnhancedReportHandler:
             logger.error(f"❌ Failed to load report {analysis_id}: {e}")
             return None
     
+    def resolve_report_path(self, report_id: str) -> Optional[Path]:
+        """Newest report file for a full or short (prefix) ID; raises AmbiguousReportIdError"""
+        return self.report_ids.resolve(report_id)
+    
     def list_reports(self, limit: int = 50, offset: int = 0, filters: Optional[Dict] = None) -> Dict[str, Any]:
         """List reports with pagination and filtering"""
         try:
-            reports_list = list(self.index["reports"].values())
-            
-            # Apply filters
-            if filters:
-                if "analysis_type" in filters:
-                    reports_list = [r for r in reports_list if r.get("analysis_type") == filters["analysis_type"]]
-                
-                if "min_score" in filters:
-                    reports_list = [r for r in reports_list if r.get("overall_score", 0) >= filters["min_score"]]
-                
-                if "max_score" in filters:
-                    reports_list = [r for r in reports_list if r.get("overall_score", 100) <= filters["max_score"]]
-                
-                if "has_craft_bugs" in filters and filters["has_craft_bugs"]:
-                    reports_list = [r for r in reports_list if r.get("craft_bugs_count", 0) > 0]
-                
-                if "url_contains" in filters:
-                    search_term = filters["url_contains"].lower()
-                    reports_list = [r for r in reports_list if search_term in (r.get("url") or "").lower()]
-                
-                if "date_from" in filters:
-                    date_from = filters["date_from"]
-                    reports_list = [r for r in reports_list if r.get("created_at", "") >= date_from]
-                
-                if "date_to" in filters:
-                    date_to = filters["date_to"]
-                    reports_list = [r for r in reports_list if r.get("created_at", "") <= date_to]
-            
-            # Sort by creation date (newest first)
-            reports_list.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-            
-            # Apply pagination
-            total_count = len(reports_list)
-            paginated_reports = reports_list[offset:offset + limit]
+            # Filtering, newest-first ordering and pagination run as one indexed query
+            paginated_reports, total_count = self.index.query(filters, order="newest", limit=limit, offset=offset)
             
             return {
                 "reports": paginated_reports,
@@ -345,7 +224,7 @@ class EnhancedReportHandler:
                     "has_more": offset + limit < total_count
                 },
                 "filters_applied": filters or {},
-                "statistics": self.index["statistics"]
+                "statistics": self._statistics()
             }
             
         except Exception as e:
@@ -359,45 +238,8 @@ class EnhancedReportHandler:
     def search_reports(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Advanced search functionality"""
         try:
-            results = []
-            
-            for analysis_id, metadata in self.index["reports"].items():
-                match = True
-                
-                # Search in URL
-                if "url" in query and query["url"]:
-                    if not metadata.get("url") or query["url"].lower() not in metadata["url"].lower():
-                        match = False
-                
-                # Score range
-                if "score_min" in query and metadata.get("overall_score", 0) < query["score_min"]:
-                    match = False
-                
-                if "score_max" in query and metadata.get("overall_score", 100) > query["score_max"]:
-                    match = False
-                
-                # Craft bugs filter
-                if "has_craft_bugs" in query and query["has_craft_bugs"]:
-                    if metadata.get("craft_bugs_count", 0) == 0:
-                        match = False
-                
-                # Analysis type
-                if "analysis_type" in query and query["analysis_type"]:
-                    if metadata.get("analysis_type") != query["analysis_type"]:
-                        match = False
-                
-                # Date range
-                if "date_from" in query and metadata.get("created_at", "") < query["date_from"]:
-                    match = False
-                
-                if "date_to" in query and metadata.get("created_at", "") > query["date_to"]:
-                    match = False
-                
-                if match:
-                    results.append(metadata)
-            
-            # Sort by relevance (score descending, then date descending)
-            results.sort(key=lambda x: (x.get("overall_score", 0), x.get("created_at", "")), reverse=True)
+            # Sorted by relevance (score descending, then date descending)
+            results, _ = self.index.query(query, order="score")
             
             return results
             
@@ -405,20 +247,43 @@ class EnhancedReportHandler:
             logger.error(f"❌ Search failed: {e}")
             return []
     
+    def _scan_storage(self) -> Dict[str, Any]:
+        """Walk the reports directory: report files (plain or compressed) and bytes on disk"""
+        report_files = 0
+        disk_bytes = 0
+        for path in self.reports_dir.rglob("*"):
+            if path.is_file():
+                disk_bytes += path.stat().st_size
+                if path.name.endswith(REPORT_FILE_SUFFIXES):
+                    report_files += 1
+        return {
+            "total_files": report_files,
+            "disk_usage_bytes": disk_bytes,
+            "scanned_at": datetime.now().isoformat()
+        }
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get comprehensive analysis statistics"""
+        index_info = self.index.info()
+        statistics = self._statistics()
+        # Indexed reports come from the running aggregates; the whole-directory figures from the last reconcile
+        indexed_mb = statistics.get("total_file_size_mb", 0) + index_info["index_file_size"] / (1024 * 1024)
+        scan = json.loads(self.index.get_meta("storage_scan") or "null") or {}
         return {
-            "index_statistics": self.index["statistics"],
+            "index_statistics": statistics,
             "storage_info": {
                 "reports_directory": str(self.reports_dir),
-                "index_file_size": self.index_file.stat().st_size if self.index_file.exists() else 0,
-                "total_files": len(list(self.reports_dir.rglob("*.json"))),
-                "disk_usage_mb": round(sum(f.stat().st_size for f in self.reports_dir.rglob("*") if f.is_file()) / (1024 * 1024), 2)
+                "index_file_size": index_info["index_file_size"],
+                "indexed_reports": statistics.get("total_reports", 0),
+                "total_files": scan.get("total_files", statistics.get("total_reports", 0)),
+                "disk_usage_mb": round(scan["disk_usage_bytes"] / (1024 * 1024), 2) if scan else round(indexed_mb, 2),
+                "disk_scanned_at": scan.get("scanned_at")
             },
             "system_info": {
-                "version": self.index.get("version", "1.0"),
-                "created": self.index.get("created"),
-                "last_updated": self.index.get("last_updated")
+                "version": index_info["version"],
+                "created": index_info["created"],
+                "last_updated": index_info["last_updated"],
+                "index_backend": index_info["backend"]
             }
         }
     
@@ -431,35 +296,34 @@ class EnhancedReportHandler:
             removed_reports = []
             total_size_freed = 0
             
-            for analysis_id, metadata in list(self.index["reports"].items()):
-                if metadata.get("created_at", "") < cutoff_str:
-                    file_path = Path(metadata.get("file_path", ""))
-                    
-                    # Remove file
-                    if file_path.exists():
-                        file_size = file_path.stat().st_size
-                        file_path.unlink()
-                        total_size_freed += file_size
-                        
-                        # Also remove associated screenshots
-                        if "screenshots" in str(file_path):
-                            screenshot_dir = self.reports_dir / "screenshots"
-                            for screenshot in screenshot_dir.glob(f"*{analysis_id}*"):
-                                screenshot.unlink()
+            for analysis_id, metadata in self.index.older_than(cutoff_str):
+                file_path = Path(metadata.get("file_path", ""))
+                
+                # Remove file
+                if file_path.exists():
+                    file_size = file_path.stat().st_size
+                    file_path.unlink()
+                    total_size_freed += file_size
                     
-                    # Remove from index
-                    removed_reports.append({
-                        "analysis_id": analysis_id,
-                        "created_at": metadata.get("created_at"),
-                        "file_size": metadata.get("file_size", 0)
-                    })
-                    del self.index["reports"][analysis_id]
-            
-            # Update statistics and save index
+                    # Also remove associated screenshots
+                    if "screenshots" in str(file_path):
+                        screenshot_dir = self.reports_dir / "screenshots"
+                        for screenshot in screenshot_dir.glob(f"*{analysis_id}*"):
+                            screenshot.unlink()
+                
+                # Queue for removal from the index
+                removed_reports.append({
+                    "analysis_id": analysis_id,
+                    "created_at": metadata.get("created_at"),
+                    "file_size": metadata.get("file_size", 0)
+                })
+            
+            # Remove from index in one transaction
             if removed_reports:
-                self._update_statistics()
-                self.index["statistics"]["last_cleanup"] = datetime.now().isoformat()
-                self.save_index()
+                self.index.delete([r["analysis_id"] for r in removed_reports])
+                for removed in removed_reports:
+                    self.report_ids.discard(removed["analysis_id"])
+                self.index.set_meta("last_cleanup", datetime.now().isoformat())
             
             logger.info(f"🧹 Cleaned up {len(removed_reports)} old reports, freed {total_size_freed / (1024*1024):.2f} MB")
             
@@ -477,10 +341,10 @@ class EnhancedReportHandler:
     def delete_report(self, analysis_id: str) -> bool:
         """Delete a specific report"""
         try:
-            if analysis_id not in self.index["reports"]:
+            metadata = self.index.get(analysis_id)
+            if metadata is None:
                 return False
             
-            metadata = self.index["reports"][analysis_id]
             file_path = Path(metadata.get("file_path", ""))
             
             # Remove file
@@ -488,11 +352,8 @@ class EnhancedReportHandler:
                 file_path.unlink()
             
             # Remove from index
-            del self.index["reports"][analysis_id]
-            
-            # Update statistics and save
-            self._update_statistics()
-            self.save_index()
+            self.index.delete([analysis_id])
+            self.report_ids.discard(analysis_id)
             
             logger.info(f"🗑️ Report {analysis_id} deleted")
             return True
@@ -501,6 +362,52 @@ class EnhancedReportHandler:
             logger.error(f"❌ Failed to delete report {analysis_id}: {e}")
             return False
     
+    def recompress_reports(self, compression: Optional[str] = None, min_size_bytes: int = 0,
+                           directories: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Compress stored plain JSON reports (reports/analysis and reports/enhanced), keeping the index in step"""
+        compression = storage_compression(compression) or "gzip"
+        directories = [Path(d) for d in directories] if directories else [
+            self.reports_dir / "analysis", self.reports_dir / "enhanced"
+        ]
+        started = time.perf_counter()
+        summary = {"compression": compression, "compressed": 0, "skipped": 0, "failed": 0,
+                   "bytes_before": 0, "bytes_after": 0}
+        
+        for directory in directories:
+            for path in sorted(directory.glob("*.json")):
+                try:
+                    size = path.stat().st_size
+                    if size < min_size_bytes or detect_compression(path):
+                        summary["skipped"] += 1
+                        continue
+                    
+                    new_path = compress_file(path, compression)
+                    summary["compressed"] += 1
+                    summary["bytes_before"] += size
+                    summary["bytes_after"] += new_path.stat().st_size
+                    
+                    # Point the index at the compressed file
+                    match = REPORT_FILE_RE.match(new_path.name)
+                    metadata = self.index.get(match["id"]) if match else None
+                    if metadata and Path(metadata.get("file_path", "")).name == path.name:
+                        metadata["file_path"] = str(Path(metadata["file_path"]).with_name(new_path.name))
+                        metadata["filename"] = new_path.name
+                        metadata["file_size"] = new_path.stat().st_size
+                        metadata["compression"] = compression
+                        self.index.upsert(match["id"], metadata)
+                    if match:
+                        self.report_ids.add(new_path)
+                        
+                except Exception as e:
+                    logger.error(f"❌ Failed to compress {path}: {e}")
+                    summary["failed"] += 1
+        
+        summary["saved_mb"] = round((summary["bytes_before"] - summary["bytes_after"]) / (1024 * 1024), 2)
+        summary["ratio"] = round(summary["bytes_after"] / summary["bytes_before"], 3) if summary["bytes_before"] else None
+        summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"🗜️ Recompressed {summary['compressed']} reports with {compression}, saved {summary['saved_mb']} MB")
+        return summary
+    
     def export_reports(self, analysis_ids: List[str], export_path: str) -> str:
         """Export specific reports to a ZIP file"""
         try:
@@ -511,11 +418,14 @@ class EnhancedReportHandler:
             
             with zipfile.ZipFile(export_file, 'w', zipfile.ZIP_DEFLATED) as zip_file:
                 for analysis_id in analysis_ids:
-                    if analysis_id in self.index["reports"]:
-                        metadata = self.index["reports"][analysis_id]
+                    metadata = self.index.get(analysis_id)
+                    if metadata is not None:
                         file_path = Path(metadata.get("file_path", ""))
                         
-                        if file_path.exists():
+                        if file_path.exists() and detect_compression(file_path):
+                            with open_report(file_path) as f, zip_file.open(f"{analysis_id}.json", "w") as out:
+                                shutil.copyfileobj(f, out)
+                        elif file_path.exists():
                             zip_file.write(file_path, f"{analysis_id}.json")
                 
                 # Add index for reference
@@ -565,3 +475,11 @@ def search_saved_reports(query: Dict[str, Any]) -> List[Dict[str, Any]]:
 def cleanup_old_reports(days_to_keep: int = 30) -> Dict[str, Any]:
     """Clean up old reports"""
     return get_report_handler().cleanup_old_reports(days_to_keep)
+
+def reconcile_report_statistics() -> Dict[str, Any]:
+    """Recompute report statistics from the index"""
+    return get_report_handler().reconcile_statistics()
+
+def resolve_report_path(report_id: str) -> Optional[Path]:
+    """Resolve a full or short report ID to its file"""
+    return get_report_handler().resolve_report_path(report_id)
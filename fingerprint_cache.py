@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Fingerprint Cache
+Cheap in-page fingerprint of the DOM structure plus the craft bug metrics counters; detector
+outputs are cached by it so detectors only re-run when the page has meaningfully changed
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Off by default: cached detectors are cheap Python over a snapshot taken anyway, so a hit saves
+# little next to the extra in-page walk every analysis pays for the fingerprint
+FINGERPRINT_CACHE_ENABLED = os.getenv("FINGERPRINT_CACHE", "false").lower() == "true"
+
+# Cached detector outputs kept per process (LRU)
+FINGERPRINT_CACHE_SIZE = int(os.getenv("FINGERPRINT_CACHE_SIZE", "512"))
+
+# Pins the build identity instead of hashing the page's scripts
+MOCK_BUILD_ID = os.getenv("MOCK_BUILD_ID", "")
+
+# What a detector's output depends on: 'structure' (DOM shape) or 'state' (DOM shape plus metrics counters)
+FINGERPRINT_SCOPES = ("structure", "state")
+
+# FNV-1a over tag names, child counts and attribute names (not values) in document order;
+# the probes' own data-craft-* marker attributes are ignored. The build is identified by a hash of
+# the page's script sources and inline script text, which (unlike document.lastModified) is stable
+# across loads of the same build
+FINGERPRINT_JS = """
+() => {
+    const fnv = (text, seed) => {
+        let value = seed;
+        for (let i = 0; i < text.length; i++) {
+            value ^= text.charCodeAt(i);
+            value = Math.imul(value, 0x01000193) >>> 0;
+        }
+        return value;
+    };
+    let hash = 0x811c9dc5;
+    const mix = (text) => { hash = fnv(text, hash); };
+    let scripts = 0x811c9dc5;
+    for (const script of document.scripts) {
+        scripts = fnv(script.src || script.text, scripts);
+    }
+    const elements = document.getElementsByTagName('*');
+    for (let i = 0; i < elements.length; i++) {
+        const el = elements[i];
+        const names = [];
+        for (let j = 0; j < el.attributes.length; j++) {
+            const name = el.attributes[j].name;
+            if (!name.startsWith('data-craft-')) names.push(name);
+        }
+        mix(el.tagName + '/' + el.childElementCount + '[' + names.sort().join(',') + ']');
+    }
+    return {
+        build: location.origin + location.pathname + '@' + scripts.toString(16),
+        nodes: elements.length,
+        structure: hash.toString(16)
+    };
+}
+"""
+
+async def capture_fingerprint(page) -> Optional[Dict[str, Any]]:
+    """Structure fingerprint of the current page, or None when it cannot be read"""
+    started = time.perf_counter()
+    try:
+        fingerprint = await page.evaluate(FINGERPRINT_JS)
+    except Exception as e:
+        logger.debug(f"Could not fingerprint page: {e}")
+        return None
+    if not isinstance(fingerprint, dict) or "structure" not in fingerprint:
+        return None
+    if MOCK_BUILD_ID:
+        fingerprint["build"] = fingerprint["build"].split("@")[0] + "@" + MOCK_BUILD_ID
+    fingerprint["capture_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return fingerprint
+
+def metrics_counters(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Counters from the craft bug metrics object: list lengths and scalar values"""
+    counters = {}
+    for key, value in (metrics or {}).items():
+        if isinstance(value, (list, tuple, dict)):
+            counters[key] = len(value)
+        elif isinstance(value, (bool, int, float, str)) or value is None:
+            counters[key] = value
+    return counters
+
+class FingerprintCache:
+    """LRU of detector findings keyed by build, detector and page fingerprint"""
+
+    def __init__(self, max_entries: int = FINGERPRINT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.by_detector: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def key(spec, fingerprint: Optional[Dict[str, Any]], snapshot: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Cache key for a detector, or None when its output cannot be cached"""
+        if fingerprint is None or spec.fingerprint not in FINGERPRINT_SCOPES:
+            return None
+        parts = [fingerprint["build"], spec.name, str(fingerprint["nodes"]), fingerprint["structure"]]
+        if spec.fingerprint == "state":
+            if snapshot is None or snapshot.get("error"):
+                return None
+            counters = json.dumps(metrics_counters(snapshot.get("all_metrics")), sort_keys=True, default=str)
+            parts.append(hashlib.sha1(counters.encode()).hexdigest()[:16])
+        return "|".join(parts)
+
+    def get(self, name: str, key: Optional[str]) -> Optional[List[Any]]:
+        """Cached findings (fresh copies) or None; counts the hit or miss"""
+        if key is None:
+            return None
+        stats = self.by_detector.setdefault(name, {"hits": 0, "misses": 0})
+        findings = self._entries.get(key)
+        if findings is None:
+            self.misses += 1
+            stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        stats["hits"] += 1
+        now = time.time()
+        return [replace(finding, timestamp=now) for finding in findings]
+
+    def put(self, key: Optional[str], findings: List[Any]):
+        if key is None:
+            return
+        self._entries[key] = list(findings)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_summary(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "by_detector": {name: dict(stats) for name, stats in self.by_detector.items()}
+        }
+
+# Global cache shared by every analysis in this process
+_fingerprint_cache = None
+
+def get_fingerprint_cache() -> FingerprintCache:
+    """Get or create the global fingerprint cache"""
+    global _fingerprint_cache
+    if _fingerprint_cache is None:
+        _fingerprint_cache = FingerprintCache()
+    return _fingerprint_cache
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Frame Sampler
+requestAnimationFrame frame-time sampler kept in a fixed-size Float32Array ring inside the page;
+only compact stats (percentiles, dropped frames, histogram) ever cross back to Python
+"""
+
+import os
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Frames kept in the ring (~10 s at 60 Hz)
+FRAME_SAMPLE_SIZE = int(os.getenv("FRAME_SAMPLE_SIZE", "600"))
+
+# Starts after the load event; gaps over a second are pauses (hidden tab, debugger), not judder.
+# Each frame is flagged when a CSS/Web Animation was running, so judder is judged within animation windows
+FRAME_SAMPLER_JS = """
+(() => {
+    if (window.__craftFrameSampler) return;
+    const SIZE = %(size)d, BUDGET = 1000 / 60, MAX_GAP = 1000;
+    const BUCKETS = [[8.5, '<=8ms'], [17, '<=17ms'], [33.5, '<=33ms'], [50.5, '<=50ms'], [100.5, '<=100ms'], [Infinity, '>100ms']];
+    const ring = new Float32Array(SIZE);
+    const animating = new Uint8Array(SIZE);
+    let count = 0, next = 0, total = 0, last = null, started = false;
+    const tick = (now) => {
+        if (last !== null) {
+            const delta = now - last;
+            if (delta < MAX_GAP) {
+                ring[next] = delta;
+                animating[next] = document.getAnimations().some(a => a.playState === 'running') ? 1 : 0;
+                next = (next + 1) %% SIZE;
+                count = Math.min(count + 1, SIZE);
+                total++;
+            }
+        }
+        last = now;
+        requestAnimationFrame(tick);
+    };
+    const start = () => { if (!started) { started = true; requestAnimationFrame(tick); } };
+    if (document.readyState === 'complete') start(); else window.addEventListener('load', start, {once: true});
+    window.__craftFrameSampler = {
+        stats() {
+            const frames = Float32Array.from(ring.subarray(0, count)).sort();
+            const n = frames.length;
+            const pct = (p) => n ? frames[Math.min(n - 1, Math.max(0, Math.ceil(p * n) - 1))] : 0;
+            const animFrames = Float32Array.from(ring.subarray(0, count).filter((_, i) => animating[i])).sort();
+            const animN = animFrames.length;
+            const histogram = {};
+            BUCKETS.forEach(([, label]) => histogram[label] = 0);
+            let sum = 0, dropped = 0, long = 0;
+            for (const delta of frames) {
+                sum += delta;
+                if (delta > BUDGET * 1.5) dropped += Math.round(delta / BUDGET) - 1;
+                if (delta > BUDGET * 2) long++;
+                histogram[BUCKETS.find(([limit]) => delta <= limit)[1]]++;
+            }
+            const round = (v) => Math.round(v * 100) / 100;
+            return {
+                samples: n,
+                frames_total: total,
+                budget_ms: round(BUDGET),
+                p50_ms: round(pct(0.5)),
+                p95_ms: round(pct(0.95)),
+                max_ms: round(n ? frames[n - 1] : 0),
+                mean_ms: round(n ? sum / n : 0),
+                dropped_frames: dropped,
+                long_frames: long,
+                histogram,
+                animation: {
+                    samples: animN,
+                    long_frames: animFrames.filter(delta => delta > BUDGET * 2).length,
+                    p95_ms: round(animN ? animFrames[Math.min(animN - 1, Math.ceil(0.95 * animN) - 1)] : 0)
+                }
+            };
+        },
+        reset() { count = 0; next = 0; total = 0; last = null; },
+        start
+    };
+})();
+""" % {"size": FRAME_SAMPLE_SIZE}
+
+FRAME_STATS_JS = "() => window.__craftFrameSampler ? window.__craftFrameSampler.stats() : null"
+
+async def install_frame_sampler(context):
+    """Register the sampler on a context so every page samples from its first load"""
+    await context.add_init_script(FRAME_SAMPLER_JS)
+
+async def ensure_frame_sampler(page):
+    """Start the sampler on an already-loaded page that did not get the init script"""
+    try:
+        await page.evaluate(f"() => {{ {FRAME_SAMPLER_JS}; window.__craftFrameSampler.start(); }}")
+    except Exception as e:
+        logger.debug(f"Could not start frame sampler: {e}")
+
+async def read_frame_stats(page, reset: bool = False) -> Optional[Dict[str, Any]]:
+    """Compact frame-time stats since the last reset, or None when the sampler is not running"""
+    try:
+        stats = await page.evaluate(FRAME_STATS_JS)
+        if reset:
+            await page.evaluate("() => window.__craftFrameSampler && window.__craftFrameSampler.reset()")
+        return stats
+    except Exception as e:
+        logger.debug(f"Could not read frame stats: {e}")
+        return None
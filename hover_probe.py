@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Hover Probe
+One in-page pass matches every interactive element against the stylesheets' :hover rules;
+only elements the scan cannot decide are confirmed with real hovers, within a time budget
+"""
+
+import os
+import time
+import logging
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE_SELECTOR = 'button, a, .clickable, [role="button"]'
+PROBE_ATTRIBUTE = "data-craft-hover-probe"
+
+# Total time allowed for confirming ambiguous elements with real hovers
+HOVER_CONFIRM_BUDGET_MS = int(os.getenv("HOVER_CONFIRM_BUDGET_MS", "1500"))
+
+# Computed properties compared before/after a real hover
+HOVER_STYLE_PROPERTIES = [
+    "cursor", "backgroundColor", "color", "borderColor", "boxShadow",
+    "textDecorationLine", "opacity", "transform", "outlineStyle", "filter"
+]
+
+HOVER_SCAN_JS = """
+({selector, attribute, properties}) => {
+    const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const describe = (el, index) => ({
+        index,
+        tag: el.tagName,
+        id: el.id || null,
+        text: (el.innerText || el.getAttribute('aria-label') || '').trim().slice(0, 40)
+    });
+    const stripPseudoElements = (sel) => sel.replace(/::?(before|after|first-line|first-letter|marker|placeholder|selection)\\b/g, '');
+    const subjects = [], contextual = [];
+    let hoverRules = 0, inaccessibleSheets = 0;
+
+    // :hover on the rule's subject styles the element itself; :hover on an ancestor only sometimes does
+    const walk = (rules) => {
+        for (const rule of rules) {
+            if (!rule.selectorText) {
+                if (rule.cssRules) walk(rule.cssRules);  // @media, @supports, ...
+                continue;
+            }
+            if (!rule.selectorText.includes(':hover')) continue;
+            hoverRules++;
+            for (const part of rule.selectorText.split(',')) {
+                const sel = part.trim();
+                const at = sel.lastIndexOf(':hover');
+                if (at < 0) continue;
+                const tail = stripPseudoElements(sel.slice(at + 6));
+                const base = stripPseudoElements(sel.replace(/:hover/g, '')).trim() || '*';
+                if (!/[\\s>+~]/.test(tail)) subjects.push(base);
+                else contextual.push(sel.slice(0, at).replace(/:hover/g, '').trim() || '*');
+            }
+        }
+    };
+    for (const sheet of Array.from(document.styleSheets)) {
+        try { walk(sheet.cssRules); } catch (e) { inaccessibleSheets++; }
+    }
+    const matches = (el, sel) => { try { return el.matches(sel); } catch (e) { return false; } };
+    const inside = (el, sel) => { try { return !!el.closest(sel); } catch (e) { return false; } };
+
+    const result = {scanned: 0, styled: 0, hover_rules: hoverRules, inaccessible_sheets: inaccessibleSheets,
+                    ambiguous: [], missing: []};
+    Array.from(document.querySelectorAll(selector)).forEach((el, index) => {
+        if (!visible(el)) return;
+        result.scanned++;
+        if (subjects.some(sel => matches(el, sel))) { result.styled++; return; }
+        const scripted = el.hasAttribute('onmouseover') || el.hasAttribute('onmouseenter') ||
+                         typeof el.onmouseover === 'function' || typeof el.onmouseenter === 'function';
+        if (scripted || inaccessibleSheets > 0 || contextual.some(sel => inside(el, sel))) {
+            el.setAttribute(attribute, String(index));
+            const style = getComputedStyle(el);
+            result.ambiguous.push({...describe(el, index), baseline: properties.map(p => style[p])});
+        } else {
+            result.missing.push(describe(el, index));
+        }
+    });
+    return result;
+}
+"""
+
+# Resolves after two frames so hover transitions have started before styles are compared
+HOVER_DIFF_JS = """
+([el, baseline, properties]) => new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(() => {
+    const style = getComputedStyle(el);
+    resolve(properties.some((p, i) => style[p] !== baseline[i]));
+})))
+"""
+
+HOVER_CLEANUP_JS = "(attribute) => document.querySelectorAll(`[${attribute}]`).forEach(el => el.removeAttribute(attribute))"
+
+async def scan_hover_feedback(page, budget_ms: int = HOVER_CONFIRM_BUDGET_MS) -> Dict[str, Any]:
+    """Classify every visible interactive element; returns coverage plus the elements without hover feedback"""
+    started = time.perf_counter()
+    scan = await page.evaluate(HOVER_SCAN_JS, {
+        "selector": INTERACTIVE_SELECTOR,
+        "attribute": PROBE_ATTRIBUTE,
+        "properties": HOVER_STYLE_PROPERTIES
+    })
+    scan_ms = (time.perf_counter() - started) * 1000
+
+    confirmed_with_feedback = 0
+    unconfirmed = []
+    deadline = time.perf_counter() + budget_ms / 1000
+    try:
+        for element in scan["ambiguous"]:
+            remaining_ms = (deadline - time.perf_counter()) * 1000
+            if remaining_ms <= 0:
+                unconfirmed.append(element)
+                continue
+            try:
+                handle = await page.query_selector(f'[{PROBE_ATTRIBUTE}="{element["index"]}"]')
+                await handle.hover(timeout=min(1000, remaining_ms))
+                changed = await page.evaluate(HOVER_DIFF_JS, [handle, element["baseline"], HOVER_STYLE_PROPERTIES])
+            except Exception as e:
+                logger.debug(f"Hover confirmation failed for element {element['index']}: {e}")
+                unconfirmed.append(element)
+                continue
+            if changed:
+                confirmed_with_feedback += 1
+            else:
+                scan["missing"].append({k: v for k, v in element.items() if k != "baseline"})
+    finally:
+        try:
+            await page.evaluate(HOVER_CLEANUP_JS, PROBE_ATTRIBUTE)
+        except Exception:
+            pass
+
+    return {
+        "scanned": scan["scanned"],
+        "styled": scan["styled"] + confirmed_with_feedback,
+        "hover_rules": scan["hover_rules"],
+        "inaccessible_sheets": scan["inaccessible_sheets"],
+        "ambiguous": len(scan["ambiguous"]),
+        "confirmed_by_hover": len(scan["ambiguous"]) - len(unconfirmed),
+        "unconfirmed": len(unconfirmed),
+        "missing": sorted(scan["missing"], key=lambda e: e["index"]),
+        "scan_ms": round(scan_ms, 2),
+        "total_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Input Timing
+Event Timing API (PerformanceObserver 'event' entries) measurement of input-to-next-paint latency
+for probed elements, so input lag reflects the app rather than Playwright IPC or host load
+"""
+
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+PROBE_ATTRIBUTE = "data-craft-input-probe"
+
+# Smallest durationThreshold the Event Timing API accepts; faster events are never reported
+EVENT_TIMING_THRESHOLD_MS = 16
+
+# Returns false when the browser has no Event Timing support
+INPUT_TIMING_JS = """
+() => {
+    if (window.__craftInputTiming) return true;
+    if (!('PerformanceEventTiming' in window)) return false;
+    const ATTR = '%(attribute)s', MAX_ENTRIES = 500;
+    const entries = [];
+    const keyOf = (target) => {
+        const el = target && target.closest ? target.closest(`[${ATTR}]`) : null;
+        return el ? el.getAttribute(ATTR) : null;
+    };
+    const record = (e) => {
+        const key = keyOf(e.target);
+        if (!key) return;
+        entries.push({
+            key,
+            name: e.name,
+            duration: e.duration,
+            input_delay: e.processingStart - e.startTime,
+            processing: e.processingEnd - e.processingStart,
+            presentation: Math.max(0, e.startTime + e.duration - e.processingEnd)
+        });
+        if (entries.length > MAX_ENTRIES) entries.shift();
+    };
+    const observer = new PerformanceObserver(list => list.getEntries().forEach(record));
+    observer.observe({type: 'event', durationThreshold: %(threshold)d, buffered: true});
+
+    const round = (v) => Math.round(v * 100) / 100;
+    const pct = (values, p) => {
+        if (!values.length) return 0;
+        const sorted = Float64Array.from(values).sort();
+        return round(sorted[Math.min(sorted.length - 1, Math.max(0, Math.ceil(p * sorted.length) - 1))]);
+    };
+    const summarize = (list) => {
+        const byEvent = {};
+        list.forEach(e => byEvent[e.name] = (byEvent[e.name] || 0) + 1);
+        const durations = list.map(e => e.duration);
+        return {
+            events: list.length,
+            p50_ms: pct(durations, 0.5),
+            p95_ms: pct(durations, 0.95),
+            max_ms: round(durations.length ? Math.max(...durations) : 0),
+            input_delay_p95_ms: pct(list.map(e => e.input_delay), 0.95),
+            processing_p95_ms: pct(list.map(e => e.processing), 0.95),
+            presentation_p95_ms: pct(list.map(e => e.presentation), 0.95),
+            by_event: byEvent
+        };
+    };
+    window.__craftInputTiming = {
+        // Per-key summaries, or one key's summary; pending observer records are folded in first
+        summary(key) {
+            observer.takeRecords().forEach(record);
+            if (key) return summarize(entries.filter(e => e.key === key));
+            const keys = [...new Set(entries.map(e => e.key))];
+            return Object.fromEntries(keys.map(k => [k, summarize(entries.filter(e => e.key === k))]));
+        }
+    };
+    return true;
+}
+""" % {"attribute": PROBE_ATTRIBUTE, "threshold": EVENT_TIMING_THRESHOLD_MS}
+
+# Waits two frames so the interaction's next paint has happened before entries are read
+READ_LATENCY_JS = """
+(key) => new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(
+    () => resolve(window.__craftInputTiming ? window.__craftInputTiming.summary(key) : null)
+)))
+"""
+
+async def ensure_input_timing(page) -> bool:
+    """Start the Event Timing observer; False when the browser cannot measure input-to-paint"""
+    try:
+        return bool(await page.evaluate(INPUT_TIMING_JS))
+    except Exception as e:
+        logger.debug(f"Could not start input timing: {e}")
+        return False
+
+async def tag_probe_element(element, key: str):
+    """Mark an element so its Event Timing entries are attributed to key"""
+    await element.evaluate("(el, [attribute, key]) => el.setAttribute(attribute, key)", [PROBE_ATTRIBUTE, key])
+
+async def read_input_latency(page, key: str) -> Optional[Dict[str, Any]]:
+    """Input-to-next-paint latency distribution for one probed element"""
+    try:
+        return await page.evaluate(READ_LATENCY_JS, key)
+    except Exception as e:
+        logger.debug(f"Could not read input latency for {key}: {e}")
+        return None
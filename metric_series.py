@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Metric Series
+Turns the craft bug metric lists (layoutShifts, inputDelays, ...) into compact arrays and
+summarizes every series in one vectorized pass: count, p95, max, mean and rate per second
+"""
+
+import math
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Series summarized from the metrics object, with the entry field holding each event's value
+# (None: entries are plain numbers, or events without a magnitude)
+SERIES_FIELDS = {
+    'layoutShifts': 'value',
+    'animationConflicts': None,
+    'inputDelays': 'delay',
+    'buttonResponseTimes': None,
+    'feedbackFailures': 'delay',
+}
+
+def _number(value) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else math.nan
+
+def _columns(entries, field: Optional[str]) -> Tuple[List[float], List[float]]:
+    """(values, timestamps) of one series; NaN where an entry has none"""
+    values, timestamps = [], []
+    for entry in entries if isinstance(entries, list) else []:
+        if isinstance(entry, dict):
+            values.append(_number(entry.get(field)) if field else math.nan)
+            timestamps.append(_number(entry.get('timestamp')))
+        else:
+            values.append(_number(entry))
+            timestamps.append(math.nan)
+    return values, timestamps
+
+def _summary(count: int, p95: float, maximum: float, mean: float, first: float, last: float) -> Dict[str, Any]:
+    span_ms = last - first if count > 1 and not math.isnan(first) else 0.0
+    clean = lambda v: None if math.isnan(v) else round(v, 2)
+    return {
+        'count': count,
+        'p95': clean(p95),
+        'max': clean(maximum),
+        'mean': clean(mean),
+        'rate_per_s': round(count / (span_ms / 1000), 3) if span_ms > 0 else None,
+        'first_ms': clean(first),
+        'last_ms': clean(last),
+    }
+
+def _summarize_numpy(columns: List[Tuple[List[float], List[float]]]) -> List[Dict[str, Any]]:
+    k = len(columns)
+    counts = np.array([len(values) for values, _ in columns], dtype=np.int64)
+    values = np.fromiter((v for column, _ in columns for v in column), dtype=np.float64, count=int(counts.sum()))
+    timestamps = np.fromiter((t for _, column in columns for t in column), dtype=np.float64, count=int(counts.sum()))
+    segment = np.repeat(np.arange(k), counts)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # Sort within each series; NaN (events without a value) sort to the end of their series
+    valid = ~np.isnan(values)
+    valid_counts = np.bincount(segment[valid], minlength=k)
+    ordered = values[np.lexsort((values, segment))]
+    last_index = max(len(ordered) - 1, 0)
+    has_values = valid_counts > 0
+    if len(ordered):
+        p95 = ordered[np.minimum(starts + np.maximum(np.ceil(0.95 * valid_counts).astype(np.int64) - 1, 0), last_index)]
+        maximum = ordered[np.minimum(starts + np.maximum(valid_counts - 1, 0), last_index)]
+    else:
+        p95 = maximum = np.zeros(k)
+    sums = np.bincount(segment[valid], weights=values[valid], minlength=k)
+    p95 = np.where(has_values, p95, np.nan)
+    maximum = np.where(has_values, maximum, np.nan)
+    mean = np.where(has_values, sums / np.maximum(valid_counts, 1), np.nan)
+
+    timed = ~np.isnan(timestamps)
+    first = np.full(k, np.inf)
+    last = np.full(k, -np.inf)
+    np.minimum.at(first, segment[timed], timestamps[timed])
+    np.maximum.at(last, segment[timed], timestamps[timed])
+    first[np.isinf(first)] = np.nan
+    last[np.isinf(last)] = np.nan
+
+    return [_summary(int(counts[i]), float(p95[i]), float(maximum[i]), float(mean[i]), float(first[i]), float(last[i]))
+            for i in range(k)]
+
+def _summarize_python(values: List[float], timestamps: List[float]) -> Dict[str, Any]:
+    present = sorted(v for v in values if not math.isnan(v))
+    timed = [t for t in timestamps if not math.isnan(t)]
+    n = len(present)
+    return _summary(
+        len(values),
+        present[min(n - 1, max(0, math.ceil(0.95 * n) - 1))] if n else math.nan,
+        present[-1] if n else math.nan,
+        sum(present) / n if n else math.nan,
+        min(timed) if timed else math.nan,
+        max(timed) if timed else math.nan,
+    )
+
+def summarize_metrics(metrics: Dict[str, Any], fields: Dict[str, Optional[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Summary stats for every metric series"""
+    fields = fields or SERIES_FIELDS
+    metrics = metrics or {}
+    columns = [_columns(metrics.get(name), field) for name, field in fields.items()]
+    if NUMPY_AVAILABLE:
+        summaries = _summarize_numpy(columns)
+    else:
+        summaries = [_summarize_python(values, timestamps) for values, timestamps in columns]
+    return dict(zip(fields, summaries))
+
+def evaluate_thresholds(summaries: Dict[str, Dict[str, Any]],
+                        limits: Dict[str, Tuple[str, float]]) -> Dict[str, bool]:
+    """Which series reach their limit; limits map series -> (stat, minimum), compared in one pass"""
+    names = [name for name in limits if name in summaries]
+    observed = [summaries[name].get(limits[name][0]) for name in names]
+    observed = [math.nan if value is None else float(value) for value in observed]
+    minimums = [float(limits[name][1]) for name in names]
+    if NUMPY_AVAILABLE:
+        reached = (np.array(observed, dtype=np.float64) >= np.array(minimums, dtype=np.float64)).tolist()
+    else:
+        reached = [value >= minimum for value, minimum in zip(observed, minimums)]
+    return dict(zip(names, reached))
+
+def metric_series(snapshot: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Series summaries for a page snapshot, computed once and kept on the snapshot"""
+    if 'series' not in snapshot:
+        snapshot['series'] = summarize_metrics(snapshot.get('metrics'))
+    return snapshot['series']
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Page Conditions
+Condition-based waits (network idle, animations finished, stable selector, metrics ready)
+that replace fixed sleeps in scenario steps and craft bug detection
+"""
+
+import time
+import logging
+from typing import Dict, Any, Optional
+
+try:
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+    PlaywrightTimeoutError = TimeoutError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONDITION_TIMEOUT_MS = 10000
+
+# Finite animations still running (infinite spinners/pulses would never finish)
+ANIMATIONS_FINISHED_JS = """
+() => document.getAnimations().every(a => {
+    if (a.playState !== 'running') return true;
+    const timing = a.effect && a.effect.getComputedTiming ? a.effect.getComputedTiming() : {};
+    return timing.endTime === Infinity;
+})
+"""
+
+METRICS_READY_JS = """
+() => !!(window.craftBugMetrics || window.excelCraftBugMetrics || window.pptCraftBugMetrics)
+"""
+
+# Element exists, is visible and its box has not moved for `frames` consecutive animation frames
+SELECTOR_STABLE_JS = """
+({ selector, frames }) => {
+    const el = document.querySelector(selector);
+    if (!el) return false;
+    const r = el.getBoundingClientRect();
+    if (r.width === 0 && r.height === 0) return false;
+    const key = `${r.x}|${r.y}|${r.width}|${r.height}`;
+    const state = (window.__uxStableSelectors = window.__uxStableSelectors || {});
+    const prev = state[selector];
+    if (!prev || prev.key !== key) {
+        state[selector] = { key, count: 0 };
+        return false;
+    }
+    prev.count += 1;
+    return prev.count >= frames;
+}
+"""
+
+# No DOM mutations for `quietMs` - catches delayed handlers that update the page via setTimeout
+DOM_QUIET_JS = """
+({ quietMs }) => {
+    if (!window.__uxDomQuiet) {
+        window.__uxDomQuiet = { last: performance.now() };
+        new MutationObserver(() => { window.__uxDomQuiet.last = performance.now(); })
+            .observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+    }
+    return performance.now() - window.__uxDomQuiet.last >= quietMs;
+}
+"""
+
+# No delayed craft bug handler still pending: the mock apps count the handlers they schedule in
+# pendingHandlers on their metrics object. Pages without such a counter have nothing to wait for
+METRICS_SETTLED_JS = """
+() => [window.craftBugMetrics, window.excelCraftBugMetrics, window.pptCraftBugMetrics]
+    .every(metrics => !metrics || !metrics.pendingHandlers)
+"""
+
+async def _load(page, timeout_ms: int, options: Dict[str, Any]):
+    await page.wait_for_load_state("load", timeout=timeout_ms)
+
+async def _network_idle(page, timeout_ms: int, options: Dict[str, Any]):
+    await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+
+async def _animations_finished(page, timeout_ms: int, options: Dict[str, Any]):
+    await page.wait_for_function(ANIMATIONS_FINISHED_JS, timeout=timeout_ms, polling="raf")
+
+async def _metrics_ready(page, timeout_ms: int, options: Dict[str, Any]):
+    await page.wait_for_function(METRICS_READY_JS, timeout=timeout_ms)
+
+async def _selector_stable(page, timeout_ms: int, options: Dict[str, Any]):
+    selector = options.get("selector")
+    if not selector:
+        raise ValueError("The 'stable' condition needs a target selector")
+    await page.wait_for_function(
+        SELECTOR_STABLE_JS,
+        arg={"selector": selector, "frames": options.get("frames", 3)},
+        timeout=timeout_ms,
+        polling="raf"
+    )
+
+async def _dom_quiet(page, timeout_ms: int, options: Dict[str, Any]):
+    await page.wait_for_function(
+        DOM_QUIET_JS,
+        arg={"quietMs": options.get("quiet_ms", 300)},
+        timeout=timeout_ms,
+        polling=50
+    )
+
+async def _metrics_settled(page, timeout_ms: int, options: Dict[str, Any]):
+    await page.wait_for_function(METRICS_SETTLED_JS, timeout=timeout_ms, polling=50)
+
+CONDITION_WAITERS = {
+    "load": _load,
+    "network_idle": _network_idle,
+    "animations": _animations_finished,
+    "metrics": _metrics_ready,
+    "stable": _selector_stable,
+    "dom_quiet": _dom_quiet,
+    "metrics_settled": _metrics_settled,
+}
+
+async def wait_for_condition(page, condition: str, timeout_ms: Optional[int] = None,
+                             **options) -> Dict[str, Any]:
+    """Wait until a page condition holds; never raises on timeout, reports how long it waited"""
+    if condition not in CONDITION_WAITERS:
+        raise ValueError(f"Unknown wait condition '{condition}'. Available: {', '.join(CONDITION_WAITERS)}")
+
+    timeout_ms = int(timeout_ms or DEFAULT_CONDITION_TIMEOUT_MS)
+    started = time.perf_counter()
+    satisfied = True
+    try:
+        await CONDITION_WAITERS[condition](page, timeout_ms, options)
+    except PlaywrightTimeoutError:
+        satisfied = False
+        logger.debug(f"⏱️ Condition '{condition}' not met within {timeout_ms}ms")
+
+    return {
+        "condition": condition,
+        "satisfied": satisfied,
+        "timeout_ms": timeout_ms,
+        "waited_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+async def wait_for_page_ready(page, timeout_ms: Optional[int] = None,
+                              metrics_grace_ms: int = 2000) -> Dict[str, Any]:
+    """Wait for load, the craft bug metrics object (short grace - real sites never set it), then settled animations"""
+    timeout_ms = int(timeout_ms or DEFAULT_CONDITION_TIMEOUT_MS)
+    started = time.perf_counter()
+
+    def remaining() -> int:
+        return max(1, timeout_ms - int((time.perf_counter() - started) * 1000))
+
+    waits = [await wait_for_condition(page, "load", remaining())]
+    waits.append(await wait_for_condition(page, "metrics", min(metrics_grace_ms, remaining())))
+    waits.append(await wait_for_condition(page, "animations", remaining()))
+    return {
+        "satisfied": all(w["satisfied"] for w in waits),
+        "waited_ms": round((time.perf_counter() - started) * 1000, 1),
+        "waits": waits
+    }
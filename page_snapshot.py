@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Page Snapshot
+One page.evaluate that captures craft bug metrics, navigation timing, paint entries and
+element summaries, so every detector reads the same consistent view of the page
+"""
+
+import time
+import logging
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_JS = """
+() => {
+    const primary = window.craftBugMetrics || window.excelCraftBugMetrics || window.pptCraftBugMetrics || {};
+    const merged = {
+        ...(window.craftBugMetrics || {}),
+        ...(window.excelCraftBugMetrics || {}),
+        ...(window.pptCraftBugMetrics || {})
+    };
+    const timing = performance.timing;
+    const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const inputs = Array.from(document.querySelectorAll('input, textarea, [contenteditable="true"]'));
+    const interactive = Array.from(document.querySelectorAll('button, a, .clickable, [role="button"]'));
+    // Round-trip through JSON so DOM references or functions inside the metrics cannot break serialization
+    const plain = (value) => { try { return JSON.parse(JSON.stringify(value)); } catch (e) { return {}; } };
+    return {
+        metrics: plain(primary),
+        all_metrics: plain(merged),
+        navigation: {
+            domContentLoaded: timing.domContentLoadedEventEnd - timing.navigationStart,
+            pageLoad: timing.loadEventEnd - timing.navigationStart
+        },
+        paint: Object.fromEntries(performance.getEntriesByType('paint').map(e => [e.name, e.startTime])),
+        performance: {
+            marks: performance.getEntriesByType('mark').length,
+            entries: performance.getEntries().length
+        },
+        elements: {
+            inputs: inputs.length,
+            visible_inputs: inputs.filter(visible).length,
+            interactive: interactive.length,
+            visible_interactive: interactive.filter(visible).length
+        },
+        document: {
+            title: document.title,
+            url: location.href,
+            ready_state: document.readyState
+        },
+        // Compact frame-time stats from frame_sampler, when it is running
+        frames: window.__craftFrameSampler ? window.__craftFrameSampler.stats() : null,
+        // Per-element input-to-next-paint summaries from input_timing probes
+        input_timing: window.__craftInputTiming ? window.__craftInputTiming.summary() : null,
+        captured_at: performance.now()
+    };
+}
+"""
+
+def empty_snapshot(error: str = "") -> Dict[str, Any]:
+    """Snapshot shape with no data, so detectors never need to guard missing keys"""
+    return {
+        "metrics": {},
+        "all_metrics": {},
+        "navigation": {"domContentLoaded": 0, "pageLoad": 0},
+        "paint": {},
+        "performance": {"marks": 0, "entries": 0},
+        "elements": {"inputs": 0, "visible_inputs": 0, "interactive": 0, "visible_interactive": 0},
+        "document": {"title": "", "url": "", "ready_state": ""},
+        "frames": None,
+        "input_timing": None,
+        "captured_at": None,
+        "error": error,
+    }
+
+async def capture_page_snapshot(page) -> Dict[str, Any]:
+    """Capture the page snapshot in a single round trip; never raises"""
+    started = time.perf_counter()
+    try:
+        snapshot = await page.evaluate(SNAPSHOT_JS)
+        snapshot["capture_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return snapshot
+    except Exception as e:
+        logger.warning(f"⚠️ Page snapshot failed: {e}")
+        return empty_snapshot(str(e))
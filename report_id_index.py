@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Report ID Index
+In-memory sorted index of report IDs -> report files in reports/analysis, so exact and short-ID
+(prefix) lookups are a binary search instead of a directory glob
+"""
+
+import os
+import re
+import time
+import bisect
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# analysis_<id>.json or analysis_<id>_<YYYYmmdd>_<HHMMSS>.json, optionally .gz/.zst compressed
+REPORT_FILE_RE = re.compile(r"^analysis_(?P<id>.+?)(?:_(?P<saved>\d{8}_\d{6}))?\.json(?:\.gz|\.zst)?$")
+
+# Candidates listed in an ambiguity error
+MAX_AMBIGUOUS_CANDIDATES = 10
+
+# Minimum seconds between rescans triggered by lookup misses (unknown IDs must not rescan on every request)
+RESCAN_INTERVAL_S = float(os.getenv("REPORT_ID_RESCAN_INTERVAL_S", "5"))
+
+class AmbiguousReportIdError(LookupError):
+    """A short ID matches more than one report"""
+
+    def __init__(self, prefix: str, candidates: List[str]):
+        self.prefix = prefix
+        self.candidates = candidates
+        super().__init__(f"Report ID '{prefix}' is ambiguous: matches {', '.join(candidates)}"
+                         f"{' ...' if len(candidates) >= MAX_AMBIGUOUS_CANDIDATES else ''}")
+
+class ReportIdIndex:
+    """Sorted report IDs with the newest file saved for each"""
+
+    def __init__(self, analysis_dir: Union[str, Path]):
+        self.analysis_dir = Path(analysis_dir)
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._files: Dict[str, Dict[str, Path]] = {}  # id -> {saved timestamp: path}
+        self._dir_mtime_ns = None
+        self._last_rescan = float("-inf")
+        self.rebuild()
+
+    def rebuild(self):
+        """Scan the analysis directory once"""
+        files: Dict[str, Dict[str, Path]] = {}
+        mtime_ns = None
+        try:
+            mtime_ns = os.stat(self.analysis_dir).st_mtime_ns
+            with os.scandir(self.analysis_dir) as entries:
+                for entry in entries:
+                    match = REPORT_FILE_RE.match(entry.name)
+                    if match and entry.is_file():
+                        files.setdefault(match["id"], {})[match["saved"] or ""] = Path(entry.path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._files = files
+            self._ids = sorted(files)
+            self._dir_mtime_ns = mtime_ns
+        logger.info(f"🗂️ Report ID index built: {len(files)} reports in {self.analysis_dir}")
+
+    def add(self, path: Union[str, Path]):
+        """Index a report file that was just written"""
+        path = Path(path)
+        match = REPORT_FILE_RE.match(path.name)
+        if not match:
+            return
+        analysis_id = match["id"]
+        with self._lock:
+            if analysis_id not in self._files:
+                bisect.insort(self._ids, analysis_id)
+                self._files[analysis_id] = {}
+            self._files[analysis_id][match["saved"] or ""] = path
+
+    def discard(self, analysis_id: str):
+        """Drop a report ID (all of its files) from the index"""
+        with self._lock:
+            if self._files.pop(analysis_id, None) is not None:
+                i = bisect.bisect_left(self._ids, analysis_id)
+                if i < len(self._ids) and self._ids[i] == analysis_id:
+                    del self._ids[i]
+
+    def _matches(self, prefix: str, limit: int) -> List[str]:
+        i = bisect.bisect_left(self._ids, prefix)
+        matches = []
+        while i < len(self._ids) and self._ids[i].startswith(prefix) and len(matches) < limit:
+            matches.append(self._ids[i])
+            i += 1
+        return matches
+
+    def resolve_id(self, report_id: str) -> Optional[str]:
+        """Full report ID for an exact or unique-prefix ID; raises AmbiguousReportIdError"""
+        if not report_id:
+            return None
+        for attempt in range(2):
+            with self._lock:
+                if report_id in self._files:
+                    return report_id
+                matches = self._matches(report_id, MAX_AMBIGUOUS_CANDIDATES)
+            if len(matches) > 1:
+                raise AmbiguousReportIdError(report_id, matches)
+            if matches:
+                return matches[0]
+            # Files written by other processes: rescan once, only if the directory changed
+            if attempt == 0 and not self._refresh_if_changed():
+                break
+        return None
+
+    def resolve(self, report_id: str) -> Optional[Path]:
+        """Newest report file for an exact or unique-prefix ID; raises AmbiguousReportIdError"""
+        analysis_id = self.resolve_id(report_id)
+        if analysis_id is None:
+            return None
+        path = self._newest(analysis_id)
+        # Renamed since indexed (e.g. recompressed by another process)
+        if path is not None and not path.exists() and self._refresh_if_changed():
+            path = self._newest(analysis_id)
+        return path
+
+    def _newest(self, analysis_id: str) -> Optional[Path]:
+        with self._lock:
+            saved = self._files.get(analysis_id) or {}
+            return saved[max(saved)] if saved else None
+
+    def _refresh_if_changed(self) -> bool:
+        """Rescan when the directory changed since the last scan, at most once per RESCAN_INTERVAL_S"""
+        # Our own add/discard calls change the mtime too, but leave the baseline alone: another process
+        # writing in the same window is indistinguishable from them, so one rescan has to verify
+        try:
+            mtime_ns = os.stat(self.analysis_dir).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime_ns == self._dir_mtime_ns:
+            return False
+        now = time.monotonic()
+        if now - self._last_rescan < RESCAN_INTERVAL_S:
+            return False
+        self._last_rescan = now
+        self.rebuild()
+        return True
+
+    def __len__(self) -> int:
+        return len(self._ids)
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Report Index
+SQLite-backed index of saved analysis reports: one row per report, indexed on the columns
+the list and search endpoints filter by, with single-row transactional upserts
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_DB_NAME = os.getenv("REPORT_INDEX_DB", "analysis_index.db")
+LEGACY_INDEX_NAME = "analysis_index.json"
+INDEX_VERSION = "3.0"
+
+# How long a writer waits for another process holding the database lock
+BUSY_TIMEOUT_MS = int(os.getenv("REPORT_INDEX_BUSY_TIMEOUT_MS", "5000"))
+
+# Metadata fields stored as their own (indexed) columns; the full metadata is kept as JSON
+INDEXED_COLUMNS = ("created_at", "analysis_type", "overall_score", "craft_bugs_count", "url", "status")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    analysis_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL DEFAULT '',
+    analysis_type TEXT NOT NULL DEFAULT 'unknown',
+    overall_score NUMERIC NOT NULL DEFAULT 0,
+    craft_bugs_count INTEGER NOT NULL DEFAULT 0,
+    pattern_issues_count INTEGER NOT NULL DEFAULT 0,
+    url TEXT,
+    status TEXT NOT NULL DEFAULT 'unknown',
+    file_path TEXT,
+    file_size INTEGER NOT NULL DEFAULT 0,
+    metadata TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS index_counters (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, key)
+);
+""" + "".join(f"CREATE INDEX IF NOT EXISTS idx_reports_{column} ON reports ({column});\n"
+              for column in INDEXED_COLUMNS)
+
+# Running aggregates: ('total', <column>) sums plus per-type and per-status report counts
+SUMMED_COLUMNS = ("overall_score", "craft_bugs_count", "pattern_issues_count", "file_size")
+COUNTED_COLUMNS = ("analysis_type", "status")
+
+def _counter_delta_sql(row: str, sign: str) -> str:
+    """Add (sign '') or subtract (sign '-') one report row's contribution to the running aggregates"""
+    values = [f"('total', 'reports', {sign}1)"]
+    values += [f"('total', '{column}', {sign}{row}.{column})" for column in SUMMED_COLUMNS]
+    values += [f"('{column}', {row}.{column}, {sign}1)" for column in COUNTED_COLUMNS]
+    return (f"INSERT INTO index_counters (name, key, value) VALUES {', '.join(values)} "
+            f"ON CONFLICT(name, key) DO UPDATE SET value = value + excluded.value;")
+
+# Maintained by SQLite in the same transaction as the row change, whoever the writer is
+COUNTER_TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS reports_counters_insert AFTER INSERT ON reports BEGIN
+    {_counter_delta_sql('NEW', '')}
+END;
+CREATE TRIGGER IF NOT EXISTS reports_counters_delete AFTER DELETE ON reports BEGIN
+    {_counter_delta_sql('OLD', '-')}
+END;
+CREATE TRIGGER IF NOT EXISTS reports_counters_update AFTER UPDATE ON reports BEGIN
+    {_counter_delta_sql('OLD', '-')}
+    {_counter_delta_sql('NEW', '')}
+END;
+"""
+
+RECOUNT_SQL = "INSERT INTO index_counters (name, key, value) " + " UNION ALL ".join(
+    ["SELECT 'total', 'reports', COUNT(*) FROM reports"]
+    + [f"SELECT 'total', '{column}', COALESCE(SUM({column}), 0) FROM reports" for column in SUMMED_COLUMNS]
+    + [f"SELECT '{column}', {column}, COUNT(*) FROM reports GROUP BY {column}" for column in COUNTED_COLUMNS]
+)
+
+UPSERT_SQL = """
+INSERT INTO reports (analysis_id, created_at, analysis_type, overall_score, craft_bugs_count,
+                     pattern_issues_count, url, status, file_path, file_size, metadata)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(analysis_id) DO UPDATE SET
+    created_at = excluded.created_at,
+    analysis_type = excluded.analysis_type,
+    overall_score = excluded.overall_score,
+    craft_bugs_count = excluded.craft_bugs_count,
+    pattern_issues_count = excluded.pattern_issues_count,
+    url = excluded.url,
+    status = excluded.status,
+    file_path = excluded.file_path,
+    file_size = excluded.file_size,
+    metadata = excluded.metadata
+"""
+
+def _number(value, default=0):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else default
+
+def _row_values(analysis_id: str, metadata: Dict[str, Any]) -> Tuple:
+    return (
+        analysis_id,
+        metadata.get("created_at") or "",
+        metadata.get("analysis_type") or "unknown",
+        _number(metadata.get("overall_score")),
+        int(_number(metadata.get("craft_bugs_count"))),
+        int(_number(metadata.get("pattern_issues_count"))),
+        metadata.get("url"),
+        metadata.get("status") or "unknown",
+        metadata.get("file_path"),
+        int(_number(metadata.get("file_size"))),
+        json.dumps(metadata, default=str),
+    )
+
+def build_filters(filters: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+    """WHERE clause and parameters for list/search filters (search names score_min/url are accepted too)"""
+    clauses, params = [], []
+    filters = {k: v for k, v in (filters or {}).items() if v is not None}
+
+    if filters.get("analysis_type"):
+        clauses.append("analysis_type = ?")
+        params.append(filters["analysis_type"])
+    if filters.get("status"):
+        clauses.append("status = ?")
+        params.append(filters["status"])
+    for names, clause in ((("min_score", "score_min"), "overall_score >= ?"),
+                          (("max_score", "score_max"), "overall_score <= ?")):
+        for name in names:
+            if name in filters:
+                clauses.append(clause)
+                params.append(filters[name])
+    if filters.get("has_craft_bugs"):
+        clauses.append("craft_bugs_count > 0")
+    for name in ("url_contains", "url"):
+        if filters.get(name):
+            clauses.append("instr(lower(coalesce(url, '')), ?) > 0")
+            params.append(str(filters[name]).lower())
+    if "date_from" in filters:
+        clauses.append("created_at >= ?")
+        params.append(filters["date_from"])
+    if "date_to" in filters:
+        clauses.append("created_at <= ?")
+        params.append(filters["date_to"])
+
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+ORDER_BY = {
+    "newest": "created_at DESC, analysis_id DESC",
+    "score": "overall_score DESC, created_at DESC, analysis_id DESC",
+}
+
+class ReportIndex:
+    """Report metadata in an embedded SQLite database, safe for concurrent writers"""
+
+    def __init__(self, reports_dir: str = "reports", db_path: Optional[str] = None):
+        self.reports_dir = Path(reports_dir)
+        self.db_path = Path(db_path) if db_path else self.reports_dir / INDEX_DB_NAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.db_path), timeout=BUSY_TIMEOUT_MS / 1000,
+                                    check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        with self._lock:
+            self.conn.executescript(SCHEMA + COUNTER_TRIGGERS)
+        with self._transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO index_meta (key, value) VALUES ('version', ?), ('created', ?)",
+                         (INDEX_VERSION, datetime.now().isoformat()))
+
+        # Indexes created before the running aggregates existed get them counted once
+        if self.get_meta("last_reconcile") is None:
+            self.reconcile()
+
+        legacy_index = self.reports_dir / LEGACY_INDEX_NAME
+        if legacy_index.exists() and self.get_meta("imported_from") is None:
+            self.import_json(legacy_index)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Serialize writers: BEGIN IMMEDIATE takes the database write lock up front"""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def _query(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        rows = self._query("SELECT value FROM index_meta WHERE key = ?", (key,))
+        return rows[0]["value"] if rows else None
+
+    def set_meta(self, key: str, value: Optional[str]):
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def upsert(self, analysis_id: str, metadata: Dict[str, Any]):
+        """Insert or replace one report's metadata in a single transaction"""
+        with self._transaction() as conn:
+            conn.execute(UPSERT_SQL, _row_values(analysis_id, metadata))
+            conn.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('last_updated', ?)",
+                         (datetime.now().isoformat(),))
+
+    def delete(self, analysis_ids: List[str]) -> int:
+        """Remove reports from the index; returns how many rows were deleted"""
+        if not analysis_ids:
+            return 0
+        with self._transaction() as conn:
+            deleted = sum(conn.execute("DELETE FROM reports WHERE analysis_id = ?", (analysis_id,)).rowcount
+                          for analysis_id in analysis_ids)
+            conn.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('last_updated', ?)",
+                         (datetime.now().isoformat(),))
+        return deleted
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT metadata FROM reports WHERE analysis_id = ?", (analysis_id,))
+        return json.loads(rows[0]["metadata"]) if rows else None
+
+    def __contains__(self, analysis_id: str) -> bool:
+        return bool(self._query("SELECT 1 FROM reports WHERE analysis_id = ?", (analysis_id,)))
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) AS n FROM reports")[0]["n"]
+
+    def query(self, filters: Optional[Dict[str, Any]] = None, order: str = "newest",
+              limit: Optional[int] = None, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """(page of report metadata, total matching) for the filters"""
+        where, params = build_filters(filters)
+        sql = f"SELECT metadata FROM reports{where} ORDER BY {ORDER_BY[order]}"
+        page_params = list(params)
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            page_params += [int(limit), int(offset)]
+        elif offset:
+            sql += " LIMIT -1 OFFSET ?"
+            page_params.append(int(offset))
+        with self._lock:
+            rows = self.conn.execute(sql, page_params).fetchall()
+            total = self.conn.execute(f"SELECT COUNT(*) FROM reports{where}", params).fetchone()[0]
+        return [json.loads(row["metadata"]) for row in rows], total
+
+    def older_than(self, cutoff: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """(analysis_id, metadata) of reports created before cutoff (ISO timestamp)"""
+        rows = self._query("SELECT analysis_id, metadata FROM reports WHERE created_at < ? ORDER BY created_at",
+                           (cutoff,))
+        return [(row["analysis_id"], json.loads(row["metadata"])) for row in rows]
+
+    def statistics(self, recent_cutoff: str) -> Dict[str, Any]:
+        """Statistics from the running aggregates; min/max and recent counts are indexed lookups"""
+        with self._lock:
+            counters: Dict[str, Dict[str, Any]] = {}
+            for row in self.conn.execute("SELECT name, key, value FROM index_counters ORDER BY name, key"):
+                counters.setdefault(row["name"], {})[row["key"]] = row["value"]
+            # Separate single-aggregate queries: SQLite only answers MIN/MAX from the score index one at a time
+            min_score = self.conn.execute("SELECT MIN(overall_score) FROM reports").fetchone()[0]
+            max_score = self.conn.execute("SELECT MAX(overall_score) FROM reports").fetchone()[0]
+            recent = self.conn.execute("SELECT COUNT(*) FROM reports WHERE created_at > ?", (recent_cutoff,)).fetchone()[0]
+
+        totals = counters.get("total", {})
+        total_reports = totals.get("reports", 0)
+        if total_reports == 0:
+            return {
+                "total_reports": 0,
+                "total_craft_bugs": 0,
+                "avg_score": 0,
+                "last_cleanup": self.get_meta("last_cleanup"),
+            }
+        total_craft_bugs = totals.get("craft_bugs_count", 0)
+        total_pattern_issues = totals.get("pattern_issues_count", 0)
+        return {
+            "total_reports": total_reports,
+            "total_craft_bugs": total_craft_bugs,
+            "total_pattern_issues": total_pattern_issues,
+            "total_issues": total_craft_bugs + total_pattern_issues,
+            "avg_score": round(totals.get("overall_score", 0) / total_reports, 1),
+            "min_score": min_score,
+            "max_score": max_score,
+            "analysis_type_distribution": {k: v for k, v in counters.get("analysis_type", {}).items() if v},
+            "status_distribution": {k: v for k, v in counters.get("status", {}).items() if v},
+            "recent_reports_count": recent,
+            "last_cleanup": self.get_meta("last_cleanup"),
+            "last_reconcile": self.get_meta("last_reconcile"),
+            "total_file_size_mb": round(totals.get("file_size", 0) / (1024 * 1024), 2),
+        }
+
+    def reconcile(self) -> Dict[str, Any]:
+        """Recompute the running aggregates from the reports table; returns the counters that had drifted"""
+        started = time.perf_counter()
+        with self._transaction() as conn:
+            before = {(row["name"], row["key"]): row["value"]
+                      for row in conn.execute("SELECT name, key, value FROM index_counters")}
+            conn.execute("DELETE FROM index_counters")
+            conn.execute(RECOUNT_SQL)
+            after = {(row["name"], row["key"]): row["value"]
+                     for row in conn.execute("SELECT name, key, value FROM index_counters")}
+            reconciled_at = datetime.now().isoformat()
+            conn.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('last_reconcile', ?)",
+                         (reconciled_at,))
+
+        drift = {f"{name}:{key}": {"counted": after.get((name, key), 0), "running": before.get((name, key), 0)}
+                 for name, key in sorted(set(before) | set(after))
+                 if abs((after.get((name, key)) or 0) - (before.get((name, key)) or 0)) > 1e-6}
+        if drift and before:
+            logger.warning(f"⚠️ Report statistics drifted on {len(drift)} counters; reconciled")
+        return {
+            "reconciled_at": reconciled_at,
+            "drift": drift,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def import_json(self, index_file: Path) -> int:
+        """One-time migration of a legacy analysis_index.json; returns the number of reports imported"""
+        try:
+            with open(index_file, "r") as f:
+                legacy = json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read legacy index {index_file}: {e}")
+            return 0
+
+        reports = legacy.get("reports") or {}
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_SQL, [_row_values(analysis_id, metadata)
+                                          for analysis_id, metadata in reports.items()
+                                          if isinstance(metadata, dict)])
+            meta = {
+                "imported_from": str(index_file),
+                "created": legacy.get("created"),
+                "last_updated": legacy.get("last_updated"),
+                "last_cleanup": (legacy.get("statistics") or {}).get("last_cleanup"),
+            }
+            conn.executemany("INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+                             [(key, value) for key, value in meta.items() if value is not None])
+        logger.info(f"📥 Imported {len(reports)} reports from {index_file} into {self.db_path}")
+        return len(reports)
+
+    def info(self) -> Dict[str, Any]:
+        """Index file details for the statistics endpoint"""
+        return {
+            "backend": "sqlite",
+            "index_file": str(self.db_path),
+            "index_file_size": self.db_path.stat().st_size if self.db_path.exists() else 0,
+            "version": self.get_meta("version"),
+            "created": self.get_meta("created"),
+            "last_updated": self.get_meta("last_updated"),
+            "imported_from": self.get_meta("imported_from"),
+        }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Report Storage
+Single-pass, crash-safe JSON report writes: the report is encoded chunk by chunk straight into a
+temp file next to the target, its own size is patched in, then the file is fsynced and renamed into place.
+Reports can optionally be stored gzip- or zstd-compressed; reads detect the format and decompress as a stream
+"""
+
+import os
+import json
+import gzip
+import shutil
+import logging
+import contextlib
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# Buffered write size; encoded chunks are small, so they are batched before hitting the file
+WRITE_BUFFER_BYTES = int(os.getenv("REPORT_WRITE_BUFFER_BYTES", str(1024 * 1024)))
+
+# Width reserved for the patched-in size (JSON allows the trailing spaces that pad it)
+SIZE_WIDTH = 12
+
+# Storage format for new reports in reports/analysis and reports/enhanced: none, gzip or zstd
+REPORT_COMPRESSION = os.getenv("REPORT_COMPRESSION", "none")
+GZIP_LEVEL = int(os.getenv("REPORT_GZIP_LEVEL", "6"))
+ZSTD_LEVEL = int(os.getenv("REPORT_ZSTD_LEVEL", "3"))
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+# Stored report file names, plain or compressed
+REPORT_FILE_SUFFIXES = (".json",) + tuple(".json" + suffix for suffix in COMPRESSION_SUFFIXES.values())
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+class _FileSize:
+    """Placeholder for the final file size; replaced in place once the report is written"""
+
+    def __repr__(self):
+        return "FILE_SIZE"
+
+FILE_SIZE = _FileSize()
+
+_zstd_fallback_logged = False
+
+def storage_compression(value: Optional[str] = None) -> Optional[str]:
+    """Compression for new report files ('gzip', 'zstd' or None); defaults to REPORT_COMPRESSION"""
+    global _zstd_fallback_logged
+    value = (REPORT_COMPRESSION if value is None else value).strip().lower()
+    if value in ("", "none", "off", "false"):
+        return None
+    if value in ("gz", "gzip"):
+        return "gzip"
+    if value in ("zst", "zstd"):
+        if ZSTD_AVAILABLE:
+            return "zstd"
+        if not _zstd_fallback_logged:
+            logger.warning("⚠️ zstandard not installed; storing reports with gzip instead")
+            _zstd_fallback_logged = True
+        return "gzip"
+    raise ValueError(f"Unknown report compression '{value}' (expected none, gzip or zstd)")
+
+def storage_path(path: Union[str, Path], compression: Optional[str]) -> Path:
+    """Path with the compression suffix appended (analysis_x.json -> analysis_x.json.gz)"""
+    path = Path(path)
+    return path.with_name(path.name + COMPRESSION_SUFFIXES[compression]) if compression else path
+
+def detect_compression(path: Union[str, Path]) -> Optional[str]:
+    """Compression of a stored report, from its magic bytes"""
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    if magic[:2] == GZIP_MAGIC:
+        return "gzip"
+    if magic == ZSTD_MAGIC:
+        return "zstd"
+    return None
+
+def open_report(path: Union[str, Path]) -> BinaryIO:
+    """Binary stream of a stored report's JSON, decompressed on the fly"""
+    compression = detect_compression(path)
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(f"{path} is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+def read_report_json(path: Union[str, Path]) -> Any:
+    """Load a stored report, compressed or not"""
+    with open_report(path) as f:
+        return json.load(f)
+
+def iter_report_bytes(path: Union[str, Path], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Decompressed report JSON in chunks, for streaming responses"""
+    with open_report(path) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+@contextlib.contextmanager
+def _atomic_file(path: Path):
+    """Temp file next to path; fsynced and renamed over path on success, removed on failure"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb", buffering=WRITE_BUFFER_BYTES) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+
+def _compressor(raw: BinaryIO, compression: str):
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+    return gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=GZIP_LEVEL, mtime=0)
+
+def write_json_atomic(path: Union[str, Path], data: Any, indent: int = 2, compression: Optional[str] = None) -> int:
+    """Write data as JSON to path atomically; FILE_SIZE values become the file's size
+    (null in compressed files, whose size is only known afterwards). Returns the bytes on disk"""
+    path = Path(path)
+    written = 0
+    size_offsets = []
+
+    def default(obj):
+        # The encoder is lazy: when it reaches a value, every earlier chunk is already written
+        if obj is FILE_SIZE:
+            if compression:
+                return None
+            size_offsets.append(written)
+            return 10 ** (SIZE_WIDTH - 1)
+        return str(obj)
+
+    encoder = json.JSONEncoder(indent=indent, default=default)
+    with _atomic_file(path) as f:
+        if compression:
+            with _compressor(f, compression) as out:
+                pending, pending_size = [], 0
+                for chunk in encoder.iterencode(data):
+                    pending.append(chunk)
+                    pending_size += len(chunk)
+                    if pending_size >= WRITE_BUFFER_BYTES:
+                        out.write("".join(pending).encode("utf-8"))
+                        pending, pending_size = [], 0
+                out.write("".join(pending).encode("utf-8"))
+            written = f.tell()
+        else:
+            for chunk in encoder.iterencode(data):
+                encoded = chunk.encode("utf-8")
+                f.write(encoded)
+                written += len(encoded)
+            for offset in size_offsets:
+                f.seek(offset)
+                f.write(str(written).ljust(SIZE_WIDTH).encode("ascii"))
+    return written
+
+def compress_file(path: Union[str, Path], compression: str) -> Path:
+    """Compress a stored plain report in place (path -> path + suffix) and remove the original"""
+    path = Path(path)
+    target = storage_path(path, compression)
+    with _atomic_file(target) as f:
+        with open(path, "rb") as src, _compressor(f, compression) as out:
+            shutil.copyfileobj(src, out, WRITE_BUFFER_BYTES)
+    shutil.copystat(path, target)
+    path.unlink()
+    return target
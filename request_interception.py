@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Request Interception
+Per-scenario routing profiles that block or stub non-essential resources during browser runs
+"""
+
+import os
+import copy
+import fnmatch
+import logging
+from pathlib import Path
+from urllib.parse import urlparse
+from typing import Dict, Any, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Third-party analytics/tracking endpoints that never matter for UX checks
+TRACKER_URL_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*segment.io*",
+    "*segment.com/analytics*",
+    "*mixpanel.com*",
+    "*clarity.ms*",
+    "*newrelic.com*",
+    "*nr-data.net*",
+    "*sentry.io*",
+    "*browser.events.data.microsoft.com*",
+]
+
+# Requests that are never blocked or stubbed (matched against the lowercased URL) - the standalone
+# scripts setting window.craftBugMetrics / excelCraftBugMetrics / pptCraftBugMetrics must always load.
+# The mock apps define their metrics inline, so the page document itself is protected by resource type
+PROTECTED_URL_PATTERNS = [
+    "*/craft-bug-metrics.js",
+    "*/craft-bug-metrics.js?*",
+    "*/craft_bug_metrics.js",
+    "*/craft_bug_metrics.js?*",
+]
+
+# Resource types that are always allowed through
+PROTECTED_RESOURCE_TYPES = {"document"}
+
+# Built-in profiles; "stubs" maps a URL pattern to a response spec (status, content_type, body or path)
+INTERCEPTION_PROFILES: Dict[str, Dict[str, Any]] = {
+    "off": {
+        "block_resource_types": [],
+        "block_url_patterns": [],
+        "block_third_party_scripts": False,
+        "stubs": {},
+    },
+    "minimal": {
+        "block_resource_types": ["media"],
+        "block_url_patterns": TRACKER_URL_PATTERNS,
+        "block_third_party_scripts": False,
+        "stubs": {},
+    },
+    "fast": {
+        "block_resource_types": ["image", "media", "font"],
+        "block_url_patterns": TRACKER_URL_PATTERNS,
+        "block_third_party_scripts": True,
+        "stubs": {},
+    },
+}
+
+DEFAULT_INTERCEPTION_PROFILE = os.getenv("INTERCEPTION_PROFILE", "minimal")
+
+# Directory for stub bodies referenced by relative "path" entries
+STUB_CACHE_DIR = Path(os.getenv("INTERCEPTION_STUB_DIR", "reports/interception_stubs"))
+
+# Cap on per-request entries kept in the report
+MAX_RECORDED_REQUESTS = 200
+
+# Empty bodies served when a stub spec has neither body nor path
+EMPTY_STUB_BODIES = {
+    "script": ("application/javascript", ""),
+    "stylesheet": ("text/css", ""),
+    "fetch": ("application/json", "{}"),
+    "xhr": ("application/json", "{}"),
+}
+
+def resolve_interception_profile(*specs: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    """Resolve the first non-empty spec (profile name or dict overriding a base profile) into a profile"""
+    spec = next((s for s in specs if s), DEFAULT_INTERCEPTION_PROFILE)
+
+    if isinstance(spec, str):
+        name, overrides = spec, {}
+    elif isinstance(spec, dict):
+        name, overrides = spec.get("profile", "off"), spec
+    else:
+        raise ValueError(f"Invalid interception spec: {spec!r}")
+
+    if name not in INTERCEPTION_PROFILES:
+        raise ValueError(f"Unknown interception profile '{name}'. Available: {', '.join(INTERCEPTION_PROFILES)}")
+
+    profile = copy.deepcopy(INTERCEPTION_PROFILES[name])
+    for key in ("block_resource_types", "block_url_patterns", "block_third_party_scripts", "stubs"):
+        if key in overrides:
+            profile[key] = copy.deepcopy(overrides[key])
+    profile["name"] = name if not overrides or set(overrides) == {"profile"} else f"{name}+custom"
+    return profile
+
+class RequestInterceptor:
+    """Applies an interception profile to a BrowserContext and records what it blocked or stubbed"""
+
+    def __init__(self, profile: Dict[str, Any]):
+        self.profile = profile
+        self.block_resource_types = set(profile.get("block_resource_types", []))
+        self.block_url_patterns = list(profile.get("block_url_patterns", []))
+        self.block_third_party_scripts = profile.get("block_third_party_scripts", False)
+        self.stubs = dict(profile.get("stubs", {}))
+        self.first_party_host: Optional[str] = None
+
+        self.blocked: List[Dict[str, str]] = []
+        self.stubbed: List[Dict[str, str]] = []
+        self.blocked_count = 0
+        self.stubbed_count = 0
+        self.allowed_count = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.block_resource_types or self.block_url_patterns or
+                    self.block_third_party_scripts or self.stubs)
+
+    def set_first_party(self, url: str):
+        """Remember the scenario's own host so its scripts are never treated as third-party"""
+        if url and not self.first_party_host:
+            self.first_party_host = urlparse(url).hostname
+
+    def _is_third_party(self, url: str) -> bool:
+        host = urlparse(url).hostname
+        return bool(host and self.first_party_host and host != self.first_party_host)
+
+    def decide(self, url: str, resource_type: str) -> tuple:
+        """Return (action, reason) where action is 'allow', 'block' or 'stub'"""
+        if resource_type in PROTECTED_RESOURCE_TYPES:
+            return "allow", "document"
+        lowered = url.lower()
+        if any(fnmatch.fnmatch(lowered, pattern) for pattern in PROTECTED_URL_PATTERNS):
+            return "allow", "protected"
+        if url.startswith("data:"):
+            return "allow", "inline"
+
+        for pattern in self.stubs:
+            if fnmatch.fnmatch(url, pattern):
+                return "stub", pattern
+        if resource_type in self.block_resource_types:
+            return "block", f"resource_type:{resource_type}"
+        for pattern in self.block_url_patterns:
+            if fnmatch.fnmatch(lowered, pattern):
+                return "block", f"pattern:{pattern}"
+        if self.block_third_party_scripts and resource_type == "script" and self._is_third_party(url):
+            return "block", "third_party_script"
+        return "allow", ""
+
+    def _stub_response(self, pattern: str, resource_type: str) -> Dict[str, Any]:
+        spec = self.stubs.get(pattern) or {}
+        content_type, body = EMPTY_STUB_BODIES.get(resource_type, ("text/plain", ""))
+        response = {
+            "status": spec.get("status", 200),
+            "content_type": spec.get("content_type", content_type),
+        }
+        if spec.get("path"):
+            stub_path = Path(spec["path"])
+            if not stub_path.is_absolute():
+                stub_path = STUB_CACHE_DIR / stub_path
+            response["body"] = stub_path.read_bytes()
+        else:
+            response["body"] = spec.get("body", body)
+        return response
+
+    def _record(self, bucket: List[Dict[str, str]], url: str, resource_type: str, reason: str):
+        if len(bucket) < MAX_RECORDED_REQUESTS:
+            bucket.append({"url": url, "resource_type": resource_type, "reason": reason})
+
+    async def _handle_route(self, route, request):
+        action, reason = self.decide(request.url, request.resource_type)
+        try:
+            if action == "block":
+                self.blocked_count += 1
+                self._record(self.blocked, request.url, request.resource_type, reason)
+                await route.abort("blockedbyclient")
+            elif action == "stub":
+                self.stubbed_count += 1
+                self._record(self.stubbed, request.url, request.resource_type, reason)
+                await route.fulfill(**self._stub_response(reason, request.resource_type))
+            else:
+                self.allowed_count += 1
+                # Let earlier handlers (e.g. the warm HTTP cache) serve it before the network
+                await route.fallback()
+        except Exception as e:
+            logger.warning(f"⚠️ Interception failed for {request.url}: {e}")
+            try:
+                await route.continue_()
+            except Exception:
+                pass
+
+    async def attach(self, context, url: Optional[str] = None):
+        """Route every request of the context through this profile (no-op for the 'off' profile)"""
+        self.set_first_party(url)
+        if not self.enabled:
+            return
+        await context.route("**/*", self._handle_route)
+        logger.info(f"🚧 Request interception active (profile={self.profile.get('name')})")
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Interception summary for the analysis report"""
+        return {
+            "profile": self.profile.get("name"),
+            "blocked_count": self.blocked_count,
+            "stubbed_count": self.stubbed_count,
+            "allowed_count": self.allowed_count,
+            "blocked": self.blocked,
+            "stubbed": self.stubbed,
+        }
@@ -13,6 +13,9 @@ from typing import Dict, List, Any, Optional
 from pathlib import Path
 import logging
 import asyncio
+import time
+import copy
+import itertools
 
 # Import Playwright for real browser automation
 try:
@@ -22,6 +25,17 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     print("⚠️ Playwright not installed. Run: pip install playwright && playwright install")
 
+# Warm browser pool shared with the API server
+from browser_pool import get_browser_pool
+from request_interception import RequestInterceptor, resolve_interception_profile
+from warm_profile import WarmProfile, resolve_cold
+from craft_event_collector import CraftEventCollector
+from frame_sampler import install_frame_sampler
+from page_conditions import wait_for_condition
+from step_timing import StepTimer, summarize_step_timings
+from selector_resolver import SelectorResolver
+from scenario_trie import build_scenario_trie, replay_steps, trie_savings
+
 logger = logging.getLogger(__name__)
 
 # Import robust scenario resolver
@@ -100,12 +114,29 @@ except ImportError as e:
 
 # Import enhanced report generator for screenshots and videos
 try:
-    from enhanced_report_generator import EnhancedReportGenerator
+    from enhanced_report_generator import EnhancedReportGenerator, DEFAULT_CAPTURE_MODE
     ENHANCED_REPORTING_AVAILABLE = True
     logger.info("✅ Enhanced report generator imported successfully")
 except ImportError as e:
     logger.warning(f"⚠️ Enhanced report generator not available: {e}")
     ENHANCED_REPORTING_AVAILABLE = False
+    DEFAULT_CAPTURE_MODE = "none"
+
+# Map of scenario ID prefixes to their respective files
+SCENARIO_FILE_PREFIXES = {
+    "1.": "scenarios/word_scenarios.yaml",
+    "2.": "scenarios/excel_scenarios.yaml", 
+    "3.": "scenarios/powerpoint_scenarios.yaml",
+    "4.": "scenarios/office_tests.yaml",
+    "craft-": "scenarios/word_craft_bug_scenarios.yaml"
+}
+
+def scenario_file_for_id(scenario_id: str) -> Optional[str]:
+    """Find the scenario file for an ID based on its prefix"""
+    for prefix, file_path in SCENARIO_FILE_PREFIXES.items():
+        if scenario_id.startswith(prefix):
+            return file_path
+    return None
 
 class ScenarioExecutor:
     def __init__(self, deterministic_mode=False, fixed_seed=12345):
@@ -811,7 +842,10 @@ class ScenarioExecutor:
         }
     
     async def _execute_real_browser_scenario(self, analysis_id: str, url: str, scenario_steps: List[Dict], 
-                                     scenario_config: Dict, modules: Dict[str, bool]) -> Dict[str, Any]:
+                                     scenario_config: Dict, modules: Dict[str, bool],
+                                     interception: Optional[Any] = None,
+                                     capture_mode: Optional[str] = None,
+                                     cold: Optional[bool] = None) -> Dict[str, Any]:
         """Execute scenario with real browser automation using Playwright"""
         if not PLAYWRIGHT_AVAILABLE:
             logger.warning("Playwright not available, falling back to mock execution")
@@ -825,30 +859,43 @@ class ScenarioExecutor:
         enhanced_generator = None
         screenshots = []
         video_data = None
+        trace_data = None
+        capture_mode = capture_mode or DEFAULT_CAPTURE_MODE
         
         if ENHANCED_REPORTING_AVAILABLE:
             enhanced_generator = EnhancedReportGenerator()
-            logger.info("📸 Enhanced reporting enabled - screenshots and videos will be captured")
+            logger.info(f"📸 Enhanced reporting enabled - screenshots captured, capture mode '{capture_mode}'")
+        
+        # Warm runs reuse the app's saved storage state and HTTP cache; cold runs start clean
+        warm_profile = WarmProfile(scenario_config.get('app_type', 'web'),
+                                   cold=resolve_cold(cold, scenario_config.get('cold')))
         
         try:
-            async with async_playwright() as p:
-                # Launch browser with video recording
-                browser = await p.chromium.launch(
-                    headless=False,  # Show browser window for real automation  
-                    args=['--no-sandbox', '--disable-setuid-sandbox']
+            # Borrow a fresh, isolated context from the warm browser pool
+            async with get_browser_pool().context(viewport={"width": 1280, "height": 720},
+                                                  **warm_profile.context_options()) as context:
+                await warm_profile.attach(context)
+                # Request-level profile wins over the scenario's own, then the default
+                interceptor = RequestInterceptor(
+                    resolve_interception_profile(interception, scenario_config.get('interception'))
                 )
-                page = await browser.new_page()
-                
-                # Set viewport
-                await page.set_viewport_size({"width": 1280, "height": 720})
+                await interceptor.attach(context, url)
+                # Streams craft bug events from the page as they happen, tagged with the running step
+                event_collector = CraftEventCollector()
+                await event_collector.attach(context)
+                await install_frame_sampler(context)
+                page = await context.new_page()
+                resolver = SelectorResolver(page, scenario_config.get('app_type', 'web'))
                 
-                # Start video recording if enhanced reporting is available
-                if enhanced_generator:
+                # Start video recording or trace capture if enhanced reporting is available
+                if enhanced_generator and capture_mode == "video":
                     video_path = enhanced_generator.start_video_recording(page, analysis_id)
                     logger.info("🎥 Video recording started")
+                elif enhanced_generator and capture_mode == "trace":
+                    await enhanced_generator.start_trace(context, analysis_id)
                 
-                # Capture initial screenshot
-                if enhanced_generator:
+                # Capture initial screenshot (the trace already has one per action)
+                if enhanced_generator and capture_mode != "trace":
                     initial_screenshot = await enhanced_generator.capture_screenshot_async(
                         page, analysis_id, "initial_load", "page_load"
                     )
@@ -859,140 +906,34 @@ class ScenarioExecutor:
                 step_results = []
                 ux_issues = []
                 performance_metrics = {}
-                accessibility_issues = []
                 
                 try:
-                    for i, step in enumerate(scenario_steps):
-                        step_result = await self._execute_browser_step(page, step, i + 1)
-                        step_results.append(step_result)
-                        
-                        # Capture screenshot after each step if enhanced reporting is available
-                        if enhanced_generator:
-                            step_screenshot = await enhanced_generator.capture_screenshot_async(
-                                page, analysis_id, f"step_{i+1}", step.get('action', 'unknown')
-                            )
-                            if step_screenshot:
-                                screenshots.append(step_screenshot)
-                        
-                        # Collect UX issues during step execution
-                        if step_result.get('status') == 'error':
-                            # Capture error screenshot
-                            if enhanced_generator:
-                                error_screenshot = await enhanced_generator.capture_screenshot_async(
-                                    page, analysis_id, f"error_step_{i+1}", "error"
-                                )
-                                if error_screenshot:
-                                    screenshots.append(error_screenshot)
-                            
-                            ux_issues.append({
-                                "type": "error",
-                                "message": f"Step {i+1} failed: {step_result.get('error', 'Unknown error')}",
-                                "severity": "high",
-                                "element": step.get('target', 'unknown'),
-                                "step": i + 1,
-                                "action": step.get('action', 'unknown')
-                            })
-                        elif step_result.get('warning'):
-                            ux_issues.append({
-                                "type": "warning", 
-                                "message": step_result['warning'],
-                                "severity": "medium",
-                                "element": step.get('target', 'unknown'),
-                                "step": i + 1,
-                                "action": step.get('action', 'unknown')
-                            })
-                    
-                    # Collect performance metrics
-                    performance_metrics = await self._collect_performance_metrics(page)
-                    
-                    # Run accessibility checks
-                    accessibility_issues = await self._check_accessibility(page)
-                    
-                    # Add accessibility issues to UX issues
-                    ux_issues.extend(accessibility_issues)
-                    
-                    # Run craft bug detection if UX heuristics module is enabled
-                    if modules.get('ux_heuristics', False):
-                        try:
-                            logger.info(f"🐛 Running craft bug detection for UX heuristics analysis...")
-                            craft_bug_results = await self._run_craft_bug_analysis(page, url)
-                            
-                            if craft_bug_results and craft_bug_results.get('total_bugs_found', 0) > 0:
-                                craft_bugs = craft_bug_results.get('findings', [])
-                                for bug in craft_bugs:
-                                    # Capture screenshot for craft bug if enhanced reporting is available
-                                    if enhanced_generator:
-                                        bug_screenshot = await enhanced_generator.capture_issue_screenshot_async(page, analysis_id, bug)
-                                        if bug_screenshot:
-                                            screenshots.append(bug_screenshot)
-                                    
-                                    ux_issues.append({
-                                        "type": "craft_bug",
-                                        "message": f"Craft Bug (Category {bug.get('category', 'General')}): {bug.get('description', 'UX interaction issue')}",
-                                        "severity": bug.get("severity", "medium"),
-                                        "element": bug.get("element", "interaction element"),
-                                        "recommendation": bug.get("recommendation", "Fix interaction responsiveness"),
-                                        "category": f"Craft Bug Category {bug.get('category', 'General')}",
-                                        "craft_bug": True,
-                                        "metric_value": bug.get('metric_value', None)
-                                    })
-                                logger.info(f"🐛 Added {len(craft_bugs)} craft bugs to UX issues")
-                            else:
-                                logger.info(f"🐛 Craft bug analysis completed - no bugs found")
-                        except Exception as e:
-                            logger.warning(f"⚠️ Craft bug detection failed: {e}")
-                    
-                    # Capture final screenshot
-                    if enhanced_generator:
-                        final_screenshot = await enhanced_generator.capture_screenshot_async(
-                            page, analysis_id, "final_state", "completion"
-                        )
-                        if final_screenshot:
-                            screenshots.append(final_screenshot)
+                    await self._run_browser_steps(
+                        page, scenario_steps, analysis_id, resolver, step_results, ux_issues,
+                        enhanced_generator, screenshots, step_screenshots=capture_mode != "trace",
+                        events=event_collector
+                    )
+                    event_collector.set_step(None)
+                    performance_metrics = await self._analyze_browser_page(
+                        page, analysis_id, url, modules, ux_issues, enhanced_generator, screenshots,
+                        events=event_collector
+                    )
                     
                 finally:
-                    # Stop video recording if enhanced reporting is available
-                    if enhanced_generator:
+                    # Stop video recording or trace capture if enhanced reporting is available
+                    if enhanced_generator and capture_mode == "video":
                         video_data = enhanced_generator.stop_video_recording(page)
                         if video_data:
                             logger.info("🎥 Video recording stopped")
-                    
-                    await browser.close()
+                    elif enhanced_generator and capture_mode == "trace":
+                        trace_data = await enhanced_generator.stop_trace(context, analysis_id)
                 
-                # Generate comprehensive report based on real execution
-                base_report = self._generate_real_analysis_report(
-                    analysis_id=analysis_id,
-                    url=url,
-                    scenario_config=scenario_config,
-                    step_results=step_results,
-                    ux_issues=ux_issues,
-                    performance_metrics=performance_metrics,
-                    modules=modules
+                await warm_profile.save(context)
+                return self._build_browser_report(
+                    analysis_id, url, scenario_config, modules, step_results, ux_issues,
+                    performance_metrics, interceptor, resolver, enhanced_generator, screenshots, video_data,
+                    trace_data, warm_profile, event_collector
                 )
-                
-                # Generate enhanced report with screenshots and videos if available
-                if enhanced_generator and (screenshots or video_data):
-                    try:
-                        enhanced_report = enhanced_generator.generate_enhanced_report(
-                            base_report, screenshots, video_data
-                        )
-                        enhanced_filepath = enhanced_generator.save_enhanced_report(enhanced_report)
-                        html_filepath = enhanced_generator.generate_html_report(enhanced_report)
-                        
-                        logger.info(f"📊 Enhanced report generated: {enhanced_filepath}")
-                        logger.info(f"🌐 HTML report generated: {html_filepath}")
-                        
-                        # Add enhanced report info to base report
-                        base_report["enhanced_report"] = {
-                            "json_file": enhanced_filepath,
-                            "html_file": html_filepath,
-                            "screenshots_count": len(screenshots),
-                            "video_available": video_data is not None
-                        }
-                    except Exception as e:
-                        logger.warning(f"⚠️ Failed to generate enhanced report: {e}")
-                
-                return base_report
         
         except Exception as e:
             logger.error(f"❌ REAL BROWSER AUTOMATION FAILED: {str(e)}")
@@ -1003,180 +944,357 @@ class ScenarioExecutor:
             logger.warning("🔄 Falling back to mock execution due to browser automation failure")
             return self._generate_scenario_report_from_steps(analysis_id, url, scenario_steps, scenario_config, modules)
     
-    async def _execute_browser_step(self, page: Page, step: Dict, step_number: int) -> Dict[str, Any]:
+    async def _run_browser_steps(self, page: Page, steps: List[Dict], analysis_id: str,
+                                 resolver: SelectorResolver, step_results: List[Dict], ux_issues: List[Dict],
+                                 enhanced_generator=None, screenshots: Optional[List] = None,
+                                 first_step_number: int = 1, step_screenshots: bool = True,
+                                 events: Optional[CraftEventCollector] = None):
+        """Execute steps on an open page, appending results, issues and screenshots in place"""
+        for offset, step in enumerate(steps):
+            i = first_step_number - 1 + offset
+            if events:
+                events.set_step(i + 1)
+            step_result = await self._execute_browser_step(page, step, i + 1, resolver)
+            step_results.append(step_result)
+            
+            # Capture screenshot after each step if enhanced reporting is available
+            if enhanced_generator and step_screenshots:
+                step_screenshot = await enhanced_generator.capture_screenshot_async(
+                    page, analysis_id, f"step_{i+1}", step.get('action', 'unknown')
+                )
+                if step_screenshot:
+                    screenshots.append(step_screenshot)
+            
+            # Collect UX issues during step execution
+            if step_result.get('status') == 'error':
+                # Capture error screenshot
+                if enhanced_generator:
+                    error_screenshot = await enhanced_generator.capture_screenshot_async(
+                        page, analysis_id, f"error_step_{i+1}", "error"
+                    )
+                    if error_screenshot:
+                        screenshots.append(error_screenshot)
+                
+                ux_issues.append({
+                    "type": "error",
+                    "message": f"Step {i+1} failed: {step_result.get('error', 'Unknown error')}",
+                    "severity": "high",
+                    "element": step.get('target', 'unknown'),
+                    "step": i + 1,
+                    "action": step.get('action', 'unknown')
+                })
+            elif step_result.get('warning'):
+                ux_issues.append({
+                    "type": "warning", 
+                    "message": step_result['warning'],
+                    "severity": "medium",
+                    "element": step.get('target', 'unknown'),
+                    "step": i + 1,
+                    "action": step.get('action', 'unknown')
+                })
+    
+    async def _analyze_browser_page(self, page: Page, analysis_id: str, url: str, modules: Dict[str, bool],
+                                    ux_issues: List[Dict], enhanced_generator=None,
+                                    screenshots: Optional[List] = None,
+                                    events: Optional[CraftEventCollector] = None) -> Dict[str, Any]:
+        """Run end-of-scenario checks on the page; returns the performance metrics"""
+        # Collect performance metrics
+        performance_metrics = await self._collect_performance_metrics(page)
+        
+        # Run accessibility checks
+        accessibility_issues = await self._check_accessibility(page)
+        
+        # Add accessibility issues to UX issues
+        ux_issues.extend(accessibility_issues)
+        
+        # Run craft bug detection if UX heuristics module is enabled
+        if modules.get('ux_heuristics', False):
+            try:
+                logger.info(f"🐛 Running craft bug detection for UX heuristics analysis...")
+                craft_bug_results = await self._run_craft_bug_analysis(page, url, events)
+                
+                if craft_bug_results and craft_bug_results.get('total_bugs_found', 0) > 0:
+                    craft_bugs = craft_bug_results.get('findings', [])
+                    for bug in craft_bugs:
+                        # Capture screenshot for craft bug if enhanced reporting is available
+                        if enhanced_generator:
+                            bug_screenshot = await enhanced_generator.capture_issue_screenshot_async(page, analysis_id, bug)
+                            if bug_screenshot:
+                                screenshots.append(bug_screenshot)
+                        
+                        ux_issues.append({
+                            "type": "craft_bug",
+                            "message": f"Craft Bug (Category {bug.get('category', 'General')}): {bug.get('description', 'UX interaction issue')}",
+                            "severity": bug.get("severity", "medium"),
+                            "element": bug.get("element", "interaction element"),
+                            "recommendation": bug.get("recommendation", "Fix interaction responsiveness"),
+                            "category": f"Craft Bug Category {bug.get('category', 'General')}",
+                            "craft_bug": True,
+                            "metric_value": bug.get('metric_value', None)
+                        })
+                    logger.info(f"🐛 Added {len(craft_bugs)} craft bugs to UX issues")
+                else:
+                    logger.info(f"🐛 Craft bug analysis completed - no bugs found")
+            except Exception as e:
+                logger.warning(f"⚠️ Craft bug detection failed: {e}")
+        
+        # Capture final screenshot
+        if enhanced_generator:
+            final_screenshot = await enhanced_generator.capture_screenshot_async(
+                page, analysis_id, "final_state", "completion"
+            )
+            if final_screenshot:
+                screenshots.append(final_screenshot)
+        
+        return performance_metrics
+    
+    def _build_browser_report(self, analysis_id: str, url: str, scenario_config: Dict, modules: Dict[str, bool],
+                              step_results: List[Dict], ux_issues: List[Dict], performance_metrics: Dict,
+                              interceptor: RequestInterceptor, resolver: SelectorResolver,
+                              enhanced_generator=None, screenshots: Optional[List] = None,
+                              video_data=None, trace_data=None,
+                              warm_profile: Optional[WarmProfile] = None,
+                              event_collector: Optional[CraftEventCollector] = None) -> Dict[str, Any]:
+        """Build the real-browser report and, when available, the enhanced media report"""
+        screenshots = screenshots or []
+        if event_collector:
+            event_collector.attribute(step_results)
+        
+        # Generate comprehensive report based on real execution
+        base_report = self._generate_real_analysis_report(
+            analysis_id=analysis_id,
+            url=url,
+            scenario_config=scenario_config,
+            step_results=step_results,
+            ux_issues=ux_issues,
+            performance_metrics=performance_metrics,
+            modules=modules
+        )
+        base_report["interception"] = interceptor.get_summary()
+        base_report["selector_resolution"] = resolver.get_stats()
+        if trace_data:
+            base_report["trace"] = trace_data
+        if warm_profile:
+            base_report["warm_profile"] = warm_profile.get_summary()
+        if event_collector:
+            base_report["craft_events"] = event_collector.get_summary()
+        if interceptor.blocked_count or interceptor.stubbed_count:
+            logger.info(f"🚧 Interception blocked {interceptor.blocked_count}, stubbed {interceptor.stubbed_count} requests")
+        
+        # Generate enhanced report with screenshots and videos if available
+        if enhanced_generator and (screenshots or video_data or trace_data):
+            try:
+                enhanced_report = enhanced_generator.generate_enhanced_report(
+                    base_report, screenshots, video_data
+                )
+                enhanced_filepath = enhanced_generator.save_enhanced_report(enhanced_report)
+                html_filepath = enhanced_generator.generate_html_report(enhanced_report)
+                
+                logger.info(f"📊 Enhanced report generated: {enhanced_filepath}")
+                logger.info(f"🌐 HTML report generated: {html_filepath}")
+                
+                # Add enhanced report info to base report
+                base_report["enhanced_report"] = {
+                    "json_file": enhanced_filepath,
+                    "html_file": html_filepath,
+                    "screenshots_count": len(screenshots),
+                    "video_available": video_data is not None,
+                    "trace_available": trace_data is not None
+                }
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to generate enhanced report: {e}")
+        
+        return base_report
+    
+    async def _execute_browser_step(self, page: Page, step: Dict, step_number: int,
+                                    resolver: Optional[SelectorResolver] = None) -> Dict[str, Any]:
         """Execute a single browser automation step"""
         action = step.get('action', 'unknown')
         target = step.get('target', '')
-        start_time = datetime.now()
+        timer = StepTimer(page)
+        resolver = resolver or SelectorResolver(page)
         
         logger.debug(f"Executing step {step_number}: {action} on {target}")
         
+        def timed(result: Dict[str, Any]) -> Dict[str, Any]:
+            # Attach the monotonic breakdown; duration_ms is the total wall time of the step
+            timing = timer.summary()
+            result["duration_ms"] = int(timing["total_ms"])
+            result["timing"] = timing
+            return result
+        
         try:
+            await timer.mark_page_start()
+            
             if action == 'navigate':
                 url = step.get('target', step.get('url', ''))
                 # Replace mock URL placeholders
                 if '{mock_url}' in url:
                     url = url.replace('{mock_url}', 'http://localhost:5173/mocks/word/basic-doc.html')
                 
-                await page.goto(url, wait_until='domcontentloaded', timeout=10000)
-                duration = (datetime.now() - start_time).total_seconds() * 1000
+                async with timer.phase("action"):
+                    await page.goto(url, wait_until='domcontentloaded', timeout=10000)
+                # The navigation reset the page clock, so only the end timestamp is meaningful
+                timer.page_start = None
+                await timer.settle()
                 
-                return {
+                return timed({
                     "step": step_number,
                     "action": action,
                     "target": url,
                     "status": "success",
-                    "duration_ms": int(duration),
                     "description": f"Navigated to {url}"
-                }
+                })
             
             elif action == 'click':
-                # Wait for element and click with better error handling
+                # Race CSS/text/role/test-id strategies instead of trying them one after another
                 try:
-                    element = await page.wait_for_selector(target, timeout=10000)
-                    await element.click()
-                    duration = (datetime.now() - start_time).total_seconds() * 1000
+                    async with timer.phase("selector_wait"):
+                        element, selector_info = await resolver.resolve(target)
+                    async with timer.phase("action"):
+                        await element.click()
+                    await timer.settle()
                     
-                    return {
+                    return timed({
                         "step": step_number,
                         "action": action,
                         "target": target,
+                        "selector": selector_info,
                         "status": "success", 
-                        "duration_ms": int(duration),
-                        "description": f"Clicked element {target}"
-                    }
+                        "description": f"Clicked element {target} (via {selector_info['strategy']})"
+                    })
                 except PlaywrightTimeoutError:
-                    # Try alternative selectors or methods
-                    try:
-                        # Try clicking by text content
-                        await page.click(f"text={target}", timeout=5000)
-                        duration = (datetime.now() - start_time).total_seconds() * 1000
-                        return {
-                            "step": step_number,
-                            "action": action,
-                            "target": target,
-                            "status": "success",
-                            "duration_ms": int(duration),
-                            "description": f"Clicked element {target} by text content"
-                        }
-                    except:
-                        # If still fails, mark as warning but continue
-                        duration = (datetime.now() - start_time).total_seconds() * 1000
-                        return {
-                            "step": step_number,
-                            "action": action,
-                            "target": target,
-                            "status": "warning",
-                            "duration_ms": int(duration),
-                            "warning": f"Element {target} not found, but continuing",
-                            "description": f"Could not find element {target}, but scenario continues"
-                        }
+                    # If no strategy matched, mark as warning but continue
+                    return timed({
+                        "step": step_number,
+                        "action": action,
+                        "target": target,
+                        "status": "warning",
+                        "warning": f"Element {target} not found, but continuing",
+                        "description": f"Could not find element {target}, but scenario continues"
+                    })
+            
+            elif action == 'wait_for' or (action == 'wait' and step.get('until')):
+                # Condition-based wait; a legacy 'duration' becomes the upper bound
+                condition = step.get('until') or step.get('condition', 'network_idle')
+                async with timer.phase("settle"):
+                    wait_result = await wait_for_condition(
+                        page, condition,
+                        timeout_ms=step.get('timeout', step.get('duration')),
+                        selector=target or None,
+                        quiet_ms=step.get('quiet_ms', 300)
+                    )
+                await timer.settle(enabled=False)
+                waited_ms = wait_result["waited_ms"]
+                timeout_ms = wait_result["timeout_ms"]
+                
+                result = {
+                    "step": step_number,
+                    "action": action,
+                    "condition": condition,
+                    "waited_ms": waited_ms,
+                    "timeout_ms": timeout_ms,
+                    "condition_met": wait_result["satisfied"],
+                    "status": "success",
+                    "description": f"Waited {waited_ms:.0f}ms for {condition}"
+                }
+                if target:
+                    result["target"] = target
+                if not wait_result["satisfied"]:
+                    # Same outcome as the fixed wait it replaces: time is up, carry on
+                    logger.info(f"⏱️ Step {step_number}: '{condition}' not met within {timeout_ms}ms, continuing")
+                return timed(result)
             
             elif action == 'wait':
                 wait_time = step.get('duration', 1000) / 1000  # Convert to seconds
-                await page.wait_for_timeout(int(wait_time * 1000))
-                duration = (datetime.now() - start_time).total_seconds() * 1000
+                async with timer.phase("settle"):
+                    await page.wait_for_timeout(int(wait_time * 1000))
+                waited_ms = timer.phases["settle"]
+                await timer.settle(enabled=False)
                 
-                return {
+                return timed({
                     "step": step_number,
                     "action": action,
-                    "duration_ms": int(duration),
+                    "waited_ms": int(waited_ms),
                     "status": "success",
                     "description": f"Waited for {wait_time}s"
-                }
+                })
             
             elif action == 'type':
                 text = step.get('text', '')
                 try:
-                    element = await page.wait_for_selector(target, timeout=10000) 
-                    await element.fill(text)
-                    duration = (datetime.now() - start_time).total_seconds() * 1000
+                    async with timer.phase("selector_wait"):
+                        element, selector_info = await resolver.resolve(target)
+                    async with timer.phase("action"):
+                        await element.fill(text)
+                    await timer.settle()
                     
-                    return {
+                    return timed({
                         "step": step_number,
                         "action": action,
                         "target": target,
                         "text": text,
+                        "selector": selector_info,
                         "status": "success",
-                        "duration_ms": int(duration),
-                        "description": f"Typed '{text}' into {target}"
-                    }
+                        "description": f"Typed '{text}' into {target} (via {selector_info['strategy']})"
+                    })
                 except PlaywrightTimeoutError:
-                    # Try alternative methods
-                    try:
-                        await page.fill(target, text, timeout=5000)
-                        duration = (datetime.now() - start_time).total_seconds() * 1000
-                        return {
-                            "step": step_number,
-                            "action": action,
-                            "target": target,
-                            "text": text,
-                            "status": "success",
-                            "duration_ms": int(duration),
-                            "description": f"Typed '{text}' into {target} using alternative method"
-                        }
-                    except:
-                        duration = (datetime.now() - start_time).total_seconds() * 1000
-                        return {
-                            "step": step_number,
-                            "action": action,
-                            "target": target,
-                            "text": text,
-                            "status": "warning",
-                            "duration_ms": int(duration),
-                            "warning": f"Could not type into {target}, but continuing",
-                            "description": f"Could not find element {target} for typing, but scenario continues"
-                        }
+                    return timed({
+                        "step": step_number,
+                        "action": action,
+                        "target": target,
+                        "text": text,
+                        "status": "warning",
+                        "warning": f"Could not type into {target}, but continuing",
+                        "description": f"Could not find element {target} for typing, but scenario continues"
+                    })
             
             elif action == 'hover':
-                element = await page.wait_for_selector(target, timeout=5000)
-                await element.hover()
-                duration = (datetime.now() - start_time).total_seconds() * 1000
+                async with timer.phase("selector_wait"):
+                    element, selector_info = await resolver.resolve(target, timeout_ms=5000)
+                async with timer.phase("action"):
+                    await element.hover()
+                await timer.settle()
                 
-                return {
+                return timed({
                     "step": step_number,
                     "action": action,
                     "target": target,
+                    "selector": selector_info,
                     "status": "success",
-                    "duration_ms": int(duration),
-                    "description": f"Hovered over element {target}"
-                }
+                    "description": f"Hovered over element {target} (via {selector_info['strategy']})"
+                })
             
             else:
                 # Unknown action - mark as warning
-                return {
+                return timed({
                     "step": step_number,
                     "action": action,
                     "target": target,
                     "status": "warning",
-                    "duration_ms": 0,
                     "warning": f"Unknown action: {action}",
                     "description": f"Skipped unknown action: {action}"
-                }
+                })
         
         except PlaywrightTimeoutError:
-            duration = (datetime.now() - start_time).total_seconds() * 1000
-            return {
+            return timed({
                 "step": step_number,
                 "action": action,
                 "target": target,
                 "status": "error",
-                "duration_ms": int(duration),
                 "error": f"Timeout waiting for element: {target}",
                 "description": f"Failed to find element {target} within timeout"
-            }
+            })
         
         except Exception as e:
-            duration = (datetime.now() - start_time).total_seconds() * 1000
-            return {
+            return timed({
                 "step": step_number,
                 "action": action,
                 "target": target,
                 "status": "error",
-                "duration_ms": int(duration),
                 "error": str(e),
                 "description": f"Error executing {action}: {str(e)}"
-            }
+            })
     
     async def _collect_performance_metrics(self, page: Page) -> Dict[str, Any]:
         """Collect real performance metrics from the page"""
@@ -1321,7 +1439,8 @@ class ScenarioExecutor:
         
         return accessibility_issues
     
-    async def _run_craft_bug_analysis(self, page: Page, url: str) -> Dict[str, Any]:
+    async def _run_craft_bug_analysis(self, page: Page, url: str,
+                                      events: Optional[CraftEventCollector] = None) -> Dict[str, Any]:
         """Run craft bug detection analysis on the current page"""
         try:
             # Import CraftBugDetector
@@ -1331,7 +1450,10 @@ class ScenarioExecutor:
             detector = CraftBugDetector()
             
             # Run craft bug analysis using existing page
-            craft_bug_report = await detector.analyze_craft_bugs(page, url)
+            # Raw events only go into the snapshot recording, when recording is on
+            craft_bug_report = await detector.analyze_craft_bugs(
+                page, url, events=events.events if events else None
+            )
             
             # Convert CraftBugReport to dict format for integration
             results = {
@@ -1543,14 +1665,35 @@ class ScenarioExecutor:
                 "steps_total": len(step_results),
                 "steps_successful": len([s for s in step_results if s.get('status') == 'success']),
                 "steps_failed": failed_steps,
-                "steps_warnings": warning_steps
+                "steps_warnings": warning_steps,
+                "wait_time_ms": round(sum(s.get('waited_ms', 0) for s in step_results), 1)
             },
+            "step_timing": summarize_step_timings(step_results),
             "requested_id": analysis_id,
             "browser_automation": True,
             "real_analysis": True
         }
     
-    async def execute_specific_scenario(self, url: str, scenario_path: str, scenario_id: str, modules: Dict[str, bool]) -> Dict[str, Any]:
+    def _prepare_browser_scenario(self, scenario: Dict[str, Any]) -> tuple:
+        """Substitute mock URLs and split a scenario into its steps and execution config"""
+        target_scenario = substitute_mock_urls(scenario)
+        target_scenario = _ensure_dict("target_scenario_after_substitution", target_scenario)
+        
+        scenario_steps = target_scenario.get('steps', [])
+        scenario_config = {
+            'name': target_scenario.get('name', ''),
+            'description': target_scenario.get('description', ''),
+            'task_goal': target_scenario.get('task_goal', ''),
+            'app_type': target_scenario.get('app_type', 'web'),
+            'interception': target_scenario.get('interception'),
+            'cold': target_scenario.get('cold')
+        }
+        return scenario_steps, scenario_config
+    
+    async def execute_specific_scenario(self, url: str, scenario_path: str, scenario_id: str, modules: Dict[str, bool],
+                                        interception: Optional[Any] = None,
+                                        capture_mode: Optional[str] = None,
+                                        cold: Optional[bool] = None) -> Dict[str, Any]:
         """Execute a specific scenario by ID from a scenarios file using REAL browser automation"""
         analysis_id = str(uuid.uuid4())[:8] if not self.deterministic_mode else "test12345"
         logger.info(f"🚀 Executing REAL browser scenario {scenario_id} from {scenario_path}")
@@ -1571,18 +1714,8 @@ class ScenarioExecutor:
             if not target_scenario:
                 raise ValueError(f"Scenario with ID '{scenario_id}' not found in {scenario_path}")
             
-            # Apply mock URL substitution
-            target_scenario = substitute_mock_urls(target_scenario)
-            target_scenario = _ensure_dict("target_scenario_after_substitution", target_scenario)
-            
-            # Extract steps and config for real browser execution
-            scenario_steps = target_scenario.get('steps', [])
-            scenario_config = {
-                'name': target_scenario.get('name', ''),
-                'description': target_scenario.get('description', ''),
-                'task_goal': target_scenario.get('task_goal', ''),
-                'app_type': target_scenario.get('app_type', 'web')
-            }
+            # Apply mock URL substitution and extract steps/config for real browser execution
+            scenario_steps, scenario_config = self._prepare_browser_scenario(target_scenario)
             
             # Use REAL browser automation instead of mock simulation
             return await self._execute_real_browser_scenario(
@@ -1590,34 +1723,27 @@ class ScenarioExecutor:
                 url=url,
                 scenario_steps=scenario_steps,
                 scenario_config=scenario_config,
-                modules=modules
+                modules=modules,
+                interception=interception,
+                capture_mode=capture_mode,
+                cold=cold
             )
         
         except Exception as e:
             logger.error(f"Error executing specific scenario {scenario_id}: {str(e)}")
             return self._generate_fallback_report(analysis_id, url, modules)
 
-    async def execute_scenario_by_id(self, url: str, scenario_id: str, modules: Dict[str, bool]) -> Dict[str, Any]:
+    async def execute_scenario_by_id(self, url: str, scenario_id: str, modules: Dict[str, bool],
+                                     interception: Optional[Any] = None,
+                                     capture_mode: Optional[str] = None,
+                                     cold: Optional[bool] = None) -> Dict[str, Any]:
         """Execute a scenario by ID with REAL browser automation, automatically finding the appropriate scenario file"""
         analysis_id = str(uuid.uuid4())[:8] if not self.deterministic_mode else "test12345"
         logger.info(f"🚀 Starting REAL browser automation for scenario: {scenario_id} on {url}")
         
-        # Map of scenario ID prefixes to their respective files
-        scenario_files = {
-            "1.": "scenarios/word_scenarios.yaml",
-            "2.": "scenarios/excel_scenarios.yaml", 
-            "3.": "scenarios/powerpoint_scenarios.yaml",
-            "4.": "scenarios/office_tests.yaml",
-            "craft-": "scenarios/word_craft_bug_scenarios.yaml"
-        }
-        
         try:
             # Find the appropriate scenario file based on ID prefix
-            scenario_file = None
-            for prefix, file_path in scenario_files.items():
-                if scenario_id.startswith(prefix):
-                    scenario_file = file_path
-                    break
+            scenario_file = scenario_file_for_id(scenario_id)
             
             if not scenario_file:
                 logger.warning(f"No scenario file found for ID {scenario_id}, using fallback")
@@ -1629,12 +1755,377 @@ class ScenarioExecutor:
                 return self._generate_fallback_report(analysis_id, url, modules)
             
             # Execute the specific scenario with REAL browser automation
-            return await self.execute_specific_scenario(url, scenario_file, scenario_id, modules)
+            return await self.execute_specific_scenario(url, scenario_file, scenario_id, modules, interception,
+                                                        capture_mode, cold)
             
         except Exception as e:
             logger.error(f"Error executing scenario by ID {scenario_id}: {str(e)}")
             return self._generate_fallback_report(analysis_id, url, modules)
 
+    def _collect_batch_scenarios(self, scenario_path: Optional[str], scenario_ids: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """Resolve a batch request into scenario entries, preserving the requested order"""
+        loaded_files = {}
+        
+        def scenarios_in(path: str) -> List[Dict[str, Any]]:
+            if path not in loaded_files:
+                with open(path, 'r') as f:
+                    data = yaml.safe_load(f) or {}
+                loaded_files[path] = [s for s in data.get('scenarios', []) if isinstance(s, dict)]
+            return loaded_files[path]
+        
+        entries = []
+        if scenario_ids:
+            for scenario_id in scenario_ids:
+                path = scenario_path or scenario_file_for_id(scenario_id)
+                match = None
+                if path and os.path.exists(path):
+                    match = next((s for s in scenarios_in(path) if str(s.get('id')) == str(scenario_id)), None)
+                entries.append({"scenario_id": scenario_id, "scenario_path": path, "scenario": match})
+        else:
+            for scenario in scenarios_in(scenario_path):
+                # Skip disabled scenarios
+                if scenario.get('enabled', True) is False:
+                    continue
+                entries.append({
+                    "scenario_id": str(scenario.get('id') or scenario.get('name', '')),
+                    "scenario_path": scenario_path,
+                    "scenario": scenario
+                })
+        
+        return entries
+    
+    async def _execute_batch_entry(self, batch_id: str, index: int, entry: Dict[str, Any],
+                                   url: Optional[str], modules: Dict[str, bool],
+                                   interception: Optional[Any] = None,
+                                   capture_mode: Optional[str] = None,
+                                   cold: Optional[bool] = None) -> Dict[str, Any]:
+        """Execute one scenario of a batch, always returning a report"""
+        analysis_id = f"test{index:05d}" if self.deterministic_mode else str(uuid.uuid4())[:8]
+        scenario_id = entry["scenario_id"]
+        
+        if entry["scenario"] is None:
+            report = self._generate_error_report(
+                analysis_id, url or "", modules,
+                f"Scenario with ID '{scenario_id}' not found in {entry['scenario_path']}"
+            )
+        else:
+            try:
+                scenario_steps, scenario_config = self._prepare_browser_scenario(entry["scenario"])
+                scenario_url = url or MOCK_URLS.get(scenario_config['app_type'], "")
+                report = await self._execute_real_browser_scenario(
+                    analysis_id=analysis_id,
+                    url=scenario_url,
+                    scenario_steps=scenario_steps,
+                    scenario_config=scenario_config,
+                    modules=modules,
+                    interception=interception,
+                    capture_mode=capture_mode,
+                    cold=cold
+                )
+            except Exception as e:
+                logger.error(f"Batch scenario {scenario_id} failed: {e}")
+                report = self._generate_error_report(analysis_id, url or "", modules, f"Scenario execution failed: {e}")
+        
+        return self._tag_batch_report(report, entry, batch_id)
+    
+    def _tag_batch_report(self, report: Dict[str, Any], entry: Dict[str, Any], batch_id: str) -> Dict[str, Any]:
+        """Link a per-scenario report back to its batch entry"""
+        report["scenario_id"] = entry["scenario_id"]
+        report["scenario_path"] = entry["scenario_path"]
+        report["batch_id"] = batch_id
+        return report
+    
+    async def execute_scenario_batch(self, url: Optional[str], modules: Dict[str, bool],
+                                     scenario_path: Optional[str] = None,
+                                     scenario_ids: Optional[List[str]] = None,
+                                     max_concurrency: Optional[int] = None,
+                                     interception: Optional[Any] = None,
+                                     share_prefixes: Optional[bool] = None,
+                                     capture_mode: Optional[str] = None,
+                                     cold: Optional[bool] = None) -> Dict[str, Any]:
+        """Execute many scenarios concurrently in isolated browser contexts and aggregate the results"""
+        if not scenario_path and not scenario_ids:
+            raise ValueError("Either scenario_path or scenario_ids is required for a batch")
+        
+        batch_id = "test12345" if self.deterministic_mode else str(uuid.uuid4())[:8]
+        entries = self._collect_batch_scenarios(scenario_path, scenario_ids)
+        
+        # Default to as many scenarios in flight as the browser pool has contexts
+        if not max_concurrency or max_concurrency < 1:
+            max_concurrency = get_browser_pool().capacity
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        if share_prefixes is None:
+            share_prefixes = os.getenv("SCENARIO_SHARE_PREFIXES", "true").lower() != "false"
+        
+        logger.info(f"🚀 Executing batch {batch_id}: {len(entries)} scenarios, concurrency {max_concurrency}")
+        
+        if share_prefixes and PLAYWRIGHT_AVAILABLE:
+            batch_started = time.perf_counter()
+            results, sharing = await self._execute_shared_prefix_batch(
+                batch_id, entries, url, modules, interception, max_concurrency, capture_mode, cold
+            )
+            wall_time_ms = (time.perf_counter() - batch_started) * 1000
+            logger.info(f"🌳 Prefix sharing ran {sharing['steps_executed']}/{sharing['steps_total']} steps ({sharing['forks']} forks)")
+            
+            batch_report = self._generate_batch_report(batch_id, url, scenario_path, results, wall_time_ms, max_concurrency)
+            batch_report["metadata"]["prefix_sharing"] = sharing
+            return batch_report
+        
+        async def run_entry(index: int, entry: Dict[str, Any]):
+            async with semaphore:
+                started = time.perf_counter()
+                report = await self._execute_batch_entry(batch_id, index, entry, url, modules, interception,
+                                                         capture_mode, cold)
+                return entry, report, (time.perf_counter() - started) * 1000
+        
+        batch_started = time.perf_counter()
+        results = await asyncio.gather(*[run_entry(i, entry) for i, entry in enumerate(entries)])
+        wall_time_ms = (time.perf_counter() - batch_started) * 1000
+        
+        return self._generate_batch_report(batch_id, url, scenario_path, results, wall_time_ms, max_concurrency)
+    
+    async def _execute_shared_prefix_batch(self, batch_id: str, entries: List[Dict[str, Any]],
+                                           url: Optional[str], modules: Dict[str, bool],
+                                           interception: Optional[Any], max_concurrency: int,
+                                           capture_mode: Optional[str] = None,
+                                           cold: Optional[bool] = None) -> tuple:
+        """Run a batch as prefix tries: shared steps execute once and branch points fork the page"""
+        results: Dict[int, tuple] = {}
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        capture_mode = capture_mode or DEFAULT_CAPTURE_MODE
+        
+        for index, entry in enumerate(entries):
+            if entry["scenario"] is None:
+                results[index] = (entry, await self._execute_batch_entry(
+                    batch_id, index, entry, url, modules, interception, capture_mode, cold), 0)
+                continue
+            steps, config = self._prepare_browser_scenario(entry["scenario"])
+            scenario_url = url or MOCK_URLS.get(config['app_type'], "")
+            profile = resolve_interception_profile(interception, config.get('interception'))
+            # Scenarios only share a browser page when everything about the page setup matches
+            group_cold = resolve_cold(cold, config.get('cold'))
+            key = (scenario_url, config['app_type'], json.dumps(profile, sort_keys=True), group_cold)
+            group = groups.setdefault(key, {"url": scenario_url, "app_type": config['app_type'],
+                                            "profile": profile, "cold": group_cold, "steps": {}, "configs": {}})
+            group["steps"][index] = steps
+            group["configs"][index] = config
+        
+        sharing = {"steps_total": 0, "steps_executed": 0, "steps_shared": 0, "forks": 0, "steps_replayed": 0}
+        path_numbers = itertools.count()
+        queue = []
+        for group in groups.values():
+            group["root"] = build_scenario_trie(group["steps"])
+            for stat, value in trie_savings(group["root"], group["steps"]).items():
+                sharing[stat] += value
+            queue.extend({"group": group, "branch": branch, "snapshot": None}
+                         for branch in self._trie_branches(group["root"]))
+        
+        fork_ready = asyncio.Event()
+        
+        async def run_path(path: Dict[str, Any]):
+            group, branch, snapshot = path["group"], path["branch"], path["snapshot"]
+            path_started = time.perf_counter()
+            context_options = {"viewport": {"width": 1280, "height": 720}}
+            warm_profile = WarmProfile(group["app_type"], cold=group["cold"])
+            if snapshot:
+                context_options["storage_state"] = snapshot["storage_state"]
+            else:
+                context_options.update(warm_profile.context_options())
+            
+            async with get_browser_pool().context(**context_options) as context:
+                await warm_profile.attach(context)
+                interceptor = RequestInterceptor(group["profile"])
+                await interceptor.attach(context, group["url"])
+                event_collector = CraftEventCollector()
+                await event_collector.attach(context)
+                await install_frame_sampler(context)
+                page = await context.new_page()
+                resolver = SelectorResolver(page, group["app_type"])
+                enhanced_generator = EnhancedReportGenerator() if ENHANCED_REPORTING_AVAILABLE else None
+                path_id = f"{batch_id}-p{next(path_numbers)}"
+                # Every path ends in exactly one leaf, so a path trace is that scenario's trace
+                tracing = enhanced_generator is not None and capture_mode == "trace"
+                if tracing:
+                    await enhanced_generator.start_trace(context, path_id)
+                
+                if snapshot:
+                    prefix = copy.deepcopy({k: snapshot[k] for k in ("steps", "step_results", "ux_issues", "screenshots")})
+                    prefix_ms = snapshot["elapsed_ms"]
+                    # Rebuild the page state cheaply: storage state plus the stateful prefix steps
+                    replay = replay_steps(prefix["steps"])
+                    if not replay or replay[0].get('action') != 'navigate':
+                        await page.goto(snapshot["url"], wait_until='domcontentloaded', timeout=10000)
+                    await self._run_browser_steps(page, replay, path_id, resolver, [], [], step_screenshots=False)
+                    sharing["steps_replayed"] += len(replay)
+                else:
+                    prefix = {"steps": [], "step_results": [], "ux_issues": [], "screenshots": []}
+                    prefix_ms = 0.0
+                
+                while True:
+                    kind, target = branch
+                    if kind == "leaf":
+                        index = target
+                        entry = entries[index]
+                        analysis_id = f"test{index:05d}" if self.deterministic_mode else str(uuid.uuid4())[:8]
+                        event_collector.set_step(None)
+                        performance_metrics = await self._analyze_browser_page(
+                            page, analysis_id, group["url"], modules, prefix["ux_issues"],
+                            enhanced_generator, prefix["screenshots"], events=event_collector
+                        )
+                        trace_data = await enhanced_generator.stop_trace(context, analysis_id) if tracing else None
+                        await warm_profile.save(context)
+                        report = self._build_browser_report(
+                            analysis_id, group["url"], group["configs"][index], modules,
+                            prefix["step_results"], prefix["ux_issues"], performance_metrics,
+                            interceptor, resolver, enhanced_generator, prefix["screenshots"],
+                            trace_data=trace_data, warm_profile=warm_profile, event_collector=event_collector
+                        )
+                        report["prefix_sharing"] = {
+                            "shared_steps": len([s for s in prefix["step_results"] if s.get("shared_prefix")]),
+                            "forked": snapshot is not None
+                        }
+                        duration_ms = prefix_ms + (time.perf_counter() - path_started) * 1000
+                        results[index] = (entry, self._tag_batch_report(report, entry, batch_id), duration_ms)
+                        return
+                    
+                    node = target
+                    results_before = len(prefix["step_results"])
+                    await self._run_browser_steps(
+                        page, [node.step], path_id, resolver, prefix["step_results"], prefix["ux_issues"],
+                        enhanced_generator, prefix["screenshots"], first_step_number=len(prefix["steps"]) + 1,
+                        step_screenshots=not tracing, events=event_collector
+                    )
+                    prefix["steps"].append(node.step)
+                    if len(node.leaf_indices()) > 1:
+                        for step_result in prefix["step_results"][results_before:]:
+                            step_result["shared_prefix"] = True
+                    
+                    branches = self._trie_branches(node)
+                    if len(branches) > 1:
+                        # Every branch but the last continues from a snapshot in its own context
+                        fork_snapshot = {
+                            "storage_state": await context.storage_state(),
+                            "url": page.url,
+                            "elapsed_ms": prefix_ms + (time.perf_counter() - path_started) * 1000,
+                            **copy.deepcopy(prefix)
+                        }
+                        # Queued right away so siblings still run if this path fails later
+                        queue.extend({"group": group, "branch": other, "snapshot": fork_snapshot}
+                                     for other in branches[:-1])
+                        fork_ready.set()
+                        sharing["forks"] += len(branches) - 1
+                    branch = path["branch"] = branches[-1]
+        
+        pending: Dict[asyncio.Future, Dict[str, Any]] = {}
+        path_errors: Dict[int, str] = {}
+        while queue or pending:
+            while queue and len(pending) < max_concurrency:
+                path = queue.pop(0)
+                pending[asyncio.ensure_future(run_path(path))] = path
+            fork_ready.clear()
+            # Also wake up when a running path forks, so new branches start while it continues
+            fork_waiter = asyncio.ensure_future(fork_ready.wait())
+            done, _ = await asyncio.wait([*pending, fork_waiter], return_when=asyncio.FIRST_COMPLETED)
+            fork_waiter.cancel()
+            for task in done:
+                if task is fork_waiter:
+                    continue
+                # The branch the path had reached; siblings forked before that run on their own
+                kind, target = pending.pop(task)["branch"]
+                try:
+                    task.result()
+                except Exception as e:
+                    logger.error(f"❌ Shared-prefix path failed: {e}")
+                    for index in ([target] if kind == "leaf" else target.leaf_indices()):
+                        path_errors[index] = f"Shared-prefix path failed: {e}"
+        
+        # Scenarios that never reached their leaf did not run: report them as failed, not mocked
+        for group in groups.values():
+            for index in group["steps"]:
+                if index not in results:
+                    entry = entries[index]
+                    analysis_id = f"test{index:05d}" if self.deterministic_mode else str(uuid.uuid4())[:8]
+                    report = self._generate_error_report(
+                        analysis_id, group["url"], modules,
+                        path_errors.get(index, "Scenario execution failed: its shared-prefix path did not complete")
+                    )
+                    results[index] = (entry, self._tag_batch_report(report, entry, batch_id), 0)
+        
+        return [results[i] for i in range(len(entries))], sharing
+    
+    @staticmethod
+    def _trie_branches(node) -> List[tuple]:
+        """Child steps first, then scenarios ending here (run last, on the page that got here)"""
+        return [("node", child) for child in node.children.values()] + [("leaf", index) for index in node.leaves]
+    
+    def _generate_batch_report(self, batch_id: str, url: Optional[str], scenario_path: Optional[str],
+                               results: List[tuple], wall_time_ms: float, max_concurrency: int) -> Dict[str, Any]:
+        """Aggregate per-scenario reports into a single batch report"""
+        timestamp = "2025-07-30T14:30:00.000000" if self.deterministic_mode else datetime.now().isoformat()
+        
+        scenario_results = []
+        scenario_reports = []
+        module_scores = {}
+        
+        for entry, report, duration_ms in results:
+            failed = report.get("status") == "failed"
+            scenario_reports.append(report)
+            scenario_results.append({
+                "scenario_id": entry["scenario_id"],
+                "name": (entry["scenario"] or {}).get("name", entry["scenario_id"]),
+                "analysis_id": report.get("analysis_id"),
+                "status": "failed" if failed else "passed",
+                "score": report.get("overall_score", 0),
+                "total_issues": report.get("total_issues", 0),
+                "duration_ms": int(duration_ms),
+                "error": report.get("error")
+            })
+            
+            if not failed:
+                for module, module_result in (report.get("module_results") or {}).items():
+                    module_scores.setdefault(module, []).append(module_result.get("score", 0))
+        
+        module_results = {}
+        for module, scores in module_scores.items():
+            module_results[module] = {
+                "score": sum(scores) // len(scores),
+                "findings": [],
+                "recommendations": self._generate_module_recommendations(module, sum(scores) // len(scores)),
+                "metrics": {
+                    "scenarios_analyzed": len(scores),
+                    "min_score": min(scores),
+                    "max_score": max(scores)
+                }
+            }
+        
+        passed = [r for r in scenario_results if r["status"] == "passed"]
+        sequential_time_ms = sum(r["duration_ms"] for r in scenario_results)
+        
+        return {
+            "analysis_id": batch_id,
+            "timestamp": timestamp,
+            "status": "completed" if passed or not scenario_results else "failed",
+            "type": "batch_scenario",
+            "url": url,
+            "scenario_path": scenario_path,
+            "overall_score": sum(r["score"] for r in passed) // len(passed) if passed else 0,
+            "total_issues": sum(r["total_issues"] for r in scenario_results),
+            "scenario_results": scenario_results,
+            "module_results": module_results,
+            "scenario_reports": scenario_reports,
+            "metadata": {
+                "total_scenarios": len(scenario_results),
+                "scenarios_passed": len(passed),
+                "scenarios_failed": len(scenario_results) - len(passed),
+                "max_concurrency": max_concurrency,
+                "wall_time_ms": int(wall_time_ms),
+                "sequential_time_ms": sequential_time_ms,
+                "parallel_speedup": round(sequential_time_ms / wall_time_ms, 2) if wall_time_ms > 0 else 1.0,
+                "deterministic_mode": self.deterministic_mode
+            }
+        }
+
 import glob
 import logging
 
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Scenario Trie
+Prefix tree over scenario step sequences so shared prefixes are executed once per batch
+"""
+
+import json
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+# Step fields that describe a step but do not change what it does
+DESCRIPTIVE_STEP_FIELDS = {"description", "expected_outcome", "name", "notes", "craft_bug_trigger"}
+
+# Steps that change page state and must be replayed when a branch is forked
+STATEFUL_ACTIONS = {"navigate", "click", "type", "hover"}
+
+def step_key(step: Dict[str, Any]) -> str:
+    """Canonical identity of a step for prefix matching"""
+    behaviour = {k: v for k, v in step.items() if k not in DESCRIPTIVE_STEP_FIELDS}
+    return json.dumps(behaviour, sort_keys=True, default=str)
+
+def replay_steps(steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Cheapest step list that rebuilds a prefix's page state: from the last navigate on,
+    keeping stateful actions and condition waits but dropping fixed-duration waits"""
+    last_navigate = max((i for i, s in enumerate(steps) if s.get("action") == "navigate"), default=0)
+    return [
+        s for s in steps[last_navigate:]
+        if s.get("action") in STATEFUL_ACTIONS or s.get("action") == "wait_for" or s.get("until")
+    ]
+
+class TrieNode:
+    """One step shared by every scenario below it"""
+
+    def __init__(self, step: Optional[Dict[str, Any]] = None, depth: int = 0):
+        self.step = step
+        self.depth = depth
+        self.children: "OrderedDict[str, TrieNode]" = OrderedDict()
+        # Batch entry indices whose scenario ends exactly at this node
+        self.leaves: List[int] = []
+
+    def branch_count(self) -> int:
+        return len(self.children) + len(self.leaves)
+
+    def leaf_indices(self) -> List[int]:
+        """Every scenario that ends at or below this node"""
+        indices = list(self.leaves)
+        for child in self.children.values():
+            indices.extend(child.leaf_indices())
+        return indices
+
+    def step_count(self) -> int:
+        """Steps actually executed for this subtree (each node once)"""
+        own = 1 if self.step is not None else 0
+        return own + sum(child.step_count() for child in self.children.values())
+
+def build_scenario_trie(step_lists: Dict[int, List[Dict[str, Any]]]) -> TrieNode:
+    """Insert each entry's steps, preserving first-seen order of branches"""
+    root = TrieNode()
+    for index, steps in step_lists.items():
+        node = root
+        for step in steps:
+            key = step_key(step)
+            if key not in node.children:
+                node.children[key] = TrieNode(step, node.depth + 1)
+            node = node.children[key]
+        node.leaves.append(index)
+    return root
+
+def trie_savings(root: TrieNode, step_lists: Dict[int, List[Dict[str, Any]]]) -> Dict[str, int]:
+    """Steps the batch would run without sharing vs. with it"""
+    total = sum(len(steps) for steps in step_lists.values())
+    executed = root.step_count()
+    return {"steps_total": total, "steps_executed": executed, "steps_shared": total - executed}
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Selector Resolver
+Races every candidate locator strategy (CSS, text, role, test-id) for a step target and
+remembers the winner per (app_type, target) in a persistent cache
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    PlaywrightTimeoutError = TimeoutError
+
+logger = logging.getLogger(__name__)
+
+SELECTOR_CACHE_PATH = Path(os.getenv("SELECTOR_CACHE_PATH", "reports/selector_cache.json"))
+
+DEFAULT_RESOLVE_TIMEOUT_MS = 10000
+# A cached selector gets a short head start (at most a quarter of the budget) before the full race
+CACHED_SELECTOR_TIMEOUT_MS = 1500
+
+# What the old sequential path cost: 10s CSS wait, then a 5s text= fallback
+LEGACY_CSS_TIMEOUT_MS = 10000
+LEGACY_TEXT_TIMEOUT_MS = 5000
+
+# Roles tried for plain-text targets, most common first
+TEXT_TARGET_ROLES = ("button", "tab", "link", "menuitem")
+
+_PLAIN_TEXT = re.compile(r"^[\w\s\-'’&:,!?]+$")
+_BARE_ID = re.compile(r"^#?([A-Za-z][\w\-]*)$")
+
+def candidate_selectors(target: str) -> List[Tuple[str, str]]:
+    """Build (strategy, selector) candidates for a step target"""
+    target = (target or "").strip()
+    if not target:
+        return []
+
+    # Explicit Playwright engines are used as-is
+    if re.match(r"^(text|role|css|xpath|data-testid|id)=", target) or target.startswith("//"):
+        return [("explicit", target)]
+
+    candidates = [("css", target)]
+    id_match = _BARE_ID.match(target)
+    if id_match:
+        candidates.append(("test_id", f'[data-testid="{id_match.group(1)}"]'))
+
+    if _PLAIN_TEXT.match(target) and not target.startswith(("#", ".")):
+        quoted = target.replace('"', '\\"')
+        candidates.append(("text", f'text="{quoted}"'))
+        for role in TEXT_TARGET_ROLES:
+            candidates.append((f"role_{role}", f'role={role}[name="{quoted}"]'))
+    return candidates
+
+def _estimate_time_saved(strategy: Optional[str], elapsed_ms: float) -> float:
+    """Time saved against the legacy sequential CSS-then-text lookup"""
+    if strategy in ("css", "explicit"):
+        legacy_ms = elapsed_ms
+    elif strategy == "text":
+        legacy_ms = LEGACY_CSS_TIMEOUT_MS + elapsed_ms
+    else:
+        # Role/test-id winners and total misses would have burned both timeouts
+        legacy_ms = LEGACY_CSS_TIMEOUT_MS + LEGACY_TEXT_TIMEOUT_MS
+    return max(0.0, legacy_ms - elapsed_ms)
+
+class SelectorCache:
+    """Persistent (app_type, target) -> winning selector map"""
+
+    def __init__(self, path: Path = SELECTOR_CACHE_PATH):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._dirty = False
+
+    @staticmethod
+    def key(app_type: str, target: str) -> str:
+        return f"{app_type or 'web'}::{target}"
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if self.path.exists():
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f).get("selectors", {})
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load selector cache: {e}")
+            self.entries = {}
+
+    def get(self, app_type: str, target: str) -> Optional[Dict[str, Any]]:
+        self._load()
+        return self.entries.get(self.key(app_type, target))
+
+    def put(self, app_type: str, target: str, strategy: str, selector: str):
+        self._load()
+        entry = self.entries.setdefault(self.key(app_type, target), {"hits": 0})
+        entry.update({"strategy": strategy, "selector": selector, "updated_at": time.time()})
+        self.save()
+
+    def record_hit(self, app_type: str, target: str):
+        """Count a hit in memory; written out by the next flush() or save()"""
+        entry = self.get(app_type, target)
+        if entry is not None:
+            entry["hits"] = entry.get("hits", 0) + 1
+            self._dirty = True
+
+    def flush(self):
+        """Write out hits recorded since the last save"""
+        if self._dirty:
+            self.save()
+
+    def invalidate(self, app_type: str, target: str):
+        self._load()
+        if self.entries.pop(self.key(app_type, target), None) is not None:
+            self.save()
+
+    def save(self):
+        """Write atomically so concurrent runs never read a half-written file"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": 1, "selectors": self.entries}, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save selector cache: {e}")
+
+class SelectorResolver:
+    """Resolves step targets for one page, racing strategies and tracking cache statistics"""
+
+    def __init__(self, page, app_type: str = "web", cache: Optional[SelectorCache] = None):
+        self.page = page
+        self.app_type = app_type or "web"
+        self.cache = cache or get_selector_cache()
+        self.stats = {
+            "lookups": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "cache_stale": 0,
+            "unresolved": 0,
+            "time_saved_ms": 0.0,
+        }
+
+    async def _wait(self, strategy: str, selector: str, timeout_ms: float):
+        element = await self.page.wait_for_selector(selector, timeout=timeout_ms)
+        if element is None:
+            raise PlaywrightTimeoutError(f"{selector} did not match")
+        return strategy, selector, element
+
+    async def _race(self, candidates: List[Tuple[str, str]], timeout_ms: float):
+        """First candidate to appear wins; the rest are cancelled"""
+        tasks = [asyncio.ensure_future(self._wait(strategy, selector, timeout_ms))
+                 for strategy, selector in candidates]
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        return task.result()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            # Consume cancellations/exceptions so nothing is logged as never retrieved
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def resolve(self, target: str, timeout_ms: float = DEFAULT_RESOLVE_TIMEOUT_MS):
+        """Return (element, info); raises PlaywrightTimeoutError when no strategy matches in time"""
+        started = time.perf_counter()
+        self.stats["lookups"] += 1
+
+        cached = self.cache.get(self.app_type, target)
+        if cached:
+            try:
+                _, selector, element = await self._wait(
+                    cached["strategy"], cached["selector"],
+                    min(CACHED_SELECTOR_TIMEOUT_MS, timeout_ms / 4)
+                )
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.stats["cache_hits"] += 1
+                self.cache.record_hit(self.app_type, target)
+                self._add_saved(cached["strategy"], elapsed_ms)
+                return element, {"strategy": cached["strategy"], "selector": selector,
+                                 "cache_hit": True, "resolve_ms": round(elapsed_ms, 2)}
+            except Exception:
+                # The page changed since the selector was cached
+                self.stats["cache_stale"] += 1
+                self.cache.invalidate(self.app_type, target)
+
+        self.stats["cache_misses"] += 1
+        candidates = candidate_selectors(target)
+        remaining_ms = max(1.0, timeout_ms - (time.perf_counter() - started) * 1000)
+        winner = await self._race(candidates, remaining_ms) if candidates else None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if winner is None:
+            self.stats["unresolved"] += 1
+            self._add_saved(None, elapsed_ms)
+            raise PlaywrightTimeoutError(
+                f"No strategy matched '{target}' within {int(timeout_ms)}ms "
+                f"(tried {', '.join(s for s, _ in candidates) or 'nothing'})"
+            )
+
+        strategy, selector, element = winner
+        self.cache.put(self.app_type, target, strategy, selector)
+        self._add_saved(strategy, elapsed_ms)
+        return element, {"strategy": strategy, "selector": selector,
+                         "cache_hit": False, "resolve_ms": round(elapsed_ms, 2)}
+
+    def _add_saved(self, strategy: Optional[str], elapsed_ms: float):
+        self.stats["time_saved_ms"] += _estimate_time_saved(strategy, elapsed_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Selector resolution summary for the analysis report; persists the cache hits once per analysis"""
+        self.cache.flush()
+        lookups = self.stats["lookups"]
+        return {
+            **self.stats,
+            "time_saved_ms": round(self.stats["time_saved_ms"], 1),
+            "cache_hit_rate": round(self.stats["cache_hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+# Global cache instance
+_selector_cache = None
+
+def get_selector_cache() -> SelectorCache:
+    """Get or create the process-wide selector cache"""
+    global _selector_cache
+    if _selector_cache is None:
+        _selector_cache = SelectorCache()
+    return _selector_cache
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Sharded Scenario Runner
+Runs large scenario suites across N worker processes, each with its own event loop and browser pool
+"""
+
+import os
+import time
+import uuid
+import queue
+import asyncio
+import logging
+import multiprocessing
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sentinel telling a worker there are no more scenarios to pull
+_STOP = None
+
+# Seconds without any scenario result before the remaining scenarios are given up on; resets on every result
+RESULT_IDLE_TIMEOUT_S = float(os.getenv("SHARDED_RESULT_TIMEOUT_S", "600"))
+
+def _worker_main(worker_id: int, task_queue, result_queue, batch_id: str, url: Optional[str],
+                 modules: Dict[str, bool], concurrency: int, deterministic_mode: bool, interception: Any,
+                 capture_mode: Optional[str] = None, cold: Optional[bool] = None):
+    """Worker process entry point - pulls scenarios from the shared queue until it is drained"""
+    asyncio.run(_worker_loop(worker_id, task_queue, result_queue, batch_id, url, modules,
+                             concurrency, deterministic_mode, interception, capture_mode, cold))
+
+async def _worker_loop(worker_id: int, task_queue, result_queue, batch_id: str, url: Optional[str],
+                       modules: Dict[str, bool], concurrency: int, deterministic_mode: bool, interception: Any,
+                       capture_mode: Optional[str] = None, cold: Optional[bool] = None):
+    # Imported here so each spawned process builds its own executor and browser pool
+    from scenario_executor import ScenarioExecutor
+    from browser_pool import shutdown_browser_pools
+
+    executor = ScenarioExecutor(deterministic_mode=deterministic_mode)
+    loop = asyncio.get_running_loop()
+
+    async def consume():
+        while True:
+            task = await loop.run_in_executor(None, task_queue.get)
+            if task is _STOP:
+                return
+            index, entry = task
+            started = time.perf_counter()
+            try:
+                report = await executor._execute_batch_entry(batch_id, index, entry, url, modules, interception,
+                                                             capture_mode, cold)
+            except Exception as e:
+                report = executor._tag_batch_report(executor._generate_error_report(
+                    f"w{worker_id}i{index}", url or "", modules, f"Worker {worker_id} failed: {e}"
+                ), entry, batch_id)
+            result_queue.put((index, report, (time.perf_counter() - started) * 1000))
+
+    try:
+        await asyncio.gather(*[consume() for _ in range(concurrency)])
+    finally:
+        await shutdown_browser_pools()
+
+class ShardedScenarioRunner:
+    """Fan a scenario suite out to worker processes that share one work queue"""
+
+    def __init__(self, workers: Optional[int] = None, concurrency_per_worker: int = 2,
+                 deterministic_mode: bool = False, result_timeout: Optional[float] = None,
+                 interception: Any = None, capture_mode: Optional[str] = None,
+                 cold: Optional[bool] = None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.concurrency_per_worker = max(1, concurrency_per_worker)
+        self.deterministic_mode = deterministic_mode
+        self.result_timeout = result_timeout or RESULT_IDLE_TIMEOUT_S
+        self.interception = interception
+        self.capture_mode = capture_mode
+        self.cold = cold
+
+    def run(self, url: Optional[str], modules: Dict[str, bool],
+            scenario_path: Optional[str] = None,
+            scenario_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Execute the suite and return the same aggregated shape as ScenarioExecutor.execute_scenario_batch"""
+        from scenario_executor import ScenarioExecutor
+
+        if not scenario_path and not scenario_ids:
+            raise ValueError("Either scenario_path or scenario_ids is required for a batch")
+
+        executor = ScenarioExecutor(deterministic_mode=self.deterministic_mode)
+        batch_id = "test12345" if self.deterministic_mode else str(uuid.uuid4())[:8]
+        entries = executor._collect_batch_scenarios(scenario_path, scenario_ids)
+        workers = min(self.workers, max(1, len(entries)))
+
+        logger.info(f"🧩 Sharded batch {batch_id}: {len(entries)} scenarios across {workers} worker processes")
+
+        # Spawn (not fork) so no event loop or Playwright state leaks into workers
+        mp = multiprocessing.get_context("spawn")
+        task_queue = mp.Queue()
+        result_queue = mp.Queue()
+
+        for index, entry in enumerate(entries):
+            task_queue.put((index, entry))
+        for _ in range(workers * self.concurrency_per_worker):
+            task_queue.put(_STOP)
+
+        batch_started = time.perf_counter()
+        processes = [
+            mp.Process(
+                target=_worker_main,
+                args=(worker_id, task_queue, result_queue, batch_id, url, modules,
+                      self.concurrency_per_worker, self.deterministic_mode, self.interception,
+                      self.capture_mode, self.cold),
+                daemon=True
+            )
+            for worker_id in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        results: Dict[int, tuple] = {}
+        last_result = time.monotonic()
+        while len(results) < len(entries):
+            try:
+                index, report, duration_ms = result_queue.get(timeout=1.0)
+                results[index] = (entries[index], report, duration_ms)
+                last_result = time.monotonic()
+            except queue.Empty:
+                if not any(p.is_alive() for p in processes):
+                    break
+                if time.monotonic() - last_result > self.result_timeout:
+                    logger.warning(f"⏱️ Sharded batch {batch_id}: no result for {self.result_timeout:.0f}s, "
+                                   f"giving up on {len(entries) - len(results)} scenarios")
+                    break
+
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+        # Scenarios lost to a crashed or timed-out worker still get an error report
+        for index, entry in enumerate(entries):
+            if index not in results:
+                report = executor._tag_batch_report(executor._generate_error_report(
+                    f"lost{index:04d}", url or "", modules,
+                    f"Scenario {entry['scenario_id']} did not complete (worker crashed or timed out)"
+                ), entry, batch_id)
+                results[index] = (entry, report, 0)
+
+        wall_time_ms = (time.perf_counter() - batch_started) * 1000
+        batch_report = executor._generate_batch_report(
+            batch_id, url, scenario_path,
+            [results[i] for i in range(len(entries))],
+            wall_time_ms,
+            workers * self.concurrency_per_worker
+        )
+        batch_report["metadata"]["workers"] = workers
+        batch_report["metadata"]["concurrency_per_worker"] = self.concurrency_per_worker
+        return batch_report
+
+def save_batch_reports(batch_report: Dict[str, Any]) -> str:
+    """Merge a batch and its per-scenario reports into the EnhancedReportHandler storage"""
+    from enhanced_report_handler import save_analysis_to_disk
+
+    batch_id = batch_report["analysis_id"]
+    for scenario_report in batch_report.pop("scenario_reports", []):
+        scenario_report["batch_id"] = batch_id
+        save_analysis_to_disk(scenario_report["analysis_id"], scenario_report)
+    return save_analysis_to_disk(batch_id, batch_report)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Snapshot Replay
+Records each craft bug analysis (page snapshot, timing, DOM summary, probe findings, raw craft events) to a compact
+gzipped file, and replays the detector logic against recordings without a browser
+"""
+
+import io
+import os
+import json
+import gzip
+import time
+import uuid
+import hashlib
+import logging
+import contextlib
+from pathlib import Path
+from dataclasses import asdict
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_DIR = Path(os.getenv("SNAPSHOT_RECORDINGS_DIR", "reports/recordings"))
+
+# Record every analysis for later replay
+RECORD_SNAPSHOTS = os.getenv("RECORD_SNAPSHOTS", "false").lower() == "true"
+
+RECORDING_VERSION = 1
+RECORDING_SUFFIX = ".json.gz"
+
+def save_recording(url: str, snapshot: Dict[str, Any], probe_findings: Dict[str, List[Any]],
+                   page_ready: Optional[Dict[str, Any]] = None, fingerprint: Optional[Dict[str, Any]] = None,
+                   thresholds: Optional[Dict[str, Any]] = None, root: Path = None,
+                   events: Optional[Iterable[Dict[str, Any]]] = None) -> Optional[Path]:
+    """Write one analysis recording; returns its path, or None when it could not be written"""
+    recording = {
+        "version": RECORDING_VERSION,
+        "url": url,
+        "recorded_at": time.time(),
+        # Derived series summaries are recomputed on replay, so detector changes to them take effect
+        "snapshot": {key: value for key, value in snapshot.items() if key != "series"},
+        # Interactive probes cannot be re-run offline; their findings are kept as measured
+        "probe_findings": {name: [asdict(f) for f in findings] for name, findings in probe_findings.items()},
+        "page_ready": page_ready,
+        "fingerprint": fingerprint,
+        "thresholds": thresholds,
+        # Raw streamed craft events; reports only carry their counts
+        "craft_events": list(events) if events is not None else None,
+    }
+    root = Path(root or RECORDINGS_DIR)
+    url_hash = hashlib.sha1(url.encode()).hexdigest()[:8]
+    path = root / f"{time.strftime('%Y%m%d_%H%M%S')}_{url_hash}_{uuid.uuid4().hex[:6]}{RECORDING_SUFFIX}"
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        data = gzip.compress(json.dumps(recording, separators=(",", ":"), default=str).encode(), compresslevel=6)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not save snapshot recording: {e}")
+        return None
+    logger.info(f"💾 Snapshot recorded: {path} ({len(data)} bytes)")
+    return path
+
+def load_recording(path: Union[str, Path]) -> Dict[str, Any]:
+    """Load a recording written by save_recording"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        recording = json.load(f)
+    if recording.get("version") != RECORDING_VERSION:
+        raise ValueError(f"Unsupported recording version {recording.get('version')} in {path}")
+    return recording
+
+def iter_recordings(root: Union[str, Path] = None) -> Iterator[Path]:
+    """Recording files under root (or a single file), oldest first"""
+    root = Path(root or RECORDINGS_DIR)
+    if root.is_file():
+        yield root
+        return
+    yield from sorted(root.rglob(f"*{RECORDING_SUFFIX}"))
+
+def replay_recordings(paths: Iterable[Union[str, Path]], thresholds: Optional[Dict[str, Any]] = None,
+                      categories: Optional[List[str]] = None, quiet: bool = True) -> Dict[str, Any]:
+    """Re-score recordings with the current detector logic (and optional threshold overrides)"""
+    from craft_bug_detector import CraftBugDetector
+
+    detector = CraftBugDetector()
+    if thresholds:
+        detector.detection_thresholds.update(thresholds)
+
+    started = time.perf_counter()
+    runs = []
+    bugs_by_category: Dict[str, int] = {}
+    failed = 0
+    for path in paths:
+        try:
+            recording = load_recording(path)
+            # The detectors print debug lines per call; thousands of replays would drown the output
+            with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+                report = detector.replay_recording(recording, categories=categories)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not replay {path}: {e}")
+            failed += 1
+            continue
+        for category, count in report.bugs_by_category.items():
+            bugs_by_category[category] = bugs_by_category.get(category, 0) + count
+        runs.append({
+            "path": str(path),
+            "url": report.url,
+            "total_bugs_found": report.total_bugs_found,
+            "bugs_by_category": report.bugs_by_category,
+            "bug_types": sorted({f.bug_type for f in report.findings}),
+        })
+
+    return {
+        "recordings": len(runs),
+        "failed": failed,
+        "thresholds": dict(detector.detection_thresholds),
+        "total_bugs_found": sum(run["total_bugs_found"] for run in runs),
+        "bugs_by_category": bugs_by_category,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        "runs": runs,
+    }
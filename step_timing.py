@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Step Timing
+Monotonic per-phase timing for scenario steps (selector wait, action, settle)
+plus the matching in-page performance.now() timestamps
+"""
+
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Phases reported for every step, in execution order; selector strategies race inside selector_wait,
+# so there is no separate fallback phase
+STEP_PHASES = ("selector_wait", "action", "settle")
+
+# Resolves after the next two frames, i.e. once the page has processed and painted the action
+SETTLE_JS = """
+() => new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(() => resolve(performance.now()))))
+"""
+
+class StepTimer:
+    """Accumulates perf_counter phase durations for one step"""
+
+    def __init__(self, page=None):
+        self.page = page
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.page_start: Optional[float] = None
+        self.page_end: Optional[float] = None
+
+    @asynccontextmanager
+    async def phase(self, name: str):
+        """Time a block; repeated phases (e.g. the wait and the settle of a wait step) accumulate"""
+        phase_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - phase_started) * 1000
+
+    async def mark_page_start(self):
+        """Record the in-page performance.now() at the start of the step"""
+        if self.page is None:
+            return
+        try:
+            self.page_start = await self.page.evaluate("() => performance.now()")
+        except Exception as e:
+            logger.debug(f"Could not read page clock: {e}")
+
+    async def settle(self, enabled: bool = True):
+        """Wait two animation frames after the action and record the in-page end timestamp"""
+        if self.page is None:
+            return
+        try:
+            async with self.phase("settle"):
+                if enabled:
+                    self.page_end = await self.page.evaluate(SETTLE_JS)
+                else:
+                    self.page_end = await self.page.evaluate("() => performance.now()")
+        except Exception as e:
+            logger.debug(f"Could not settle page: {e}")
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-phase breakdown for step_results"""
+        total = self.elapsed_ms
+        phases = {f"{name}_ms": round(self.phases.get(name, 0.0), 2) for name in STEP_PHASES}
+        timing = {
+            "total_ms": round(total, 2),
+            **phases,
+            # Driver round-trips and bookkeeping not covered by a phase
+            "overhead_ms": round(max(0.0, total - sum(self.phases.values())), 2),
+            "page_start_ms": round(self.page_start, 2) if self.page_start is not None else None,
+            "page_end_ms": round(self.page_end, 2) if self.page_end is not None else None,
+        }
+        if self.page_start is not None and self.page_end is not None:
+            timing["page_elapsed_ms"] = round(self.page_end - self.page_start, 2)
+        return timing
+
+def summarize_step_timings(step_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-step timing into the report/index summary"""
+    timed = [s for s in step_results if isinstance(s.get("timing"), dict)]
+    if not timed:
+        return {}
+
+    totals = {f"{name}_ms": round(sum(s["timing"].get(f"{name}_ms", 0) for s in timed), 2) for name in STEP_PHASES}
+    slowest = max(timed, key=lambda s: s["timing"].get("total_ms", 0))
+    return {
+        "steps_timed": len(timed),
+        "total_ms": round(sum(s["timing"].get("total_ms", 0) for s in timed), 2),
+        **totals,
+        "slowest_step": {
+            "step": slowest.get("step"),
+            "action": slowest.get("action"),
+            "target": slowest.get("target"),
+            "total_ms": slowest["timing"].get("total_ms", 0)
+        }
+    }
@@ -377,21 +377,23 @@ class UXAnalyzerTestSuite:
                 return
             
             # Check for analysis index
-            index_file = reports_dir / "analysis_index.json"
+            index_file = reports_dir / "analysis_index.db"
             
             if not index_file.exists():
                 self.log_test("Report Persistence", "FAIL", 
-                             "Analysis index file missing", 
+                             "Analysis index database missing", 
                              time.time() - start_time)
                 return
             
             # Load and validate index
-            with open(index_file, 'r') as f:
-                index = json.load(f)
+            from report_index import ReportIndex
+            index = ReportIndex(str(reports_dir))
+            statistics = index.statistics(datetime.now().isoformat())
+            index.close()
             
-            if "reports" in index and "statistics" in index:
-                total_reports = len(index["reports"])
-                total_size_mb = index.get("statistics", {}).get("total_file_size_mb", 0)
+            if "total_reports" in statistics:
+                total_reports = statistics["total_reports"]
+                total_size_mb = statistics.get("total_file_size_mb", 0)
                 
                 self.log_test("Report Persistence", "PASS", 
                              f"Persistence working ({total_reports} reports, {total_size_mb} MB)", 
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming craft bug event collector
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from craft_event_collector import CraftEventCollector
+
+def push(collector, kind, detail=None):
+    collector._on_event(None, {"kind": kind, "source": "craftBugMetrics", "detail": detail, "t": 10.0})
+
+class TestCraftEventCollector:
+    """Step tagging, kind mapping and the bounded ring"""
+
+    def test_events_are_attributed_to_the_running_step(self):
+        collector = CraftEventCollector()
+        push(collector, "layoutShifts")  # before any step
+        collector.set_step(1)
+        push(collector, "inputDelays", {"delay": 40})
+        push(collector, "inputDelays", {"delay": 55})
+        collector.set_step(2)
+        push(collector, "long_task", {"duration": 80})
+
+        step_results = [{"step": 1}, {"step": 2}, {"step": 3}]
+        collector.attribute(step_results)
+        assert step_results[0]["craft_events"] == {"input_delay": 2}
+        assert step_results[1]["craft_events"] == {"long_task": 1}
+        assert step_results[2]["craft_events"] == {}
+        assert collector.get_summary()["by_step"]["outside_steps"] == {"layout_shift": 1}
+
+    def test_ring_drops_oldest_events(self):
+        collector = CraftEventCollector(max_events=3)
+        collector.set_step(1)
+        for _ in range(5):
+            push(collector, "animationConflicts")
+        summary = collector.get_summary()
+        assert summary["total_events"] == 5
+        assert summary["buffered_events"] == 3 and summary["dropped_events"] == 2
+        # Counts cover dropped events too; the raw events are not part of the report
+        assert summary["by_kind"] == {"animation_conflict": 5} and summary["by_step"] == {"1": {"animation_conflict": 5}}
+        assert "events" not in summary and len(collector.events_for_step(1)) == 3
+
+    def test_copied_prefix_counts_are_kept(self):
+        # Forked batch paths carry results from another context's collector
+        collector = CraftEventCollector()
+        step_results = [{"step": 1, "craft_events": {"layout_shift": 2}}]
+        collector.attribute(step_results)
+        assert step_results[0]["craft_events"] == {"layout_shift": 2}
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the craft bug detector registry and its budget enforcement
+"""
+
+import os
+import sys
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from craft_bug_detector import CraftBugDetector, CraftBugFinding
+from detector_registry import DETECTOR_REGISTRY, DetectorRegistry, run_detector
+from page_snapshot import SNAPSHOT_JS, empty_snapshot
+
+class FakePage:
+    """Already on the target URL; serves an empty snapshot"""
+
+    def __init__(self):
+        self.url = "http://127.0.0.1:8080/mocks/word/basic-doc.html"
+        self.evaluations = 0
+
+    async def evaluate(self, script, *args):
+        self.evaluations += 1
+        self.last_args = args
+        if script == SNAPSHOT_JS:
+            return empty_snapshot()
+        return True
+
+    async def wait_for_function(self, *args, **kwargs):
+        return True
+
+    async def query_selector_all(self, selector):
+        return [FakeHandle(self)]
+
+class FakeHandle:
+    """Element handle whose evaluates are counted on the page"""
+
+    def __init__(self, page):
+        self.page = page
+
+    async def evaluate(self, script, *args):
+        self.page.evaluations += 1
+        return True
+
+def finding(category, bug_type):
+    return CraftBugFinding(category, bug_type, 'medium', bug_type, 'page', {}, 0.0)
+
+def build_registry():
+    registry = DetectorRegistry()
+
+    @registry.register('slow_probe', 'D', 'interactive', cost='expensive', budget_ms=30)
+    async def slow_probe(detector, page):
+        await page.evaluate("() => 1")
+        await asyncio.sleep(1)
+        return [finding("D", "never")]
+
+    @registry.register('quick_probe', 'E', 'interactive', cost='moderate', budget_ms=500)
+    async def quick_probe(detector, page):
+        await page.evaluate("() => 1")
+        await page.evaluate("() => 2")
+        return [finding("E", "hover")]
+
+    @registry.register('metrics', 'A', 'read_only')
+    def metrics(detector, snapshot):
+        return [finding("A", "delay")] if snapshot["error"] == "" else []
+
+    return registry
+
+class TestDetectorRegistry:
+    """Budgets, categories and accounting"""
+
+    def test_builtin_detectors_are_registered_by_category(self):
+        assert DETECTOR_REGISTRY.categories() == ["A", "B", "D", "E"]
+        names = [spec.name for spec in DETECTOR_REGISTRY.select(["d", "E"])]
+        assert names == ["input_lag_probe", "input_metrics", "hover_probe", "feedback_metrics"]
+
+    def test_probe_over_budget_is_cancelled(self):
+        spec = build_registry().select(["D"])[0]
+        findings, run = asyncio.run(run_detector(spec, None, FakePage(), remaining_ms=10000))
+        assert findings == [] and run["status"] == "timed_out"
+        assert run["evaluate_count"] == 1 and run["duration_ms"] < 500
+
+    def test_detector_not_started_without_enough_analysis_budget(self):
+        spec = build_registry().select(["E"])[0]
+        page = FakePage()
+        findings, run = asyncio.run(run_detector(spec, None, page, remaining_ms=100))
+        assert run["status"] == "skipped" and page.evaluations == 0
+
+    def test_categories_select_detectors_and_runs_are_accounted(self):
+        detector = CraftBugDetector(registry=build_registry(), analysis_budget_ms=5000)
+        page = FakePage()
+        report = asyncio.run(detector.analyze_craft_bugs(page, page.url, isolate_interactive=False,
+                                                         categories=["A", "E"]))
+
+        assert [f.bug_type for f in report.findings] == ["delay", "hover"]
+        runs = report.metrics_summary["detectors"]
+        assert set(runs) == {"metrics", "quick_probe"}
+        assert runs["quick_probe"]["evaluate_count"] == 2 and runs["metrics"]["mode"] == "read_only"
+        budget = report.metrics_summary["budget"]
+        assert budget["categories"] == ["A", "E"] and budget["skipped"] == [] and budget["evaluate_count"] == 2
+
+    def test_element_handle_evaluates_are_counted(self):
+        registry = DetectorRegistry()
+
+        @registry.register('handle_probe', 'D', 'interactive')
+        async def handle_probe(detector, page):
+            for element in await page.query_selector_all('input'):
+                await element.evaluate("el => el.focus()")
+                await page.evaluate("el => el.value", element)
+            return []
+
+        page = FakePage()
+        findings, run = asyncio.run(run_detector(registry.select(["D"])[0], None, page, remaining_ms=10000))
+        assert run["status"] == "ok" and run["evaluate_count"] == 2 == page.evaluations
+        # Handles go back to Playwright unwrapped
+        assert isinstance(page.last_args[0], FakeHandle)
+
+    def test_budget_reports_capture_evaluates(self):
+        detector = CraftBugDetector(registry=build_registry(), analysis_budget_ms=5000)
+        page = FakePage()
+        report = asyncio.run(detector.analyze_craft_bugs(page, page.url, isolate_interactive=False, categories=["A"]))
+        assert report.metrics_summary["budget"]["capture_evaluates"]["snapshot"] == 1
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for caching detector outputs by page fingerprint
+"""
+
+import os
+import sys
+import asyncio
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from craft_bug_detector import CraftBugDetector, CraftBugFinding
+from detector_registry import DetectorRegistry
+from fingerprint_cache import FINGERPRINT_JS, FingerprintCache
+from page_snapshot import SNAPSHOT_JS, empty_snapshot
+
+class FakePage:
+    """Fingerprint and metrics counters are set by the test"""
+
+    def __init__(self):
+        self.url = "http://127.0.0.1:8080/mocks/word/basic-doc.html"
+        self.structure = "a1b2c3d4"
+        self.input_delays = [120]
+
+    async def evaluate(self, script, *args):
+        if script == FINGERPRINT_JS:
+            return {"build": self.url + "@9e3779b9", "nodes": 240, "structure": self.structure}
+        if script == SNAPSHOT_JS:
+            snapshot = empty_snapshot()
+            snapshot["all_metrics"] = {"inputDelays": list(self.input_delays)}
+            return snapshot
+        return True
+
+    async def wait_for_function(self, *args, **kwargs):
+        return True
+
+def build_detector(calls):
+    registry = DetectorRegistry()
+
+    @registry.register('hover_probe', 'E', 'interactive', cost='expensive')
+    async def hover_probe(detector, page):
+        calls.append('hover_probe')
+        return [CraftBugFinding('E', 'missing_hover_feedback', 'medium', '', 'page', {}, 0.0)]
+
+    @registry.register('input_metrics', 'D', 'read_only', fingerprint='state')
+    def input_metrics(detector, snapshot):
+        calls.append('input_metrics')
+        return []
+
+    @registry.register('dom_structure', 'A', 'read_only', fingerprint='structure')
+    def dom_structure(detector, snapshot):
+        calls.append('dom_structure')
+        return [CraftBugFinding('A', 'layout_thrash', 'medium', '', 'page', {}, 0.0)]
+
+    @registry.register('motion_animation', 'B', 'read_only')
+    def motion_animation(detector, snapshot):
+        calls.append('motion_animation')
+        return []
+
+    return CraftBugDetector(registry=registry, fingerprint_cache=FingerprintCache())
+
+class TestFingerprintCache:
+    """Detectors re-run only when what they depend on changed"""
+
+    def test_unchanged_page_reuses_detector_outputs(self):
+        calls = []
+        detector = build_detector(calls)
+        page = FakePage()
+        asyncio.run(detector.analyze_craft_bugs(page, page.url, isolate_interactive=False))
+        report = asyncio.run(detector.analyze_craft_bugs(page, page.url, isolate_interactive=False))
+
+        # Uncacheable detectors and interactive probes always run
+        assert calls == ['hover_probe', 'dom_structure', 'motion_animation', 'input_metrics',
+                         'hover_probe', 'motion_animation']
+        assert [f.bug_type for f in report.findings] == ["layout_thrash", "missing_hover_feedback"]
+        assert report.metrics_summary["detectors"]["hover_probe"]["status"] == "ok"
+        assert report.metrics_summary["detectors"]["dom_structure"]["status"] == "cached"
+        fingerprint = report.metrics_summary["fingerprint"]
+        assert fingerprint["hits"] == 2 and fingerprint["hit_rate"] == 1.0
+        assert fingerprint["cache"]["hit_rate"] == 0.5
+
+    def test_changes_invalidate_only_dependent_detectors(self):
+        calls = []
+        detector = build_detector(calls)
+        page = FakePage()
+        asyncio.run(detector.analyze_craft_bugs(page, page.url, isolate_interactive=False))
+
+        page.input_delays.append(90)
+        calls.clear()
+        asyncio.run(detector.analyze_craft_bugs(page, page.url, isolate_interactive=False))
+        assert calls == ['hover_probe', 'motion_animation', 'input_metrics']
+
+        page.structure = "ffff0000"
+        calls.clear()
+        asyncio.run(detector.analyze_craft_bugs(page, page.url, isolate_interactive=False))
+        assert calls == ['hover_probe', 'dom_structure', 'motion_animation', 'input_metrics']
+
+    def test_interactive_detectors_cannot_be_cached(self):
+        with pytest.raises(ValueError):
+            DetectorRegistry().register('hover_probe', 'E', 'interactive', fingerprint='structure')
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for stylesheet-based hover probing with budgeted hover confirmation
+"""
+
+import os
+import sys
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hover_probe import HOVER_SCAN_JS, HOVER_DIFF_JS, scan_hover_feedback
+
+class FakeHandle:
+    def __init__(self, page, index):
+        self.page = page
+        self.index = index
+
+    async def hover(self, timeout):
+        await asyncio.sleep(self.page.hover_delay)
+        self.page.hovered.append(self.index)
+
+class FakePage:
+    """Scan result is canned; hovering element 3 changes its style, element 5 does not"""
+
+    def __init__(self, hover_delay=0.0):
+        self.hover_delay = hover_delay
+        self.hovered = []
+        self.cleaned = False
+
+    async def evaluate(self, script, arg=None):
+        if script == HOVER_SCAN_JS:
+            return {
+                "scanned": 6, "styled": 3, "hover_rules": 4, "inaccessible_sheets": 0,
+                "ambiguous": [{"index": 3, "tag": "BUTTON", "id": None, "text": "Save", "baseline": []},
+                              {"index": 5, "tag": "A", "id": None, "text": "Help", "baseline": []}],
+                "missing": [{"index": 1, "tag": "BUTTON", "id": "share", "text": "Share"}],
+            }
+        if script == HOVER_DIFF_JS:
+            return arg[0].index == 3
+        self.cleaned = True
+
+    async def query_selector(self, selector):
+        return FakeHandle(self, int(selector.split('"')[1]))
+
+class TestHoverProbe:
+    """Only ambiguous elements are hovered, within the budget"""
+
+    def test_ambiguous_elements_are_confirmed_with_hovers(self):
+        page = FakePage()
+        coverage = asyncio.run(scan_hover_feedback(page, budget_ms=1000))
+
+        assert page.hovered == [3, 5]
+        assert coverage["styled"] == 4
+        assert [e["index"] for e in coverage["missing"]] == [1, 5]
+        assert coverage["unconfirmed"] == 0 and page.cleaned
+
+    def test_exhausted_budget_leaves_elements_unconfirmed(self):
+        page = FakePage(hover_delay=0.05)
+        coverage = asyncio.run(scan_hover_feedback(page, budget_ms=20))
+
+        assert page.hovered == [3]
+        assert coverage["unconfirmed"] == 1
+        assert [e["index"] for e in coverage["missing"]] == [1]
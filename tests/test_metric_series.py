@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized metric series summaries
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metric_series
+from metric_series import summarize_metrics, evaluate_thresholds
+
+def session_metrics():
+    return {
+        "inputDelays": [{"delay": d, "timestamp": 1000 + i * 100} for i, d in enumerate(range(10, 210, 10))],
+        "layoutShifts": [{"timestamp": 500}, {"timestamp": 1500}],
+        "buttonResponseTimes": [120, 80, 400],
+        "feedbackFailures": [],
+        "animationConflicts": "not a list",
+    }
+
+class TestMetricSeries:
+    """Summaries are compact and identical with or without NumPy"""
+
+    def test_series_summaries(self):
+        series = summarize_metrics(session_metrics())
+
+        assert series["inputDelays"] == {"count": 20, "p95": 190.0, "max": 200.0, "mean": 105.0,
+                                         "rate_per_s": 10.526, "first_ms": 1000.0, "last_ms": 2900.0}
+        # Events without a magnitude still count and have a rate
+        assert series["layoutShifts"]["count"] == 2 and series["layoutShifts"]["max"] is None
+        assert series["layoutShifts"]["rate_per_s"] == 2.0
+        assert series["buttonResponseTimes"]["p95"] == 400.0 and series["buttonResponseTimes"]["first_ms"] is None
+        assert series["feedbackFailures"]["count"] == 0 and series["animationConflicts"]["count"] == 0
+
+    def test_pure_python_fallback_matches(self, monkeypatch):
+        vectorized, empty = summarize_metrics(session_metrics()), summarize_metrics({})
+        monkeypatch.setattr(metric_series, "NUMPY_AVAILABLE", False)
+        assert summarize_metrics(session_metrics()) == vectorized
+        assert summarize_metrics({}) == empty and empty["inputDelays"]["p95"] is None
+
+    def test_thresholds_are_evaluated_together(self):
+        series = summarize_metrics(session_metrics())
+        limits = {"layoutShifts": ("count", 3), "inputDelays": ("p95", 150), "buttonResponseTimes": ("max", 500),
+                  "feedbackFailures": ("count", 1), "animationConflicts": ("max", 1)}
+        expected = {"layoutShifts": False, "inputDelays": True, "buttonResponseTimes": False,
+                    "feedbackFailures": False, "animationConflicts": False}
+        assert evaluate_thresholds(series, limits) == expected
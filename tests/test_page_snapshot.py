@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for single-snapshot craft bug detection
+"""
+
+import os
+import sys
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from craft_bug_detector import CraftBugDetector
+from page_snapshot import SNAPSHOT_JS, capture_page_snapshot, empty_snapshot
+from hover_probe import HOVER_SCAN_JS
+from input_timing import INPUT_TIMING_JS, READ_LATENCY_JS
+
+class FakePage:
+    """Counts evaluate round trips and serves a canned snapshot"""
+
+    def __init__(self, snapshot, browser=None):
+        self.snapshot = snapshot
+        self.url = "http://127.0.0.1:8080/mocks/word/basic-doc.html"
+        self.viewport_size = {"width": 1280, "height": 720}
+        self.context = FakeContext(browser)
+        self.evaluations = 0
+        self.snapshots = 0
+        self.visited = []
+
+    async def goto(self, url, **kwargs):
+        self.visited.append(url)
+
+    async def evaluate(self, script, *args):
+        self.evaluations += 1
+        if script == SNAPSHOT_JS:
+            self.snapshots += 1
+            return dict(self.snapshot)
+        if script == HOVER_SCAN_JS:
+            return {"scanned": 0, "styled": 0, "hover_rules": 0, "inaccessible_sheets": 0,
+                    "ambiguous": [], "missing": []}
+        # page_conditions "metrics" probe
+        return True
+
+    async def wait_for_function(self, *args, **kwargs):
+        return True
+
+    async def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+    async def query_selector_all(self, selector):
+        return []
+
+class FakeContext:
+    def __init__(self, browser=None):
+        self.browser = browser
+        self.pages = []
+
+    async def storage_state(self):
+        return {"cookies": [], "origins": []}
+
+    async def new_page(self):
+        page = FakePage(empty_snapshot())
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        pass
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, **options):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+def word_snapshot():
+    snapshot = empty_snapshot()
+    snapshot.update({
+        "metrics": {
+            "startDelay": 800,
+            "layoutShifts": [{"value": 0.2}, {"value": 0.1}],
+            "inputDelays": [120],
+            "feedbackFailures": ["save"],
+        },
+        "navigation": {"domContentLoaded": 3500, "pageLoad": 4000},
+        "error": "",
+    })
+    snapshot["all_metrics"] = snapshot["metrics"]
+    return snapshot
+
+class TestPageSnapshot:
+    """Every category reads the same snapshot"""
+
+    def test_all_categories_detect_from_one_snapshot(self):
+        detector = CraftBugDetector()
+        snapshot = word_snapshot()
+
+        bug_types = [f.bug_type for f in detector._detect_loading_performance_bugs(snapshot)]
+        assert bug_types == ["intentional_start_delay", "slow_dom_load"]
+        assert [f.bug_type for f in detector._detect_motion_animation_bugs(snapshot)] == ["layout_thrash"]
+        assert [f.bug_type for f in detector._detect_input_handling_bugs(snapshot)] == ["intentional_input_lag"]
+        assert [f.bug_type for f in detector._detect_feedback_bugs(snapshot)] == ["feedback_failures"]
+
+    def test_judder_comes_from_sampled_frame_stats(self):
+        snapshot = word_snapshot()
+        snapshot["frames"] = {"samples": 300, "p50_ms": 16.7, "p95_ms": 48.2, "max_ms": 120.0,
+                              "dropped_frames": 9, "long_frames": 4, "histogram": {">100ms": 1},
+                              "animation": {"samples": 30, "long_frames": 4, "p95_ms": 48.2}}
+        findings = CraftBugDetector()._detect_motion_animation_bugs(snapshot)
+        judder = [f for f in findings if f.bug_type == "animation_judder"]
+        assert len(judder) == 1 and judder[0].metrics["slow_frames_count"] == 4
+
+    def test_single_slow_frame_is_not_judder(self):
+        snapshot = word_snapshot()
+        # One 120ms hitch in a smooth animation, and slow frames with no animation running
+        snapshot["frames"] = {"samples": 300, "p95_ms": 16.8, "max_ms": 120.0, "dropped_frames": 6,
+                              "long_frames": 5, "animation": {"samples": 60, "long_frames": 1, "p95_ms": 16.9}}
+        findings = CraftBugDetector()._detect_motion_animation_bugs(snapshot)
+        assert not [f for f in findings if f.bug_type == "animation_judder"]
+
+    def test_analysis_uses_a_single_metrics_evaluate(self):
+        page = FakePage(word_snapshot())
+        report = asyncio.run(CraftBugDetector().analyze_craft_bugs(page, page.url))
+
+        assert report.bugs_by_category == {"A": 2, "B": 1, "D": 1, "E": 1}
+        assert report.metrics_summary["metricsAvailable"]
+        assert page.snapshots == 1
+
+    def test_interactive_probes_run_in_cloned_contexts(self):
+        browser = FakeBrowser()
+        page = FakePage(word_snapshot(), browser)
+        report = asyncio.run(CraftBugDetector().analyze_craft_bugs(page, page.url, isolate_interactive=True))
+
+        # One clone per interactive probe, each loading the same page; findings keep registry order
+        assert len(browser.contexts) == 2
+        assert all(c.pages[0].visited == [page.url] for c in browser.contexts)
+        assert [f.category for f in report.findings] == ["A", "A", "B", "D", "E"]
+        detectors = report.metrics_summary["detectors"]
+        assert detectors["hover_probe"]["isolated"] and not detectors["feedback_metrics"]["isolated"]
+
+    def test_probes_fall_back_to_main_page_without_a_browser(self):
+        page = FakePage(word_snapshot())
+        report = asyncio.run(CraftBugDetector().analyze_craft_bugs(page, page.url, isolate_interactive=True))
+        assert report.total_bugs_found == 5
+        assert not report.metrics_summary["detectors"]["input_lag_probe"]["isolated"]
+
+    def test_input_lag_uses_event_timing_not_wall_clock(self):
+        class SlowIpcInput:
+            """Every driver call is slow, but the page paints quickly"""
+            async def is_visible(self): return True
+            async def is_enabled(self): return True
+            async def evaluate(self, script, arg=None): pass
+            async def click(self, timeout): await asyncio.sleep(0.05)
+            async def type(self, text, delay): await asyncio.sleep(0.05)
+
+        class TimedPage(FakePage):
+            async def query_selector_all(self, selector):
+                return [SlowIpcInput()]
+
+            async def evaluate(self, script, *args):
+                if script == INPUT_TIMING_JS:
+                    return True
+                if script == READ_LATENCY_JS:
+                    return {"events": 5, "p50_ms": 16, "p95_ms": 24, "max_ms": 24}
+                return await super().evaluate(script, *args)
+
+        findings = asyncio.run(CraftBugDetector()._probe_input_lag(TimedPage(word_snapshot())))
+        assert findings == []
+
+    def test_failed_snapshot_yields_no_findings(self):
+        class BrokenPage:
+            async def evaluate(self, script):
+                raise RuntimeError("page closed")
+
+        snapshot = asyncio.run(capture_page_snapshot(BrokenPage()))
+        assert snapshot["error"] == "page closed"
+        assert CraftBugDetector()._detect_loading_performance_bugs(snapshot) == []
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the sorted report ID index
+"""
+
+import os
+import sys
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import report_id_index
+from report_id_index import ReportIdIndex, AmbiguousReportIdError
+
+def touch(directory, name):
+    path = directory / name
+    path.write_text("{}")
+    return path
+
+class TestReportIdIndex:
+    """Exact and short-ID lookups are binary searches over the sorted IDs"""
+
+    def test_exact_prefix_and_ambiguous_lookups(self, tmp_path):
+        touch(tmp_path, "analysis_9808b21e_20250807_174802.json")
+        newest = touch(tmp_path, "analysis_9808b21e_20250807_185443.json")
+        touch(tmp_path, "analysis_98aa0001_20250807_174641.json")
+        touch(tmp_path, "analysis_legacy.json")
+        touch(tmp_path, "notes.txt")
+        index = ReportIdIndex(tmp_path)
+
+        assert len(index) == 3
+        assert index.resolve("9808b21e") == newest and index.resolve("9808") == newest
+        assert index.resolve("legacy").name == "analysis_legacy.json"
+        assert index.resolve("ffff") is None
+
+        with pytest.raises(AmbiguousReportIdError) as error:
+            index.resolve("98")
+        assert error.value.candidates == ["9808b21e", "98aa0001"]
+
+    def test_kept_up_to_date(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(report_id_index, "RESCAN_INTERVAL_S", 0)
+        index = ReportIdIndex(tmp_path)
+        path = touch(tmp_path, "analysis_abc12345_20250807_174802.json")
+        index.add(path)
+        assert index.resolve_id("abc") == "abc12345"
+
+        path.unlink()
+        index.discard("abc12345")
+        assert index.resolve_id("abc") is None
+
+        # Files written by another process are picked up by one rescan on a miss
+        touch(tmp_path, "analysis_def67890_20250807_174802.json")
+        os.utime(tmp_path, ns=(0, 1))
+        assert index.resolve_id("def6") == "def67890"
+
+    def test_own_writes_do_not_hide_other_processes_writes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(report_id_index, "RESCAN_INTERVAL_S", 60)
+        index = ReportIdIndex(tmp_path)
+        touch(tmp_path, "analysis_other123.json")
+        index.add(touch(tmp_path, "analysis_abc12345_20250807_174802.json"))
+        assert index.resolve_id("other") == "other123"
+
+    def test_misses_rescan_once_per_directory_change(self, tmp_path, monkeypatch):
+        index = ReportIdIndex(tmp_path)
+        rebuilds = []
+        rebuild = index.rebuild
+        monkeypatch.setattr(index, "rebuild", lambda: rebuilds.append(1) or rebuild())
+
+        # One rescan verifies the directory after our own write; later misses skip it
+        index.add(touch(tmp_path, "analysis_abc12345_20250807_174802.json"))
+        for _ in range(3):
+            assert index.resolve_id("ffff") is None
+        assert rebuilds == [1]
+
+    def test_misses_rescan_at_most_once_per_interval(self, tmp_path, monkeypatch):
+        index = ReportIdIndex(tmp_path)
+        rebuilds = []
+        monkeypatch.setattr(index, "rebuild", lambda: rebuilds.append(1))
+
+        # Other processes' writes: at most one rescan per RESCAN_INTERVAL_S, however many misses
+        monkeypatch.setattr(report_id_index, "RESCAN_INTERVAL_S", 60)
+        for n in range(3):
+            touch(tmp_path, f"analysis_other{n}.json")
+            os.utime(tmp_path, ns=(0, n + 1))
+            assert index.resolve_id("ffff") is None
+        assert rebuilds == [1]
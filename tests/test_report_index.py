@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite report index
+"""
+
+import os
+import sys
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enhanced_report_handler import EnhancedReportHandler
+from report_index import ReportIndex
+
+def report(score, url, craft_bugs=0, analysis_type="url_analysis"):
+    return {
+        "type": analysis_type,
+        "url": url,
+        "overall_score": score,
+        "status": "completed",
+        "craft_bugs_detected": [{"type": "layout_thrash"}] * craft_bugs,
+    }
+
+class TestReportIndex:
+    """Saves upsert one row; list, search and statistics run as SQL"""
+
+    def test_list_search_and_statistics(self, tmp_path):
+        handler = EnhancedReportHandler(str(tmp_path))
+        handler.save_report("aaaa1111", report(90, "http://localhost/word.html"))
+        handler.save_report("bbbb2222", report(60, "http://localhost/excel.html", craft_bugs=3))
+        handler.save_report("cccc3333", report(75, "http://localhost/Word.html?x=1", craft_bugs=1, analysis_type="craft_bug"))
+        # Re-saving an ID replaces its row
+        handler.save_report("aaaa1111", report(95, "http://localhost/word.html"))
+
+        listed = handler.list_reports(limit=2, filters={"min_score": 70})
+        # Newest first; the re-save refreshed aaaa1111's created_at
+        assert [r["analysis_id"] for r in listed["reports"]] == ["aaaa1111", "cccc3333"]
+        assert listed["pagination"] == {"total": 2, "limit": 2, "offset": 0, "has_more": False}
+        assert handler.list_reports(filters={"has_craft_bugs": True, "analysis_type": "url_analysis"})["pagination"]["total"] == 1
+
+        found = handler.search_reports({"url": "WORD", "score_min": 70})
+        assert [r["analysis_id"] for r in found] == ["aaaa1111", "cccc3333"]
+        assert handler.search_reports({"score_max": 50}) == []
+
+        stats = handler.get_statistics()["index_statistics"]
+        assert stats["total_reports"] == 3 and stats["total_craft_bugs"] == 4
+        assert stats["avg_score"] == 76.7 and stats["min_score"] == 60 and stats["max_score"] == 95
+        assert stats["analysis_type_distribution"] == {"craft_bug": 1, "url_analysis": 2}
+
+        assert handler.delete_report("bbbb2222") and len(handler.index) == 2
+        assert handler.load_report("bbbb2222") is None
+
+    def test_storage_statistics_come_from_aggregates_and_reconcile(self, tmp_path, monkeypatch):
+        handler = EnhancedReportHandler(str(tmp_path))
+        handler.save_report("aaaa1111", report(90, "http://localhost/word.html"))
+        (tmp_path / "analysis" / "analysis_old00001.json.gz").write_bytes(b"\x1f\x8b" + b"0" * 2048)
+
+        # No directory walk per request: before a reconcile only indexed reports are known
+        def walked(*args):
+            raise AssertionError("get_statistics walked the reports directory")
+        monkeypatch.setattr(type(tmp_path), "rglob", walked)
+        storage = handler.get_statistics()["storage_info"]
+        assert storage["total_files"] == 1 and storage["disk_scanned_at"] is None
+        monkeypatch.undo()
+
+        scanned = handler.reconcile_statistics()["storage"]
+        assert scanned["total_files"] == 2 and scanned["disk_usage_bytes"] > 2048
+        storage = handler.get_statistics()["storage_info"]
+        assert storage["total_files"] == 2 and storage["indexed_reports"] == 1
+        assert storage["disk_scanned_at"] == scanned["scanned_at"]
+
+    def test_legacy_json_index_is_imported_once(self, tmp_path):
+        legacy = {
+            "created": "2025-08-01T10:00:00",
+            "reports": {
+                "old00001": {"analysis_id": "old00001", "created_at": "2025-08-01T10:00:00", "overall_score": 80,
+                             "analysis_type": "url_analysis", "url": "http://localhost/a", "craft_bugs_count": 2},
+                "old00002": {"analysis_id": "old00002", "created_at": "2025-08-02T10:00:00", "overall_score": None},
+            },
+            "statistics": {"last_cleanup": "2025-08-03T00:00:00"},
+        }
+        (tmp_path / "analysis_index.json").write_text(json.dumps(legacy))
+
+        index = ReportIndex(str(tmp_path))
+        assert len(index) == 2 and index.get("old00001")["url"] == "http://localhost/a"
+        assert index.get_meta("created") == "2025-08-01T10:00:00"
+        assert index.statistics("2025-08-01T12:00:00")["recent_reports_count"] == 1
+        index.delete(["old00002"])
+        index.close()
+
+        # The JSON file is not imported again over later changes
+        reopened = ReportIndex(str(tmp_path))
+        assert len(reopened) == 1 and reopened.info()["imported_from"].endswith("analysis_index.json")
+        reopened.close()
+
+    def test_running_statistics_and_reconcile(self, tmp_path):
+        index = ReportIndex(str(tmp_path))
+        index.upsert("r1", {"created_at": "2025-08-01T10:00:00", "overall_score": 80, "craft_bugs_count": 2,
+                            "analysis_type": "url_analysis", "status": "completed", "file_size": 1024})
+        index.upsert("r2", {"created_at": "2025-08-02T10:00:00", "overall_score": 40, "analysis_type": "craft_bug"})
+        # Updating a row moves its contribution rather than adding to it
+        index.upsert("r2", {"created_at": "2025-08-02T10:00:00", "overall_score": 60, "analysis_type": "url_analysis",
+                            "status": "failed"})
+        index.delete(["missing"])
+
+        stats = index.statistics("2025-08-01T12:00:00")
+        assert stats["total_reports"] == 2 and stats["avg_score"] == 70.0 and stats["total_craft_bugs"] == 2
+        assert stats["analysis_type_distribution"] == {"url_analysis": 2}
+        assert stats["status_distribution"] == {"completed": 1, "failed": 1}
+        assert (stats["min_score"], stats["max_score"], stats["recent_reports_count"]) == (60, 80, 1)
+        assert index.reconcile()["drift"] == {}
+
+        # A recount repairs counters that drifted
+        index.conn.execute("UPDATE index_counters SET value = 99 WHERE name = 'total' AND key = 'reports'")
+        assert index.reconcile()["drift"] == {"total:reports": {"counted": 2, "running": 99}}
+        assert index.statistics("2025-08-01T12:00:00")["total_reports"] == 2
+
+        index.delete(["r1", "r2"])
+        assert index.statistics("2025-08-01T12:00:00")["total_reports"] == 0
+        index.close()
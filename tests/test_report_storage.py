@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for single-pass atomic report writes and compressed report storage
+"""
+
+import os
+import sys
+import json
+import pytest
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import report_storage
+from enhanced_report_handler import EnhancedReportHandler
+from report_storage import (FILE_SIZE, write_json_atomic, storage_path, detect_compression,
+                            read_report_json, iter_report_bytes)
+
+class TestReportStorage:
+    """Reports are written once, carry their own size and never end up truncated"""
+
+    def test_size_is_patched_in(self, tmp_path):
+        path = tmp_path / "analysis_abc.json"
+        report = {"url": "http://localhost/ü", "steps": [{"screenshot": "x" * 5000}] * 3,
+                  "storage_metadata": {"file_size_bytes": FILE_SIZE, "version": "2.0"}}
+
+        written = write_json_atomic(path, report)
+
+        assert written == path.stat().st_size
+        assert json.loads(path.read_text())["storage_metadata"]["file_size_bytes"] == written
+        assert os.listdir(tmp_path) == ["analysis_abc.json"]
+
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        path = tmp_path / "analysis_abc.json"
+        write_json_atomic(path, {"overall_score": 80})
+
+        with pytest.raises(ValueError):
+            write_json_atomic(path, {"overall_score": 90, "steps": [{"screenshot": Unencodable()}]})
+
+        assert json.loads(path.read_text()) == {"overall_score": 80}
+        assert os.listdir(tmp_path) == ["analysis_abc.json"]
+
+class Unencodable:
+    """Fails halfway through encoding, after part of the report is written"""
+
+    def __str__(self):
+        raise ValueError("cannot encode")
+
+class TestCompressedReportStorage:
+    """Compressed reports read back transparently and stay indexed"""
+
+    def test_gzip_round_trip(self, tmp_path):
+        path = storage_path(tmp_path / "analysis_abc.json", "gzip")
+        report = {"screenshots": ["iVBORw0KGgo" * 2000], "storage_metadata": {"file_size_bytes": FILE_SIZE}}
+
+        written = write_json_atomic(path, report, compression="gzip")
+
+        assert path.name == "analysis_abc.json.gz" and written == path.stat().st_size
+        assert detect_compression(path) == "gzip" and written < 1000
+        loaded = read_report_json(path)
+        assert loaded["screenshots"] == report["screenshots"] and loaded["storage_metadata"]["file_size_bytes"] is None
+        assert json.loads(b"".join(iter_report_bytes(path, chunk_size=1024))) == loaded
+
+    def test_recompress_keeps_reports_loadable(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(report_storage, "REPORT_COMPRESSION", "none")
+        handler = EnhancedReportHandler(str(tmp_path))
+        plain = Path(handler.save_report("abc12345", {"type": "url_analysis", "notes": "x" * 10000}))
+        assert detect_compression(plain) is None
+
+        summary = handler.recompress_reports("gzip")
+
+        assert summary["compressed"] == 1 and summary["bytes_after"] < summary["bytes_before"]
+        assert not plain.exists()
+        assert handler.resolve_report_path("abc1").name == plain.name + ".gz"
+        assert handler.load_report("abc12345")["notes"] == "x" * 10000
+        assert handler.index.get("abc12345")["compression"] == "gzip"
+        assert handler.recompress_reports("gzip")["compressed"] == 0
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for request interception profiles
+"""
+
+import os
+import sys
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from request_interception import RequestInterceptor, resolve_interception_profile
+
+MOCK_PAGE = "http://127.0.0.1:8080/mocks/word/basic-doc.html"
+
+class TestRequestInterception:
+    """Routing decisions for the built-in profiles"""
+
+    def make_interceptor(self, spec):
+        interceptor = RequestInterceptor(resolve_interception_profile(spec))
+        interceptor.set_first_party(MOCK_PAGE)
+        return interceptor
+
+    def test_off_profile_is_disabled(self):
+        assert not self.make_interceptor("off").enabled
+
+    def test_fast_profile_blocks_non_essential_resources(self):
+        interceptor = self.make_interceptor("fast")
+        assert interceptor.decide("https://fonts.gstatic.com/roboto.woff2", "font")[0] == "block"
+        assert interceptor.decide("https://www.google-analytics.com/analytics.js", "script")[0] == "block"
+        assert interceptor.decide("https://cdn.example.com/widget.js", "script") == ("block", "third_party_script")
+        assert interceptor.decide("http://127.0.0.1:8080/app.js", "script")[0] == "allow"
+
+    def test_metrics_scripts_and_documents_are_never_blocked(self):
+        interceptor = self.make_interceptor({"profile": "fast", "block_url_patterns": ["*"]})
+        assert interceptor.decide("https://cdn.example.com/craft-bug-metrics.js", "script")[0] == "allow"
+        assert interceptor.decide(MOCK_PAGE, "document")[0] == "allow"
+        assert interceptor.decide("https://example.com/logo.png", "image")[0] == "block"
+
+    def test_only_the_metrics_scripts_are_protected(self):
+        interceptor = self.make_interceptor({"profile": "fast", "block_url_patterns": ["*"]})
+        assert interceptor.decide("http://127.0.0.1:8080/craft_bug_metrics.js?v=2", "script")[0] == "allow"
+        assert interceptor.decide("http://127.0.0.1:8080/mocks/word/hero.png", "image")[0] == "block"
+        assert interceptor.decide("https://cdn.example.com/craft-fonts.css", "stylesheet")[0] == "block"
+        assert interceptor.decide("https://telemetry.example.com/metrics/collect", "fetch")[0] == "block"
+
+    def test_stubs_take_precedence_over_blocking(self):
+        interceptor = self.make_interceptor({
+            "profile": "fast",
+            "stubs": {"https://cdn.example.com/*": {"body": "window.widget = {};"}}
+        })
+        assert interceptor.decide("https://cdn.example.com/widget.js", "script") == ("stub", "https://cdn.example.com/*")
+        assert interceptor._stub_response("https://cdn.example.com/*", "script")["body"] == "window.widget = {};"
+
+    def test_unknown_profile_is_rejected(self):
+        with pytest.raises(ValueError):
+            resolve_interception_profile("turbo")
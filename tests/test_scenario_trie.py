@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the scenario prefix trie
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenario_trie import build_scenario_trie, replay_steps, trie_savings
+
+NAVIGATE = {"action": "navigate", "target": "http://127.0.0.1:8080/mocks/word/basic-doc.html"}
+LOAD_WAIT = {"action": "wait", "until": "network_idle", "duration": 2000}
+OPEN_COMMENTS = {"action": "click", "target": "#comments-tab"}
+
+class TestScenarioTrie:
+    """Prefix sharing and replay selection"""
+
+    def test_shared_prefix_is_stored_once(self):
+        step_lists = {
+            0: [NAVIGATE, LOAD_WAIT, OPEN_COMMENTS],
+            # Same behaviour, different description - still shared
+            1: [NAVIGATE, {**LOAD_WAIT, "description": "Allow page to load"}, OPEN_COMMENTS,
+                {"action": "click", "target": "#resolve"}],
+            2: [NAVIGATE, {"action": "wait", "duration": 500}],
+        }
+        root = build_scenario_trie(step_lists)
+
+        assert len(root.children) == 1
+        navigate_node = next(iter(root.children.values()))
+        assert navigate_node.branch_count() == 2
+        assert sorted(navigate_node.leaf_indices()) == [0, 1, 2]
+        assert trie_savings(root, step_lists) == {"steps_total": 9, "steps_executed": 5, "steps_shared": 4}
+
+    def test_scenario_ending_inside_another_is_a_leaf(self):
+        root = build_scenario_trie({0: [NAVIGATE, OPEN_COMMENTS], 1: [NAVIGATE]})
+        navigate_node = next(iter(root.children.values()))
+        assert navigate_node.leaves == [1]
+        assert navigate_node.branch_count() == 2
+
+    def test_replay_skips_fixed_waits_and_steps_before_last_navigate(self):
+        steps = [
+            {"action": "click", "target": "#old"},
+            NAVIGATE,
+            {"action": "wait", "duration": 2000},
+            LOAD_WAIT,
+            OPEN_COMMENTS,
+        ]
+        assert replay_steps(steps) == [NAVIGATE, LOAD_WAIT, OPEN_COMMENTS]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for racing selector resolution and the persistent selector cache
+"""
+
+import os
+import sys
+import asyncio
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from selector_resolver import SelectorCache, SelectorResolver, candidate_selectors
+
+class FakePage:
+    """Only the given selectors ever appear, after the given delay in ms"""
+
+    def __init__(self, appearing):
+        self.appearing = appearing
+        self.calls = []
+
+    async def wait_for_selector(self, selector, timeout):
+        self.calls.append(selector)
+        delay = self.appearing.get(selector)
+        if delay is None or delay > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError(f"Timeout waiting for {selector}")
+        await asyncio.sleep(delay / 1000)
+        return f"element:{selector}"
+
+class TestSelectorResolver:
+    """Strategy racing and cache behaviour"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return SelectorCache(tmp_path / "selector_cache.json")
+
+    def test_candidates_for_css_and_text_targets(self):
+        assert [s for s, _ in candidate_selectors("#comments-tab")] == ["css", "test_id"]
+        strategies = [s for s, _ in candidate_selectors("Resolve All")]
+        assert strategies[:2] == ["css", "text"] and "role_button" in strategies
+        assert candidate_selectors("text=Save") == [("explicit", "text=Save")]
+
+    def test_fastest_strategy_wins_and_is_cached(self, cache):
+        page = FakePage({'text="Resolve"': 200, 'role=button[name="Resolve"]': 5})
+        resolver = SelectorResolver(page, "word", cache)
+
+        element, info = asyncio.run(resolver.resolve("Resolve", timeout_ms=1000))
+        assert element == 'element:role=button[name="Resolve"]'
+        assert info["strategy"] == "role_button" and not info["cache_hit"]
+
+        # A fresh cache instance reads the winner back from disk and tries it first
+        reloaded = SelectorResolver(page, "word", SelectorCache(cache.path))
+        _, info = asyncio.run(reloaded.resolve("Resolve", timeout_ms=1000))
+        assert info["cache_hit"]
+        # Hits stay in memory until the analysis collects its stats
+        assert SelectorCache(cache.path).get("word", "Resolve")["hits"] == 0
+        assert reloaded.get_stats()["cache_hit_rate"] == 1.0
+        assert SelectorCache(cache.path).get("word", "Resolve")["hits"] == 1
+
+    def test_stale_cache_entry_falls_back_to_race(self, cache):
+        cache.put("word", "#save", "css", "#save")
+        page = FakePage({'[data-testid="save"]': 5})
+        resolver = SelectorResolver(page, "word", cache)
+
+        _, info = asyncio.run(resolver.resolve("#save", timeout_ms=300))
+        assert info["strategy"] == "test_id"
+        assert resolver.get_stats()["cache_stale"] == 1
+
+    def test_unresolved_target_raises_timeout(self, cache):
+        resolver = SelectorResolver(FakePage({}), "word", cache)
+        with pytest.raises(PlaywrightTimeoutError):
+            asyncio.run(resolver.resolve("#missing", timeout_ms=50))
+        assert resolver.get_stats()["unresolved"] == 1
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for recording craft bug snapshots and replaying detectors offline
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from craft_bug_detector import CraftBugFinding
+from page_snapshot import empty_snapshot
+from snapshot_replay import save_recording, load_recording, iter_recordings, replay_recordings
+
+def recorded_snapshot():
+    snapshot = empty_snapshot()
+    snapshot.update({
+        "metrics": {"startDelay": 800, "layoutShifts": [{"value": 0.2}, {"value": 0.1}]},
+        "navigation": {"domContentLoaded": 900, "pageLoad": 1200},
+    })
+    snapshot["all_metrics"] = snapshot["metrics"]
+    return snapshot
+
+class TestSnapshotReplay:
+    """Recordings replay without a browser and pick up threshold changes"""
+
+    def test_recording_round_trips(self, tmp_path):
+        hover = CraftBugFinding('E', 'missing_hover_feedback', 'medium', 'Missing hover', 'interactive_elements',
+                                {'missing_count': 2}, 1.0)
+        path = save_recording("http://127.0.0.1:8080/mocks/word/basic-doc.html", recorded_snapshot(),
+                              {"hover_probe": [hover]}, root=tmp_path,
+                              events=[{"step": 1, "kind": "input_delay", "detail": {"delay": 40}}])
+
+        assert path.name.endswith(".json.gz") and list(iter_recordings(tmp_path)) == [path]
+        recording = load_recording(path)
+        assert recording["snapshot"]["metrics"]["startDelay"] == 800
+        assert recording["probe_findings"]["hover_probe"][0]["metrics"] == {"missing_count": 2}
+        assert recording["craft_events"][0]["detail"] == {"delay": 40}
+
+    def test_replay_rescores_with_new_thresholds(self, tmp_path):
+        hover = CraftBugFinding('E', 'missing_hover_feedback', 'medium', 'Missing hover', 'interactive_elements', {}, 1.0)
+        for _ in range(3):
+            save_recording("http://127.0.0.1:8080/mocks/word/basic-doc.html", recorded_snapshot(),
+                           {"hover_probe": [hover]}, root=tmp_path)
+
+        baseline = replay_recordings(iter_recordings(tmp_path))
+        assert baseline["recordings"] == 3 and baseline["failed"] == 0
+        assert baseline["runs"][0]["bug_types"] == ["intentional_start_delay", "layout_thrash", "missing_hover_feedback"]
+
+        relaxed = replay_recordings(iter_recordings(tmp_path), thresholds={"loading_delay": 1000, "layout_thrash": 5})
+        assert relaxed["runs"][0]["bug_types"] == ["missing_hover_feedback"]
+        assert relaxed["bugs_by_category"] == {"A": 0, "B": 0, "D": 0, "E": 3}
+
+        only_a = replay_recordings(iter_recordings(tmp_path), categories=["A"])
+        assert only_a["total_bugs_found"] == 3
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for warm profile storage-state reuse and the on-disk HTTP cache
+"""
+
+import os
+import sys
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from warm_profile import WarmProfile, resolve_cold
+
+class FakeRequest:
+    def __init__(self, url, resource_type="script", method="GET"):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+        self.headers = {"accept": "*/*"}
+
+class FakeResponse:
+    def __init__(self, request, body=b"console.log(1)", status=200,
+                 last_modified="Wed, 01 Jul 2026 10:00:00 GMT", cache_control=None):
+        self.request = request
+        self.url = request.url
+        self.status = status
+        self.headers = {"content-type": "application/javascript", "set-cookie": "secret",
+                        "last-modified": last_modified}
+        if cache_control:
+            self.headers["cache-control"] = cache_control
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+class FakeRoute:
+    def __init__(self, server_response=None):
+        self.fulfilled = None
+        self.fell_back = False
+        self.server_response = server_response
+        self.fetched_headers = None
+
+    async def fetch(self, headers):
+        self.fetched_headers = headers
+        return self.server_response
+
+    async def fulfill(self, **response):
+        self.fulfilled = response
+
+    async def fallback(self):
+        self.fell_back = True
+
+class FakeContext:
+    def __init__(self):
+        self.handlers = {}
+
+    async def route(self, pattern, handler):
+        self.route_handler = handler
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def storage_state(self):
+        return {"cookies": [], "origins": [{"origin": "http://127.0.0.1:8080", "localStorage": []}]}
+
+class TestWarmProfile:
+    """Warm runs fill and reuse the cache; cold runs touch nothing"""
+
+    def test_explicit_flag_wins_over_default(self):
+        assert resolve_cold(True, False) is True
+        assert resolve_cold(None, False) is False
+
+    def test_cache_filled_then_served(self, tmp_path):
+        async def run():
+            request = FakeRequest("http://127.0.0.1:8080/mocks/word/app.js")
+            first = WarmProfile("word", root=tmp_path)
+            context = FakeContext()
+            await first.attach(context)
+
+            route = FakeRoute()
+            await context.route_handler(route, request)
+            assert route.fell_back
+            context.handlers["response"](FakeResponse(request))
+            await first.save(context)
+            assert first.get_summary()["http_cache_stored"] == 1
+
+            # The next run of the same app reuses storage state and serves from disk
+            second = WarmProfile("word", root=tmp_path)
+            assert "storage_state" in second.context_options()
+            context = FakeContext()
+            await second.attach(context)
+            route = FakeRoute(FakeResponse(request, b"", status=304))
+            await context.route_handler(route, request)
+            assert route.fetched_headers["if-modified-since"] == "Wed, 01 Jul 2026 10:00:00 GMT"
+            assert route.fulfilled["body"] == b"console.log(1)"
+            assert "set-cookie" not in route.fulfilled["headers"]
+            assert second.get_summary()["http_cache_hits"] == 1
+            assert second.get_summary()["http_cache_revalidated"] == 1
+
+        asyncio.run(run())
+
+    def test_changed_asset_is_refetched(self, tmp_path):
+        async def run():
+            request = FakeRequest("http://127.0.0.1:8080/mocks/word/app.js")
+            profile = WarmProfile("word", root=tmp_path)
+            context = FakeContext()
+            await profile.attach(context)
+            context.handlers["response"](FakeResponse(request))
+            await profile.save(context)
+
+            # A new build answers the conditional request with the new asset, which replaces the cached one
+            rebuilt = FakeResponse(request, b"console.log(2)", last_modified="Thu, 02 Jul 2026 10:00:00 GMT")
+            route = FakeRoute(rebuilt)
+            await context.route_handler(route, request)
+            assert route.fulfilled == {"response": rebuilt}
+            context.handlers["response"](rebuilt)
+            await profile.save(context)
+            assert profile.get_summary()["http_cache_stored"] == 2
+
+            # Fresh by max-age: served without asking the server
+            fresh = FakeRequest("http://127.0.0.1:8080/mocks/word/logo.png", "image")
+            context.handlers["response"](FakeResponse(fresh, b"png", cache_control="max-age=3600"))
+            await profile.save(context)
+            route = FakeRoute()
+            await context.route_handler(route, fresh)
+            assert route.fetched_headers is None and route.fulfilled["body"] == b"png"
+
+        asyncio.run(run())
+
+    def test_cold_profile_ignores_saved_state(self, tmp_path):
+        async def run():
+            await WarmProfile("excel", root=tmp_path).save(FakeContext())
+            cold = WarmProfile("excel", cold=True, root=tmp_path)
+            assert cold.context_options() == {}
+            context = FakeContext()
+            await cold.attach(context)
+            assert not hasattr(context, "route_handler")
+            assert cold.get_summary()["mode"] == "cold"
+
+        asyncio.run(run())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Warm Profile
+Per-app_type storage state and on-disk HTTP cache reused across analyses of the same mock app,
+so warm regression runs skip re-downloading static assets. Cached responses are served while fresh
+(max-age) and otherwise revalidated with a conditional request. Cold runs bypass both.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+WARM_PROFILE_DIR = Path(os.getenv("WARM_PROFILE_DIR", "reports/warm_profiles"))
+
+# Runs are cold (clean profile, every byte fetched) unless warm profiles are switched on
+WARM_PROFILES_ENABLED = os.getenv("WARM_PROFILES", "false").lower() == "true"
+
+# Only static subresources are cached; documents, XHR and metrics endpoints always hit the network
+CACHEABLE_RESOURCE_TYPES = {"script", "stylesheet", "image", "font"}
+
+# Response headers replayed from the cache
+CACHED_HEADERS = ("content-type", "cache-control", "etag", "last-modified")
+
+MAX_CACHED_BODY_BYTES = 5 * 1024 * 1024
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+def resolve_cold(*flags: Optional[bool]) -> bool:
+    """First explicit flag wins (request, then scenario); otherwise cold unless WARM_PROFILES is on"""
+    for flag in flags:
+        if flag is not None:
+            return bool(flag)
+    return not WARM_PROFILES_ENABLED
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{id(data)}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class WarmProfile:
+    """Storage state plus HTTP response cache for one app_type"""
+
+    def __init__(self, app_type: str = "web", cold: bool = False, root: Path = None):
+        self.app_type = app_type or "web"
+        self.cold = cold
+        self.profile_dir = Path(root or WARM_PROFILE_DIR) / self.app_type
+        self.storage_state_path = self.profile_dir / "storage_state.json"
+        self.http_cache_dir = self.profile_dir / "http_cache"
+
+        self.storage_state_reused = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_revalidated = 0
+        self.cache_stored = 0
+        self.bytes_served = 0
+        self._pending = set()
+
+    def context_options(self) -> Dict[str, Any]:
+        """Extra new_context() options: the saved storage state for warm runs"""
+        if self.cold or not self.storage_state_path.exists():
+            return {}
+        self.storage_state_reused = True
+        return {"storage_state": str(self.storage_state_path)}
+
+    def _cache_paths(self, url: str):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.http_cache_dir / f"{digest}.json", self.http_cache_dir / f"{digest}.body"
+
+    @staticmethod
+    def _cacheable(request) -> bool:
+        return request.method == "GET" and request.resource_type in CACHEABLE_RESOURCE_TYPES
+
+    @staticmethod
+    def _cached_headers(headers: Dict[str, str]) -> Dict[str, str]:
+        return {k.lower(): v for k, v in headers.items() if k.lower() in CACHED_HEADERS}
+
+    @staticmethod
+    def _max_age(headers: Dict[str, str]) -> Optional[int]:
+        cache_control = headers.get("cache-control", "").lower()
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return None
+        match = _MAX_AGE.search(cache_control)
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def _validators(headers: Dict[str, str]) -> Dict[str, str]:
+        """Conditional request headers for a cached response"""
+        validators = {}
+        if headers.get("etag"):
+            validators["if-none-match"] = headers["etag"]
+        if headers.get("last-modified"):
+            validators["if-modified-since"] = headers["last-modified"]
+        return validators
+
+    async def _serve(self, route, request):
+        """Fulfill cacheable requests from disk while fresh or revalidated; everything else falls through"""
+        try:
+            if self._cacheable(request):
+                meta_path, body_path = self._cache_paths(request.url)
+                if meta_path.exists() and body_path.exists():
+                    meta = json.loads(meta_path.read_text())
+                    headers = meta.get("headers", {})
+                    max_age = self._max_age(headers)
+                    if max_age is None or time.time() - meta.get("stored_at", 0) >= max_age:
+                        # Stale: ask the server whether our copy still matches the current build
+                        response = await route.fetch(headers={**request.headers, **self._validators(headers)})
+                        if response.status != 304:
+                            self.cache_misses += 1
+                            await route.fulfill(response=response)
+                            return
+                        self.cache_revalidated += 1
+                        meta["stored_at"] = time.time()
+                        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+                    body = body_path.read_bytes()
+                    self.cache_hits += 1
+                    self.bytes_served += len(body)
+                    await route.fulfill(status=meta.get("status", 200), headers=headers, body=body)
+                    return
+                self.cache_misses += 1
+        except Exception as e:
+            logger.debug(f"HTTP cache read failed for {request.url}: {e}")
+        await route.fallback()
+
+    async def _store(self, response):
+        try:
+            headers = self._cached_headers(response.headers)
+            # Without a validator or max-age an entry could never be reused safely
+            if not self._validators(headers) and self._max_age(headers) is None:
+                return
+            meta_path, body_path = self._cache_paths(response.url)
+            if meta_path.exists() and json.loads(meta_path.read_text()).get("headers") == headers:
+                return
+            body = await response.body()
+            if len(body) > MAX_CACHED_BODY_BYTES:
+                return
+            _write_atomic(body_path, body)
+            _write_atomic(meta_path, json.dumps({
+                "url": response.url, "status": response.status, "headers": headers, "stored_at": time.time()
+            }).encode("utf-8"))
+            self.cache_stored += 1
+        except Exception as e:
+            logger.debug(f"HTTP cache write failed for {response.url}: {e}")
+
+    def _on_response(self, response):
+        if response.status == 200 and self._cacheable(response.request):
+            task = asyncio.ensure_future(self._store(response))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def attach(self, context):
+        """Serve and fill the HTTP cache for this context; must be attached before request interception"""
+        if self.cold:
+            return
+        await context.route("**/*", self._serve)
+        context.on("response", self._on_response)
+        logger.info(f"🔥 Warm profile active for {self.app_type} (storage state reused: {self.storage_state_reused})")
+
+    async def save(self, context):
+        """Persist the context's storage state and finish pending cache writes"""
+        if self.cold:
+            return
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+        try:
+            state = await context.storage_state()
+            _write_atomic(self.storage_state_path, json.dumps(state, indent=2).encode("utf-8"))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save storage state for {self.app_type}: {e}")
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Warm/cold profile summary for the analysis report"""
+        return {
+            "mode": "cold" if self.cold else "warm",
+            "app_type": self.app_type,
+            "storage_state_reused": self.storage_state_reused,
+            "http_cache_hits": self.cache_hits,
+            "http_cache_misses": self.cache_misses,
+            "http_cache_revalidated": self.cache_revalidated,
+            "http_cache_stored": self.cache_stored,
+            "http_cache_bytes_served": self.bytes_served,
+        }